@@ -2,10 +2,39 @@
 # Used AI assistance to help write in python, 
 # I wrote the logic of how I wanted it to function, 
 # and had AI help me with syntax and structure.
-from datetime import datetime
-from typing import List, Dict
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterator, Optional
 
-from connection import get_connection
+try:
+    from connection import get_connection
+    from catalog import read_catalog_versions
+    from interest_index import InterestIndex
+    from aho_corasick import AhoCorasick
+except ImportError:  # imported from app.py as Python.KeyFeatures
+    from Python.connection import get_connection
+    from Python.catalog import read_catalog_versions
+    from Python.interest_index import InterestIndex
+    from Python.aho_corasick import AhoCorasick
+
+# Conferences indexed by the tokens in their title/description, kept for the
+# life of the process and rebuilt when the catalog version changes
+INDEX_MAX_AGE = 300
+_interest_index = InterestIndex()
+
+def _current_index(conn):
+    try:
+        version_cur = conn.cursor()
+        version = read_catalog_versions(version_cur).get("conferences")
+        version_cur.close()
+    except Exception:
+        version = None  # no CatalogVersion table; rebuild by age only
+    if _interest_index.is_stale(version, INDEX_MAX_AGE):
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT CID, Title, Descrip FROM Conferences")
+        _interest_index.rebuild(cur.fetchall(), version)
+        cur.close()
+    return _interest_index
 
 # Wrote a simple script to get conference recommendations based 
 # on what the user is intrested in. It takes their intresets and 
@@ -34,26 +63,9 @@ def get_personal_conference_recommendations(user_id: int) -> List[Dict]:
             print("User has no interests")
             return []
 
-        # Fetch conferences and match with user interests
-        cur.execute(
-            "SELECT CID, Title, Descrip FROM Conferences"
-        )
-        conferences = cur.fetchall()
-        
-        matched_conferences = []
-        for conf in conferences:
-            title = conf.get("Title", "").lower()
-            description = conf.get("Descrip", "").lower()
-            matched_interests = []
-            for interest in interests:
-                interest_lower = interest.lower()
-                if interest_lower in title or interest_lower in description:
-                    matched_interests.append(interest)
-            
-            # If any interests matched, add this conference to our results
-            if matched_interests:
-                conf['Matched_Interests'] = matched_interests
-                matched_conferences.append(conf)
+        # Match conferences with user interests; the index only substring-tests
+        # conferences that share words with an interest
+        matched_conferences = _current_index(conn).match(interests)
         
         # Print the matching conferences
         if not matched_conferences:
@@ -77,96 +89,282 @@ def get_personal_conference_recommendations(user_id: int) -> List[Dict]:
         if conn:
             conn.close()
 
-# Sends an email to the user notifying them of upcoming paper deadlines
-# for conferences that match their interests
-# Email sending to be added in PHASE III
-# Did not do because of pay walls on email services
-def notify_user_of_paper_deadlines(user_id: int, days_ahead: int = 30) -> List[Dict]:
-    conn = None
+# Batch version of the recommendations above, for nightly digests and email
+# fan-out. Instead of one connection + full catalog scan per user, it reads
+# the users and conferences once, puts every distinct interest into one
+# Aho-Corasick automaton and scans each conference's text a single time.
+# Results are yielded per user so callers can stream them.
+def get_batch_conference_recommendations(user_ids: Optional[List[int]] = None,
+                                         stats: Optional[Dict] = None) -> Iterator[Dict]:
+    started = time.perf_counter()
+    conn = get_connection()
     try:
-        conn = get_connection()
         cur = conn.cursor(dictionary=True)
-        
-        # Get user interests first
+        if user_ids:
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            cur.execute(
+                "SELECT ID, Interest_1, Interest_2, Interest_3 FROM `user` "
+                f"WHERE ID IN ({placeholders}) ORDER BY ID",
+                tuple(user_ids)
+            )
+        else:
+            cur.execute("SELECT ID, Interest_1, Interest_2, Interest_3 FROM `user` ORDER BY ID")
+        users = cur.fetchall()
+        cur.execute("SELECT CID, Title, Descrip FROM Conferences ORDER BY CID")
+        conferences = cur.fetchall()
+        cur.close()
+    finally:
+        # Done with the database before the (possibly slow) consumer starts reading
+        conn.close()
+
+    # Every distinct interest across all users becomes one pattern
+    user_interests = []
+    patterns = {}
+    for user in users:
+        interests = [user.get("Interest_1"), user.get("Interest_2"), user.get("Interest_3")]
+        interests = [i.strip() for i in interests if i and i.strip()]
+        user_interests.append((user["ID"], interests))
+        for interest in interests:
+            patterns.setdefault(interest.lower(), len(patterns))
+
+    # One pass over each conference's text finds all interests it contains
+    automaton = AhoCorasick(patterns)
+    hits = [[] for _ in patterns]
+    for position, conf in enumerate(conferences):
+        # NUL keeps a match from spanning the end of the title into the description
+        text = (conf.get("Title") or "").lower() + "\0" + (conf.get("Descrip") or "").lower()
+        for pattern in automaton.find(text):
+            hits[pattern].append(position)
+
+    if stats is not None:
+        stats.update(users=0, conferences=len(conferences), patterns=len(patterns), matches=0)
+    for user_id, interests in user_interests:
+        matched = {}
+        for interest in interests:
+            for position in hits[patterns[interest.lower()]]:
+                matched.setdefault(position, []).append(interest)
+        recommendations = [dict(conferences[position], Matched_Interests=matched[position])
+                           for position in sorted(matched)]
+
+        if stats is not None:
+            elapsed = time.perf_counter() - started
+            stats["users"] += 1
+            stats["matches"] += len(recommendations)
+            stats["seconds"] = round(elapsed, 3)
+            stats["users_per_second"] = round(stats["users"] / elapsed, 1) if elapsed else None
+        yield {"user_id": user_id, "recommendations": recommendations}
+
+# Deadline fan-out: matches one window of upcoming paper deadlines against
+# every user's interests in a single pass. Feed it deadline rows sorted by
+# DueDate (that's how fan_out_paper_deadlines reads them) and it keeps the
+# soonest `max_per_user` per user, so memory is bounded by
+# users x max_per_user no matter how big the window is.
+class DeadlineFanOut:
+    # Conferences whose match result is remembered while sweeping the window
+    MAX_CACHED_CONFERENCES = 10000
+
+    def __init__(self, users, max_per_user: int = 20):
+        self.max_per_user = max_per_user
+        # Every distinct interest is one automaton pattern; each pattern
+        # remembers which users (and under which spelling) asked for it
+        self.patterns = {}
+        self.subscribers = []
+        for user_id, interests in users:
+            for position, interest in enumerate(interests):
+                key = interest.lower()
+                if key not in self.patterns:
+                    self.patterns[key] = len(self.patterns)
+                    self.subscribers.append([])
+                self.subscribers[self.patterns[key]].append((user_id, position, interest))
+        self.automaton = AhoCorasick(self.patterns)
+        self.digests = {}
+        # Users whose digest already holds max_per_user deadlines. They are
+        # dropped from subscriber lists lazily: a list is re-filtered when
+        # more users have filled up since it was last filtered.
+        self.full = set()
+        self._filtered_at = [0] * len(self.subscribers)
+        self._conference_hits = {}
+        self.deadlines_seen = 0
+
+    def add(self, row: Dict) -> None:
+        """One deadline row: PID, TypeOfPaper, Topic, DueDate, CID, Title, Descrip"""
+        self.deadlines_seen += 1
+        cid = row["CID"]
+        hits = self._conference_hits.get(cid)
+        if hits is None:
+            if len(self._conference_hits) >= self.MAX_CACHED_CONFERENCES:
+                self._conference_hits.clear()
+            # NUL keeps a match from spanning the end of the title into the description
+            text = (row.get("Title") or "").lower() + "\0" + (row.get("Descrip") or "").lower()
+            hits = self._conference_hits[cid] = self.automaton.find(text)
+        if not hits:
+            return
+
+        matched = {}
+        for pattern in hits:
+            if self._filtered_at[pattern] != len(self.full):
+                self.subscribers[pattern] = [s for s in self.subscribers[pattern] if s[0] not in self.full]
+                self._filtered_at[pattern] = len(self.full)
+            for user_id, position, interest in self.subscribers[pattern]:
+                matched.setdefault(user_id, []).append((position, interest))
+        if not matched:
+            return
+
+        entry = {
+            "PID": row["PID"],
+            "TypeOfPaper": row.get("TypeOfPaper"),
+            "Topic": row.get("Topic"),
+            "DueDate": row["DueDate"],
+            "CID": cid,
+            "Title": row.get("Title"),
+        }
+        for user_id, interests in matched.items():
+            digest = self.digests.setdefault(user_id, [])
+            # Rows come soonest first, so the first max_per_user are the ones to keep
+            digest.append(dict(entry, Matched_Interests=[interest for _, interest in sorted(interests)]))
+            if len(digest) >= self.max_per_user:
+                self.full.add(user_id)
+
+    def results(self) -> Iterator[Dict]:
+        """Per-user digests in user ID order (users with no matching deadline are skipped)"""
+        for user_id in sorted(self.digests):
+            yield {"user_id": user_id, "deadlines": self.digests[user_id]}
+
+
+# Columns DeadlineFanOut.add() expects, for Papers p JOIN Conferences c
+DEADLINE_COLUMNS = "p.PID, p.TypeOfPaper, p.Topic, p.DueDate, c.CID, c.Title, c.Descrip"
+
+def _load_user_interests(cur, user_ids: Optional[List[int]] = None) -> List:
+    if user_ids:
+        placeholders = ", ".join(["%s"] * len(user_ids))
         cur.execute(
-            "SELECT Interest_1, Interest_2, Interest_3 FROM `user` WHERE ID = %s",
-            (user_id,)
+            "SELECT ID, Interest_1, Interest_2, Interest_3 FROM `user` "
+            f"WHERE ID IN ({placeholders}) ORDER BY ID",
+            tuple(user_ids)
         )
-        row = cur.fetchone()
-        if not row:
-            print(f"No user found with ID: {user_id}")
-            return []
-        
-        interests = [row.get("Interest_1"), row.get("Interest_2"), row.get("Interest_3")]
+    else:
+        cur.execute("SELECT ID, Interest_1, Interest_2, Interest_3 FROM `user` ORDER BY ID")
+    users = []
+    for user in cur.fetchall():
+        interests = [user.get("Interest_1"), user.get("Interest_2"), user.get("Interest_3")]
         interests = [i.strip() for i in interests if i and i.strip()]
-        
-        if not interests:
-            print("User has no interests - cannot check for relevant deadlines")
-            return []
-        
-        # Calculate the deadline cutoff date
-        from datetime import datetime, timedelta
-        cutoff_date = datetime.now() + timedelta(days=days_ahead)
-        
-        # Get conferences with upcoming paper deadlines that match user interests
-        cur.execute("""
-            SELECT CID, Title, Descrip, PaperDeadline 
-            FROM Conferences 
-            WHERE PaperDeadline IS NOT NULL 
-            AND PaperDeadline >= CURDATE() 
-            AND PaperDeadline <= %s
-            ORDER BY PaperDeadline ASC
-        """, (cutoff_date.date(),))
-        
-        upcoming_conferences = cur.fetchall()
-        
-        if not upcoming_conferences:
-            print(f"No conferences with paper deadlines in the next {days_ahead} days")
-            return []
-        
-        # Filter conferences that match user interests
-        matching_deadline_conferences = []
-        
-        for conf in upcoming_conferences:
-            title = conf.get("Title", "").lower()
-            description = conf.get("Descrip", "").lower()
-            matched_interests = []
-            
-            for interest in interests:
-                interest_lower = interest.lower()
-                if interest_lower in title or interest_lower in description:
-                    matched_interests.append(interest)
-            
-            if matched_interests:
-                conf['Matched_Interests'] = matched_interests
-                matching_deadline_conferences.append(conf)
-        
+        if interests:
+            users.append((user["ID"], interests))
+    return users
+
+
+# Reads the deadline window once, in DueDate order off
+# idx_papers_deadline_conference (DueDate, CID), streaming it through an
+# unbuffered cursor into a DeadlineFanOut. Yields one digest per user.
+def fan_out_paper_deadlines(days_ahead: int = 30, user_ids: Optional[List[int]] = None,
+                            max_per_user: int = 20, stats: Optional[Dict] = None,
+                            batch_rows: int = 1000) -> Iterator[Dict]:
+    started = time.perf_counter()
+    conn = get_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        users = _load_user_interests(cur, user_ids)
+        cur.close()
+        fan_out = DeadlineFanOut(users, max_per_user)
+
+        if users:
+            cur = conn.cursor(dictionary=True, buffered=False)
+            cur.execute(f"""
+                SELECT {DEADLINE_COLUMNS}
+                FROM Papers p
+                JOIN Conferences c ON c.CID = p.CID
+                WHERE p.DueDate >= NOW() AND p.DueDate <= %s
+                ORDER BY p.DueDate, p.CID
+            """, (datetime.now() + timedelta(days=days_ahead),))
+            while True:
+                rows = cur.fetchmany(batch_rows)
+                if not rows:
+                    break
+                for row in rows:
+                    fan_out.add(row)
+            cur.close()
+    finally:
+        conn.close()
+
+    digests = 0
+    for digest in fan_out.results():
+        digests += 1
+        yield digest
+
+    if stats is not None:
+        elapsed = time.perf_counter() - started
+        stats.update(
+            users=len(users),
+            deadlines=fan_out.deadlines_seen,
+            digests=digests,
+            seconds=round(elapsed, 3),
+            users_per_second=round(len(users) / elapsed, 1) if elapsed else None,
+            deadlines_per_second=round(fan_out.deadlines_seen / elapsed, 1) if elapsed else None,
+        )
+
+
+# Digests for specific papers, e.g. the ones the deadline scheduler just
+# fired reminders for: the same matching as the fan-out over just those PIDs.
+def paper_reminder_digests(pids: List[int], max_per_user: int = 50) -> Iterator[Dict]:
+    if not pids:
+        return
+    conn = get_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        users = _load_user_interests(cur)
+        placeholders = ", ".join(["%s"] * len(pids))
+        cur.execute(f"""
+            SELECT {DEADLINE_COLUMNS}
+            FROM Papers p
+            JOIN Conferences c ON c.CID = p.CID
+            WHERE p.PID IN ({placeholders})
+            ORDER BY p.DueDate, p.CID
+        """, tuple(pids))
+        rows = cur.fetchall()
+        cur.close()
+    finally:
+        conn.close()
+
+    fan_out = DeadlineFanOut(users, max_per_user)
+    for row in rows:
+        fan_out.add(row)
+    yield from fan_out.results()
+
+
+# Sends an email to the user notifying them of upcoming paper deadlines
+# for conferences that match their interests
+# Email now goes through the notification outbox (Python/notifications.py,
+# fed by the deadline reminder scheduler in app.py); this prints the digest.
+# Deadlines come from Papers.DueDate (Conferences has no deadline column);
+# this is the fan-out above run for a single user.
+def notify_user_of_paper_deadlines(user_id: int, days_ahead: int = 30) -> List[Dict]:
+    try:
+        digest = next(fan_out_paper_deadlines(days_ahead, user_ids=[user_id]), None)
+        matching_deadlines = digest["deadlines"] if digest else []
+
         # Display upcoming deadlines
-        if not matching_deadline_conferences:
+        if not matching_deadlines:
             print(f"No conferences matching your interests have paper deadlines in the next {days_ahead} days")
             return []
         
         print(f"\n🚨 UPCOMING PAPER DEADLINES for User {user_id}:")
-        print(f"Found {len(matching_deadline_conferences)} conferences with deadlines in the next {days_ahead} days:\n")
+        print(f"Found {len(matching_deadlines)} paper deadlines in the next {days_ahead} days:\n")
         
-        for conf in matching_deadline_conferences:
-            deadline = conf.get('PaperDeadline')
-            days_remaining = (deadline - datetime.now().date()).days if deadline else 0
+        for paper in matching_deadlines:
+            deadline = paper.get('DueDate')
+            days_remaining = (deadline - datetime.now()).days if deadline else 0
             
-            print(f"📅 Conference: {conf.get('Title')}")
+            print(f"📅 Conference: {paper.get('Title')}")
             print(f"   Paper Deadline: {deadline} ({days_remaining} days remaining)")
-            print(f"   Matched Interests: {', '.join(conf.get('Matched_Interests', []))}")
-            print(f"   Description: {conf.get('Descrip', '')[:100]}...")
+            print(f"   Paper: {paper.get('TypeOfPaper')} - {paper.get('Topic')}")
+            print(f"   Matched Interests: {', '.join(paper.get('Matched_Interests', []))}")
             print("-" * 60)
         
-        return matching_deadline_conferences
+        return matching_deadlines
         
     except Exception as e:
         print(f"Error checking paper deadlines: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
 
 if __name__ == "__main__":
@@ -175,6 +373,14 @@ if __name__ == "__main__":
     print("=== CONFERENCE RECOMMENDATIONS ===")
     recs = get_personal_conference_recommendations(test_user_id)
     
+    print("\n" + "="*50)
+    print("=== BATCH RECOMMENDATIONS (all users) ===")
+    batch_stats = {}
+    for result in get_batch_conference_recommendations(stats=batch_stats):
+        print(f"User {result['user_id']}: {len(result['recommendations'])} conferences")
+    print(f"{batch_stats.get('users', 0)} users in {batch_stats.get('seconds', 0)}s "
+          f"({batch_stats.get('users_per_second')} users/sec)")
+
     print("\n" + "="*50)
     print("=== UPCOMING PAPER DEADLINES ===")
     deadlines = notify_user_of_paper_deadlines(test_user_id, days_ahead=30)
\ No newline at end of file
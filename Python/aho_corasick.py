@@ -0,0 +1,59 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: finds every pattern occurring in a text in one pass.
+
+    Patterns are matched as plain substrings (overlaps included), so
+    `find(text)` reports pattern i exactly when `patterns[i] in text`.
+    Lowercase both sides first for case-insensitive matching.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        # Node 0 is the root. goto[n] maps a character to the next node,
+        # fail[n] is the longest proper suffix of n's path that is also a
+        # trie path, and out[n] lists the patterns ending at n (its own and
+        # those reachable through fail links).
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for i, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+            self._out[node] += (i,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def find(self, text):
+        """Indices of the patterns that occur in `text`"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
@@ -0,0 +1,109 @@
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class BufferedWriter:
+    """Background writer for append-only rows (AuditLog, LoginAttempts).
+
+    put() only appends to a bounded in-memory queue; a thread writes the
+    rows with one multi-row executemany per batch, once `batch_size` rows are
+    waiting or `flush_interval` seconds after the first of them arrived. When
+    the queue is full, rows are dropped and counted rather than blocking the
+    caller. close() writes whatever is still queued.
+    """
+
+    def __init__(self, get_connection, sql, name="writer", max_queue=10000, batch_size=500,
+                 flush_interval=1.0):
+        self._get_connection = get_connection
+        self.sql = sql
+        self.name = name
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "failed": 0, "batches": 0, "last_batch_ms": None}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, row):
+        """Queue one row of parameters for `sql`. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            return False
+
+    def close(self, timeout=10):
+        """Write everything queued so far and stop the thread"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logging.error('%s: queue still full at shutdown', self.name)
+            return
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize(), max_queue=self.max_queue)
+
+    def _write(self, rows):
+        started = time.perf_counter()
+        try:
+            conn = self._get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.executemany(self.sql, rows)
+                conn.commit()
+                cursor.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            logging.error('%s: failed to write %s row(s): %s', self.name, len(rows), e)
+            with self._lock:
+                self._stats["failed"] += len(rows)
+            return
+        with self._lock:
+            self._stats["written"] += len(rows)
+            self._stats["batches"] += 1
+            self._stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _run(self):
+        while True:
+            row = self._queue.get()
+            stopping = row is _STOP
+            batch = [] if stopping else [row]
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                else:
+                    batch.append(row)
+            if stopping:
+                # Drain rows queued ahead of the stop marker's batch
+                while True:
+                    try:
+                        row = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if row is not _STOP:
+                        batch.append(row)
+            for start in range(0, len(batch), self.batch_size):
+                self._write(batch[start:start + self.batch_size])
+            if stopping:
+                return
@@ -0,0 +1,80 @@
+# Benchmark: throughput of the Flask app (app.py) against the async app (async_app.py)
+# under many concurrent dashboard clients.
+#
+# Start both servers first, from the base ConfSpotter folder:
+#   python3 app.py                                              (port 5001)
+#   hypercorn async_app:app --bind 0.0.0.0:5002 --workers 2     (port 5002)
+# then run:
+#   python3 Python/benchmark_async.py [clients] [seconds] [user_id]
+
+import sys
+import threading
+import time
+import urllib.request
+import urllib.error
+
+SERVERS = {
+    "flask": "http://localhost:5001",
+    "async": "http://localhost:5002",
+}
+
+# What a dashboard load asks for
+DASHBOARD_PATHS = [
+    "/api/conferences",
+    "/api/users/{user_id}/favorites",
+    "/api/users/{user_id}/recommendations",
+]
+
+
+def client_loop(base_url, paths, deadline, latencies, errors, lock):
+    local_latencies = []
+    local_errors = 0
+    i = 0
+    while time.perf_counter() < deadline:
+        url = base_url + paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=30) as resp:
+                resp.read()
+            local_latencies.append(time.perf_counter() - started)
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run(base_url, clients, seconds, user_id):
+    paths = [p.format(user_id=user_id) for p in DASHBOARD_PATHS]
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=client_loop, args=(base_url, paths, deadline, latencies, errors, lock))
+        for _ in range(clients)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+
+    return len(latencies) / seconds, pct(0.50), pct(0.99), errors[0]
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 20
+    user_id = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    print(f"{clients} concurrent clients for {seconds}s each\n")
+    print(f"{'server':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, base_url in SERVERS.items():
+        rps, p50, p99, errors = run(base_url, clients, seconds, user_id)
+        print(f"{name:<8}{rps:>10.1f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark: answering "is this username taken?" from the Bloom filter vs a
+# query per keystroke, and the filter's measured false-positive rate.
+#
+# No database needed for the filter numbers. Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_availability.py [users]
+# With `mysql` it also times the unique-index lookup on the database in .env:
+#   python3 Python/benchmark_availability.py mysql [users]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bloom import BloomFilter
+
+
+def main():
+    args = sys.argv[1:]
+    with_mysql = bool(args) and args[0] == "mysql"
+    if with_mysql:
+        args = args[1:]
+    users = int(args[0]) if args else 100000
+
+    started = time.perf_counter()
+    bloom = BloomFilter(users * 2, 0.01)
+    bloom.update(f"user{i}" for i in range(users))
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Names that were never added: every "maybe" among them is a false positive
+    probes = [f"typed{i}" for i in range(100000)]
+    started = time.perf_counter()
+    maybes = sum(1 for name in probes if name in bloom)
+    lookup_us = (time.perf_counter() - started) / len(probes) * 1e6
+
+    print(f"users in filter            {users}")
+    print(f"filter size                {bloom.stats()['size_kb']} KB, {bloom.num_hashes} hashes")
+    print(f"build                      {build_ms:.1f} ms")
+    print(f"lookup                     {lookup_us:.2f} us")
+    print(f"false positives            {maybes / len(probes):.2%} (these still cost a query)")
+
+    if with_mysql:
+        from connection import get_connection
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        iterations = 500
+        started = time.perf_counter()
+        for i in range(iterations):
+            cursor.execute("SELECT 1 FROM user WHERE username = %s LIMIT 1", (f"typed{i}",))
+            cursor.fetchall()
+        print(f"unique-index query         {(time.perf_counter() - started) / iterations * 1e6:.2f} us")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
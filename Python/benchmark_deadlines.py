@@ -0,0 +1,90 @@
+# Benchmark: notifying every user of upcoming paper deadlines, one user at
+# a time (what calling notify_user_of_paper_deadlines per user did: rescan
+# the whole deadline window for each user) vs the single-pass
+# DeadlineFanOut in KeyFeatures.py.
+#
+# No database needed; the deadline window is generated in DueDate order,
+# the way fan_out_paper_deadlines reads it. Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_deadlines.py [users] [deadlines]
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from KeyFeatures import DeadlineFanOut
+from benchmark_recommendations import TOPICS, conference_rows
+
+
+def deadline_window(conferences, n):
+    now = datetime.now()
+    rows = []
+    for pid in range(1, n + 1):
+        conf = random.choice(conferences)
+        rows.append({
+            "PID": pid,
+            "TypeOfPaper": random.choice(["Full Paper", "Short Paper", "Poster", "Workshop"]),
+            "Topic": conf["Title"][:100],
+            "DueDate": now + timedelta(minutes=random.randint(1, 30 * 24 * 60)),
+            "CID": conf["CID"],
+            "Title": conf["Title"],
+            "Descrip": conf["Descrip"],
+        })
+    rows.sort(key=lambda row: (row["DueDate"], row["CID"]))
+    return rows
+
+
+def per_user(users, window, max_per_user):
+    """One pass over the window per user, substring-testing each interest"""
+    digests = 0
+    for _, interests in users:
+        found = []
+        for row in window:
+            title = (row["Title"] or "").lower()
+            description = (row["Descrip"] or "").lower()
+            matched = [i for i in interests if i.lower() in title or i.lower() in description]
+            if matched and len(found) < max_per_user:
+                found.append(dict(row, Matched_Interests=matched))
+        digests += bool(found)
+    return digests
+
+
+def fan_out(users, window, max_per_user):
+    engine = DeadlineFanOut(users, max_per_user)
+    for row in window:
+        engine.add(row)
+    return sum(1 for _ in engine.results())
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_deadlines = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    random.seed(42)
+
+    conferences = conference_rows(max(1, n_deadlines // 3))
+    window = deadline_window(conferences, n_deadlines)
+    users = [(user_id, random.sample(TOPICS, 3)) for user_id in range(1, n_users + 1)]
+    print(f"{n_users} users, {n_deadlines} deadlines in the window, 20 per digest\n")
+    print(f"{'':<30}{'seconds':>10}{'users/sec':>12}{'digests':>10}")
+
+    # The per-user loop is far slower; time it on a sample of users
+    sample = users[: max(1, min(n_users, 50))]
+    for name, fn, subset in (("per user (before)", per_user, sample), ("fan-out (one pass)", fan_out, users)):
+        started = time.perf_counter()
+        digests = fn(subset, window, 20)
+        elapsed = time.perf_counter() - started
+        label = f"{name} [{len(subset)} users]"
+        print(f"{label:<30}{elapsed:>10.2f}{len(subset) / elapsed:>12.0f}{digests:>10}")
+
+    # Separate run: tracemalloc slows Python down too much to time with it on
+    tracemalloc.start()
+    fan_out(users, window, 20)
+    print(f"\nfan-out peak memory: {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
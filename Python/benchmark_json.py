@@ -0,0 +1,103 @@
+# Benchmark: bytes and CPU per request for the JSON encoders and response
+# compression used by app.py, on payloads shaped like the existing endpoints.
+#
+# No database needed; rows are generated with the same columns MySQL returns.
+# Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_json.py [conferences] [iterations]
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from json_provider import OrjsonProvider, StdJSONProvider, orjson
+from compression import available_encodings, compress
+
+WORDS = ("conference systems learning data human computer interaction security networks "
+         "artificial intelligence software engineering theory robotics vision language").split()
+
+
+def sentence(n):
+    return " ".join(random.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def conference_rows(n):
+    start = datetime(2026, 1, 1)
+    rows = []
+    for cid in range(1, n + 1):
+        begins = start + timedelta(days=random.randint(0, 700))
+        rows.append({
+            "CID": cid,
+            "Title": f"International Conference on {sentence(4)[:-1]} {cid}",
+            "Start_Date": begins,
+            "End_Date": begins + timedelta(days=3),
+            "Descrip": " ".join(sentence(random.randint(12, 25)) for _ in range(random.randint(4, 12))),
+            "link": f"https://conference{cid}.example.org",
+            "LID": random.randint(1, 200),
+        })
+    return rows
+
+
+def paper_rows(n):
+    return [{
+        "PID": pid,
+        "TypeOfPaper": random.choice(["Full Paper", "Short Paper", "Poster", "Workshop"]),
+        "Topic": sentence(3)[:-1],
+        "DueDate": datetime(2026, 1, 1) + timedelta(days=random.randint(0, 500)),
+        "CID": random.randint(1, n),
+    } for pid in range(1, n * 2 + 1)]
+
+
+def payloads(n):
+    conferences = conference_rows(n)
+    recommendations = [dict(c, Matched_Interests=["AI"]) for c in conferences[: n // 4]]
+    return {
+        "GET /api/conferences": conferences,
+        "GET /api/conferences?fields=CID,Title,Start_Date": [
+            {k: c[k] for k in ("CID", "Title", "Start_Date")} for c in conferences
+        ],
+        "GET /api/papers": paper_rows(n),
+        "GET /api/users/<id>/recommendations": {"recommendations": recommendations},
+    }
+
+
+def time_per_call(fn, iterations):
+    started = time.process_time()
+    for _ in range(iterations):
+        result = fn()
+    return (time.process_time() - started) * 1000 / iterations, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    random.seed(42)
+
+    app = Flask(__name__)
+    providers = {"std": StdJSONProvider(app)}
+    if orjson is not None:
+        providers["orjson"] = OrjsonProvider(app)
+    else:
+        print("orjson not installed; only the std encoder is measured\n")
+
+    print(f"{n} conferences, {iterations} iterations, CPU ms per request\n")
+    for endpoint, payload in payloads(n).items():
+        print(endpoint)
+        with app.app_context():
+            for name, provider in providers.items():
+                ms, response = time_per_call(lambda: provider.response(payload), iterations)
+                body = response.get_data()
+                print(f"  encode {name:<7}{len(body):>10} bytes {ms:>8.2f} ms")
+            for encoding in available_encodings():
+                ms, compressed = time_per_call(lambda: compress(body, encoding), iterations)
+                print(f"  + {encoding:<11}{len(compressed):>10} bytes {ms:>8.2f} ms"
+                      f"  ({len(compressed) / len(body):.0%} of identity)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
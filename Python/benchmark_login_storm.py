@@ -0,0 +1,172 @@
+# Benchmark: latency of a cheap endpoint while a storm of logins runs
+# bcrypt, with bcrypt inline in the request thread (before) vs on the
+# bounded PasswordHasher pool (after, shedding with 503 when full).
+#
+# By default it needs no database: a small threaded Flask app is started
+# in-process with a bcrypt-verifying /login and a cheap JSON /ping. Run from
+# the base ConfSpotter folder:
+#   python3 Python/benchmark_login_storm.py [storm_clients] [seconds]
+#
+# With `server` it instead hits a running app.py (python3 app.py) with real
+# logins for an existing user and GET /api/conferences?limit=20 as the cheap call,
+# and samples /api/db/pool-stats to show whether logins waiting on bcrypt tie
+# up database connections (peak in use, waits and timeouts during the storm):
+#   python3 Python/benchmark_login_storm.py server <login> <password> [storm_clients] [seconds]
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import bcrypt
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from password_hasher import DEFAULT_WORKERS, PasswordHasher, PasswordHasherBusy
+
+PROBE_CLIENTS = 4
+ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def local_app(hasher):
+    from flask import Flask, jsonify
+
+    app = Flask("login-storm")
+    stored = bcrypt.hashpw(b"Password123", bcrypt.gensalt(ROUNDS))
+    rows = [{"CID": i, "Title": f"Conference {i}"} for i in range(20)]
+
+    @app.post("/login")
+    def login():
+        try:
+            if hasher:
+                hasher.verify("Password123", stored.decode())
+            else:
+                bcrypt.checkpw(b"Password123", stored)
+        except PasswordHasherBusy as e:
+            return jsonify({"error": "busy"}), 503, {"Retry-After": str(e.retry_after)}
+        return jsonify({"message": "Login successful"})
+
+    @app.get("/ping")
+    def ping():
+        return jsonify(rows)
+
+    return app
+
+
+def serve(app):
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def call(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def fetch_json(url):
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.loads(resp.read())
+
+
+def sample_pool(stats_url, stop, peak):
+    while not stop.is_set():
+        peak["in_use"] = max(peak["in_use"], fetch_json(stats_url).get("in_use", 0))
+        stop.wait(0.1)
+
+
+def storm(login_url, login_body, cheap_url, clients, seconds):
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    logins = {"ok": 0, "shed": 0, "other": 0}
+    probes = []
+
+    def login_loop():
+        while time.perf_counter() < deadline:
+            status = call(login_url, login_body)
+            with lock:
+                logins["ok" if status == 200 else "shed" if status == 503 else "other"] += 1
+            if status == 503:
+                time.sleep(0.05)  # a real client would honour Retry-After
+
+    def probe_loop():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            call(cheap_url)
+            with lock:
+                probes.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=login_loop) for _ in range(clients)]
+    threads += [threading.Thread(target=probe_loop) for _ in range(PROBE_CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    probes.sort()
+
+    def pct(p):
+        return probes[min(len(probes) - 1, int(len(probes) * p))] * 1000 if probes else float("nan")
+
+    return pct(0.5), pct(0.99), len(probes) / seconds, logins
+
+
+def report(name, result):
+    p50, p99, rps, logins = result
+    print(f"{name:<26}{p50:>10.1f}{p99:>10.1f}{rps:>10.1f}{logins['ok']:>10}{logins['shed']:>8}{logins['other']:>8}")
+
+
+def main():
+    args = sys.argv[1:]
+    header = f"{'':<26}{'p50 ms':>10}{'p99 ms':>10}{'cheap/s':>10}{'logins':>10}{'503':>8}{'other':>8}"
+
+    if args and args[0] == "server":
+        login, password = args[1], args[2]
+        clients = int(args[3]) if len(args) > 3 else 32
+        seconds = float(args[4]) if len(args) > 4 else 20
+        base = "http://localhost:5001"
+        print(f"{clients} clients logging in + {PROBE_CLIENTS} on /api/conferences for {seconds}s against {base}\n")
+        print(header)
+        stats_url = f"{base}/api/db/pool-stats"
+        before = fetch_json(stats_url)
+        stop, peak = threading.Event(), {"in_use": 0}
+        sampler = threading.Thread(target=sample_pool, args=(stats_url, stop, peak), daemon=True)
+        sampler.start()
+        report("app.py", storm(f"{base}/api/login", {"login": login, "password": password},
+                               f"{base}/api/conferences?limit=20", clients, seconds))
+        stop.set()
+        sampler.join()
+        after = fetch_json(stats_url)
+        if after.get("pooling", True):
+            print(f"\nDB pool: peak {peak['in_use']}/{after['size']} in use, "
+                  f"{after['waits'] - before['waits']} waits, {after['timeouts'] - before['timeouts']} timeouts")
+        return
+
+    clients = int(args[0]) if args else 32
+    seconds = float(args[1]) if len(args) > 1 else 10
+    print(f"bcrypt cost {ROUNDS}, {os.cpu_count()} CPU(s), {clients} clients logging in + "
+          f"{PROBE_CLIENTS} on a cheap endpoint for {seconds}s each\n")
+    print(header)
+    for name, hasher in (("inline (before)", None),
+                         (f"pool of {DEFAULT_WORKERS} (after)", PasswordHasher(ROUNDS, DEFAULT_WORKERS))):
+        server, base = serve(local_app(hasher))
+        try:
+            report(name, storm(f"{base}/login", {}, f"{base}/ping", clients, seconds))
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
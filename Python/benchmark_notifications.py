@@ -0,0 +1,176 @@
+# Benchmark: emailing a digest to every user through a local SMTP sink,
+# opening a new SMTP connection per email (smtplib's usual one-shot use) vs
+# the SMTPPool the outbox worker sends through, with 1 and several threads.
+#
+# No database needed; digests are rendered with render_digest() from
+# synthetic deadline notifications, the way OutboxWorker builds them. The
+# sink is aiosmtpd (pip install aiosmtpd), started in-process and discarding
+# messages. Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_notifications.py [users] [threads]
+# With `mysql` it instead times the whole outbox path on the database in .env:
+# queue 3 notifications for each of up to [users] users, then let OutboxWorker
+# claim, send and finish them (only rows this run queued; they're deleted after):
+#   python3 Python/benchmark_notifications.py mysql [users] [threads]
+
+import os
+import random
+import smtplib
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from notifications import OutboxWorker, SMTPPool, enqueue_notifications, render_digest, smtp_connector
+from benchmark_recommendations import TOPICS
+
+HOST, PORT = "127.0.0.1", 8025
+MAIL_FROM = "ConfSpotter <noreply@confspotter.local>"
+
+
+class Sink:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 OK"
+
+
+def digests(n):
+    now = datetime.now()
+    for user_id in range(1, n + 1):
+        notifications = []
+        for pid in random.sample(range(1, 5000), random.randint(1, 5)):
+            notifications.append(("deadline", f"deadline:{user_id}:{pid}:7d", {
+                "PID": pid, "Title": f"Conference on {random.choice(TOPICS).title()}",
+                "TypeOfPaper": "Full Paper", "DueDate": str(now + timedelta(days=7)),
+                "Reminder_Days": 7, "Matched_Interests": random.sample(TOPICS, 2),
+            }))
+        yield render_digest(MAIL_FROM, f"user{user_id}@example.com", f"user{user_id}", notifications)
+
+
+def connection_per_email(messages, threads):
+    for msg in messages:
+        with smtplib.SMTP(HOST, PORT) as smtp:
+            smtp.send_message(msg)
+
+
+def pooled(messages, threads):
+    pool = SMTPPool(smtp_connector(HOST, PORT), size=threads)
+    chunks = [messages[i::threads] for i in range(threads)]
+
+    def send(chunk):
+        for msg in chunk:
+            pool.send(msg)
+
+    workers = [threading.Thread(target=send, args=(chunk,)) for chunk in chunks]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    pool.close()
+
+
+def outbox(n_users, threads, sink):
+    """Queue notifications in NotificationOutbox and time OutboxWorker draining them"""
+    from connection import get_connection
+
+    prefix = f"bench:{int(time.time())}:"
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT ID FROM `user` WHERE email IS NOT NULL ORDER BY ID LIMIT %s", (n_users,))
+        user_ids = [row[0] for row in cursor.fetchall()]
+        if not user_ids:
+            sys.exit("No users with an email address to queue notifications for")
+        now = datetime.now()
+        started = time.perf_counter()
+        queued = enqueue_notifications(cursor, (
+            (user_id, "deadline", f"{prefix}{user_id}:{pid}", {
+                "PID": pid, "Title": f"Conference on {random.choice(TOPICS).title()}",
+                "TypeOfPaper": "Full Paper", "DueDate": now + timedelta(days=7), "Reminder_Days": 7,
+            })
+            for user_id in user_ids for pid in range(3)
+        ))
+        conn.commit()
+        queue_seconds = time.perf_counter() - started
+
+        worker = OutboxWorker(get_connection, SMTPPool(smtp_connector(HOST, PORT), size=threads),
+                              MAIL_FROM, key_prefix=prefix)
+
+        def drain():
+            while worker.run_once():
+                pass
+
+        before = sink.received
+        started = time.perf_counter()
+        workers = [threading.Thread(target=drain) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        drain_seconds = time.perf_counter() - started
+        worker.smtp.close()
+
+        print(f"{len(user_ids)} users, {queued} outbox rows, {threads} worker thread(s)\n")
+        print(f"queue (one executemany)          {queue_seconds:>8.2f}s")
+        print(f"claim + send + finish            {drain_seconds:>8.2f}s"
+              f"  {queued / drain_seconds:>8.0f} rows/s  {(sink.received - before) / drain_seconds:>6.0f} emails/s")
+        print(f"1M users at this rate            {1_000_000 / len(user_ids) * drain_seconds / 60:>8.1f}m")
+        print(f"worker counters                  {worker.stats}")
+    finally:
+        cursor.execute("DELETE FROM NotificationOutbox WHERE idempotency_key LIKE %s", (prefix + "%",))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+
+def main():
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        sys.exit("aiosmtpd is needed for the SMTP sink: pip install aiosmtpd")
+
+    args = sys.argv[1:]
+    with_mysql = bool(args) and args[0] == "mysql"
+    if with_mysql:
+        args = args[1:]
+    n_users = int(args[0]) if args else 5000
+    threads = int(args[1]) if len(args) > 1 else 4
+    random.seed(42)
+
+    sink = Sink()
+    controller = Controller(sink, hostname=HOST, port=PORT)
+    controller.start()
+    if with_mysql:
+        try:
+            outbox(n_users, threads, sink)
+        finally:
+            controller.stop()
+        return
+
+    messages = list(digests(n_users))
+    try:
+        print(f"{n_users} digest emails to a local aiosmtpd sink\n")
+        print(f"{'':<32}{'seconds':>10}{'emails/sec':>12}{'1M users':>12}")
+        # One connection per email is slow; time it on a sample
+        sample = messages[: max(1, n_users // 5)]
+        for name, fn, subset, n_threads in (
+            ("connection per email (before)", connection_per_email, sample, 1),
+            ("pooled, 1 thread", pooled, messages, 1),
+            (f"pooled, {threads} threads", pooled, messages, threads),
+        ):
+            before = sink.received
+            started = time.perf_counter()
+            fn(subset, n_threads)
+            elapsed = time.perf_counter() - started
+            assert sink.received - before == len(subset)
+            rate = len(subset) / elapsed
+            print(f"{name:<32}{elapsed:>10.2f}{rate:>12.0f}{1_000_000 / rate / 60:>10.1f}m")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
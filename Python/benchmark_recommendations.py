@@ -0,0 +1,146 @@
+# Benchmark: compute time per recommendation request for the original
+# substring scan, the inverted interest index (mode=substring) and the
+# TF-IDF top-k scorer (mode=ranked), on a synthetic catalog.
+#
+# No database needed; conferences are generated with the Title/Descrip
+# shape the recommendation routes read. Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_recommendations.py [conferences] [requests]
+#
+# With `mysql` as the first argument it instead runs against the database in
+# .env, comparing the original "SELECT every conference + Python loop" with
+# mode=fulltext (MATCH ... AGAINST), in time and bytes sent by the server:
+#   python3 Python/benchmark_recommendations.py mysql [requests]
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from interest_index import InterestIndex
+from recommender import TfidfRecommender, fulltext_recommendation_query
+
+TOPICS = ("machine learning", "artificial intelligence", "AI", "data mining", "computer vision",
+          "software engineering", "human computer interaction", "security", "networks", "robotics",
+          "databases", "natural language processing", "quantum computing", "bioinformatics",
+          "cloud computing", "distributed systems", "theory", "graphics", "education", "ethics")
+FILLER = ("international conference workshop symposium research papers submissions authors "
+          "industry academia presentations keynote track session novel methods results "
+          "applications students community annual proceedings").split()
+
+
+def conference_rows(n):
+    rows = []
+    for cid in range(1, n + 1):
+        topics = random.sample(TOPICS, 3)
+        words = random.choices(FILLER, k=random.randint(30, 90)) + list(topics)
+        random.shuffle(words)
+        rows.append({
+            "CID": cid,
+            "Title": f"{random.choice(FILLER).title()} Conference on {topics[0].title()} {cid}",
+            "Descrip": " ".join(words),
+        })
+    return rows
+
+
+def substring_scan(rows, interests):
+    """The loop get_user_recommendations() used before the index"""
+    matched = []
+    for conf in rows:
+        title = (conf.get("Title") or "").lower()
+        description = (conf.get("Descrip") or "").lower()
+        matched_interests = [i for i in interests if i.lower() in title or i.lower() in description]
+        if matched_interests:
+            matched.append(dict(conf, Matched_Interests=matched_interests))
+    return matched
+
+
+def timed(fn, users):
+    times = []
+    for interests in users:
+        started = time.perf_counter()
+        result = fn(interests)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), max(times), len(result)
+
+
+def mysql_benchmark(requests):
+    from connection import get_connection
+
+    conn = get_connection()
+    cur = conn.cursor(dictionary=True)
+    cur.execute("SELECT Interest_1, Interest_2, Interest_3 FROM `user`")
+    users = [[i.strip() for i in row.values() if i and i.strip()] for row in cur.fetchall()]
+    users = [interests for interests in users if interests][:requests]
+    if not users:
+        print("No users with interests in the database; using synthetic interests")
+        users = [random.sample(TOPICS, 3) for _ in range(requests)]
+    cur.execute("SELECT COUNT(*) AS n FROM Conferences")
+    print(f"{cur.fetchone()['n']} conferences, {len(users)} users\n")
+
+    def bytes_sent():
+        cur.execute("SHOW SESSION STATUS LIKE 'Bytes_sent'")
+        return int(cur.fetchone()["Value"])
+
+    def python_loop(interests):
+        cur.execute("SELECT CID, Title, Descrip, Start_Date, End_Date FROM Conferences")
+        return substring_scan(cur.fetchall(), interests)
+
+    def fulltext(interests):
+        sql, params = fulltext_recommendation_query(interests, 20)
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+    print(f"{'':<28}{'median ms':>10}{'max ms':>10}{'KB/request':>12}")
+    for name, fn in (("python loop (before)", python_loop), ("mode=fulltext limit=20", fulltext)):
+        times, sent = [], []
+        for interests in users:
+            before = bytes_sent()
+            started = time.perf_counter()
+            fn(interests)
+            times.append((time.perf_counter() - started) * 1000)
+            sent.append(bytes_sent() - before)
+        print(f"{name:<28}{statistics.median(times):>10.3f}{max(times):>10.3f}"
+              f"{statistics.mean(sent) / 1024:>12.1f}")
+    cur.close()
+    conn.close()
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "mysql":
+        random.seed(42)
+        return mysql_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 50)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    random.seed(42)
+
+    rows = conference_rows(n)
+    users = [random.sample(TOPICS, 3) for _ in range(requests)]
+
+    started = time.perf_counter()
+    index = InterestIndex()
+    index.rebuild(rows)
+    index_build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = TfidfRecommender()
+    ranked.rebuild(rows)
+    ranked_build = time.perf_counter() - started
+
+    print(f"{n} conferences, {requests} users with 3 interests each")
+    print(f"build: interest index {index_build:.2f}s, tf-idf model {ranked_build:.2f}s\n")
+    print(f"{'':<28}{'median ms':>10}{'max ms':>10}{'results':>10}")
+    scan_requests = users[: max(1, requests // 10)]  # the full scan is slow; sample fewer users
+    for name, fn, sample in (
+        ("substring scan (before)", lambda i: substring_scan(rows, i), scan_requests),
+        ("mode=substring (index)", index.match, users),
+        ("mode=ranked limit=20", lambda i: ranked.recommend(i, 20), users),
+    ):
+        median, worst, results = timed(fn, sample)
+        print(f"{name:<28}{median:>10.3f}{worst:>10.3f}{results:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Benchmark: connects and commits per request for the multi-step user endpoints,
+# before (one connection per helper, autocommit) and after (pooled,
+# request-scoped connection with one transaction per request).
+#
+# Needs the confspotter database running with SQL/shell.sql,
+# SQL/SecurityFeatures.sql and the stored procedures loaded.
+# Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_request_scope.py [rounds]
+
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "before": {"DB_POOL_SIZE": "0", "REQUEST_SCOPED_DB": "0"},
+    "after": {"DB_POOL_SIZE": "10", "REQUEST_SCOPED_DB": "1"},
+}
+
+
+def server_status(cursor):
+    cursor.execute(
+        "SHOW GLOBAL STATUS WHERE Variable_name IN ('Connections', 'Handler_commit', 'Com_commit')"
+    )
+    return {name: int(value) for name, value in cursor.fetchall()}
+
+
+def run_flow(rounds):
+    """Runs signup -> login -> update -> delete `rounds` times and prints the server counter deltas"""
+    sys.path.insert(0, ROOT)
+    from app import app
+    from Python.connection import _connect
+
+    client = app.test_client()
+    monitor = _connect()
+    cursor = monitor.cursor()
+
+    requests_made = 0
+    before = server_status(cursor)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        name = "bench_" + uuid.uuid4().hex[:12]
+        password = "Benchmark1pass"
+        resp = client.post("/api/signup", json={
+            "username": name,
+            "email": f"{name}@example.com",
+            "password": password,
+            "Interest_1": "AI",
+        })
+        user_id = resp.json["user"]["id"]
+        client.post("/api/login", json={"login": name, "password": password})
+        client.put(f"/api/users/{user_id}", json={
+            "username": name,
+            "email": f"{name}@example.com",
+            "Interest_1": "Databases",
+        })
+        client.delete(f"/api/users/{user_id}")
+        requests_made += 4
+    elapsed = time.perf_counter() - started
+    after = server_status(cursor)
+
+    cursor.close()
+    monitor.close()
+    print(json.dumps({
+        "requests": requests_made,
+        "seconds": elapsed,
+        "deltas": {k: after[k] - before[k] for k in before},
+    }))
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    print(f"{rounds} rounds of signup/login/update/delete per mode\n")
+    print(f"{'mode':<8}{'connects/req':>14}{'commits/req':>14}{'COMMIT stmts/req':>18}{'ms/req':>10}")
+    for mode, env in MODES.items():
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run", str(rounds)],
+            env={**os.environ, **env}, cwd=ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{mode}: failed\n{proc.stderr}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        n = result["requests"]
+        d = result["deltas"]
+        print(f"{mode:<8}{d['Connections'] / n:>14.2f}{d['Handler_commit'] / n:>14.2f}"
+              f"{d['Com_commit'] / n:>18.2f}{result['seconds'] * 1000 / n:>10.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--run":
+        run_flow(int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,76 @@
+# Benchmark: cost of checking a session token (HMAC + JSON parse) per request,
+# against the `SELECT * FROM user WHERE ID = ...` lookup it replaces.
+#
+# No database needed for the token numbers. Run from the base ConfSpotter folder:
+#   python3 Python/benchmark_tokens.py [iterations]
+# With `mysql` it also times the user lookup on the database in .env:
+#   python3 Python/benchmark_tokens.py mysql [iterations]
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tokens import InvalidToken, TokenSigner
+
+
+def per_call_us(fn, iterations):
+    # Median of 5 runs, each timing `iterations` calls
+    runs = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        runs.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(runs)
+
+
+def main():
+    args = sys.argv[1:]
+    with_mysql = bool(args) and args[0] == "mysql"
+    if with_mysql:
+        args = args[1:]
+    iterations = int(args[0]) if args else 20000
+
+    # Two keys: the old one still verifies after rotation
+    old = TokenSigner([("2025a", b"old-secret-" * 3)])
+    signer = TokenSigner([("2026a", b"new-secret-" * 3), ("2025a", b"old-secret-" * 3)])
+    token, _ = signer.issue(42, ["machine learning", "security", "robotics"])
+    old_token, _ = old.issue(42, ["machine learning", "security", "robotics"])
+    forged = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+
+    def reject():
+        try:
+            signer.verify(forged)
+        except InvalidToken:
+            pass
+
+    print(f"{'':<36}{'us/call':>10}")
+    for name, fn in (
+        ("issue", lambda: signer.issue(42, ["machine learning", "security", "robotics"])),
+        ("verify (current key)", lambda: signer.verify(token)),
+        ("verify (rotated-out key)", lambda: signer.verify(old_token)),
+        ("reject bad signature", reject),
+    ):
+        print(f"{name:<36}{per_call_us(fn, iterations):>10.2f}")
+
+    if with_mysql:
+        from connection import get_connection
+
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT MIN(ID) AS id FROM user")
+        user_id = cursor.fetchone()["id"] or 1
+
+        def lookup():
+            cursor.execute("SELECT * FROM user WHERE ID = %s", (user_id,))
+            cursor.fetchall()
+
+        print(f"{'SELECT * FROM user (pooled conn)':<36}{per_call_us(lookup, max(1, iterations // 20)):>10.2f}")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import hashlib
+import math
+
+# Bloom filter for "is this username/email taken?" checks: "no" is certain,
+# "maybe" has to be confirmed against MySQL. Nothing can be removed, so the
+# owner rebuilds it when rows are deleted or renamed.
+
+
+class BloomFilter:
+    def __init__(self, capacity=10000, error_rate=0.01):
+        """Sized so `capacity` entries give about `error_rate` false positives"""
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one 128-bit digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def stats(self):
+        return {"entries": self.count, "capacity": self.capacity, "bits": self.num_bits,
+                "hashes": self.num_hashes, "size_kb": round(len(self._bits) / 1024, 1),
+                "error_rate": self.error_rate}
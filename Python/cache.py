@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries also expire `ttl` seconds after being set.
+
+    Thread-safe. Keeps hit/miss/eviction counters so the size can be tuned
+    from stats().
+    """
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._tag = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def values(self):
+        """Unexpired values, for writers that patch cached entries in place"""
+        with self._lock:
+            now = self._clock()
+            return [value for expires_at, value in self._data.values() if expires_at > now]
+
+    def pop(self, key):
+        with self._lock:
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def sync(self, tag):
+        """Clear the cache if `tag` (e.g. a catalog version) differs from the last one seen"""
+        with self._lock:
+            if tag == self._tag:
+                return
+            self._tag = tag
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def adopt(self, tag, successor):
+        """For a writer that has already dropped or patched the entries its own
+        change affected: keep the rest if `tag` is exactly successor(last tag),
+        i.e. nothing but that write happened since. Otherwise another process
+        changed something too, so clear as sync() would."""
+        with self._lock:
+            if tag == self._tag:
+                return
+            own_write = self._tag is not None and tag is not None and tag == successor(self._tag)
+            self._tag = tag
+            if not own_write:
+                self.invalidations += len(self._data)
+                self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,169 @@
+import hashlib
+import threading
+from datetime import date, datetime, timedelta
+
+# iCalendar (RFC 5545) feeds of a user's favorited conferences and their
+# paper deadlines, served by GET /api/users/<id>/calendar.ics.
+
+PRODID = "-//ConfSpotter//Calendar Feed//EN"
+# Hint to calendar clients about how often to poll
+REFRESH_INTERVAL = "PT1H"
+# DTSTAMP is required on every event. A fixed value keeps the feed (and so its
+# ETag) a pure function of the data; clients track changes by UID and content.
+DTSTAMP = "20240101T000000Z"
+
+
+def _escape(text):
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line):
+    """Split a content line into 75-octet pieces, continuation lines starting with a space"""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    pieces, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        # Don't cut a multi-byte character in half
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(raw[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _date_value(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _event(uid, fields):
+    lines = ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{DTSTAMP}"]
+    lines += [f"{name}:{value}" for name, value in fields if value not in (None, "")]
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def conference_event(conf):
+    """All-day event spanning the conference. `conf` carries CID, Title, Descrip,
+    Start_Date, End_Date, link and optionally City/State/Country."""
+    start = _date_value(conf.get("Start_Date"))
+    end = _date_value(conf.get("End_Date")) or start
+    if not isinstance(start, date):
+        return None
+    location = ", ".join(str(conf[k]) for k in ("City", "State", "Country") if conf.get(k))
+    return _event(f"conference-{conf['CID']}@confspotter", [
+        ("DTSTART;VALUE=DATE", start.strftime("%Y%m%d")),
+        # DTEND is exclusive for all-day events
+        ("DTEND;VALUE=DATE", (max(end, start) + timedelta(days=1)).strftime("%Y%m%d")),
+        ("SUMMARY", _escape(conf.get("Title") or "")),
+        ("DESCRIPTION", _escape(conf.get("Descrip") or "")),
+        ("LOCATION", _escape(location)),
+        ("URL", conf.get("link")),
+    ])
+
+
+def deadline_event(paper, conference_title):
+    """Paper deadline at its DueDate, with a reminder a day before"""
+    due = paper.get("DueDate")
+    if not isinstance(due, datetime):
+        return None
+    summary = f"Deadline: {paper.get('TypeOfPaper')} - {conference_title}"
+    event = _event(f"paper-{paper['PID']}@confspotter", [
+        ("DTSTART", due.strftime("%Y%m%dT%H%M%S")),
+        ("SUMMARY", _escape(summary)),
+        ("DESCRIPTION", _escape(paper.get("Topic") or "")),
+    ])
+    alarm = "".join(_fold(line) for line in (
+        "BEGIN:VALARM", "TRIGGER:-P1D", "ACTION:DISPLAY", f"DESCRIPTION:{_escape(summary)}", "END:VALARM"))
+    return event.replace("END:VEVENT\r\n", alarm + "END:VEVENT\r\n")
+
+
+class CalendarFeed:
+    """One user's feed, kept as rendered VEVENT blocks so a change to one
+    favorite or paper re-renders only that event.
+
+    `body` and `etag` are recomputed lazily after a change. Thread-safe.
+    `favorites_change` is the owner's bookkeeping: the last FavoriteChanges
+    row the feed's favorites are known to include.
+    """
+
+    def __init__(self, conferences, papers, favorites_change=0):
+        self._lock = threading.Lock()
+        self.favorites_change = favorites_change
+        self._titles = {}       # CID -> conference title, for the favorited conferences
+        self._events = {}       # UID -> (CID, VEVENT text)
+        self._body = None
+        self._etag = None
+        for conf in conferences:
+            self._add_conference(conf)
+        for paper in papers:
+            self._set_paper(paper)
+
+    def _add_conference(self, conf):
+        self._titles[conf["CID"]] = conf.get("Title") or ""
+        event = conference_event(conf)
+        if event:
+            self._events[f"conference-{conf['CID']}"] = (conf["CID"], event)
+
+    def _set_paper(self, paper):
+        key = f"paper-{paper['PID']}"
+        self._events.pop(key, None)
+        cid = paper.get("CID")
+        if cid in self._titles:
+            event = deadline_event(paper, self._titles[cid])
+            if event:
+                self._events[key] = (cid, event)
+
+    def _changed(self):
+        self._body = None
+        self._etag = None
+
+    def set_conference(self, conf, papers):
+        """A conference was favorited; `papers` are all of its papers"""
+        with self._lock:
+            self._drop_conference(conf["CID"])
+            self._add_conference(conf)
+            for paper in papers:
+                self._set_paper(paper)
+            self._changed()
+
+    def remove_conference(self, cid):
+        with self._lock:
+            if self._drop_conference(cid):
+                self._changed()
+
+    def _drop_conference(self, cid):
+        if self._titles.pop(cid, None) is None:
+            return False
+        for key in [key for key, (event_cid, _) in self._events.items() if event_cid == cid]:
+            del self._events[key]
+        return True
+
+    def set_paper(self, pid, paper):
+        """A paper was added, edited (paper is its row) or deleted (paper is None)"""
+        with self._lock:
+            had = f"paper-{pid}" in self._events
+            if paper is not None:
+                self._set_paper(paper)
+            else:
+                self._events.pop(f"paper-{pid}", None)
+            if had or f"paper-{pid}" in self._events:
+                self._changed()
+
+    def render(self):
+        """(body bytes, etag)"""
+        with self._lock:
+            if self._body is None:
+                parts = ["BEGIN:VCALENDAR\r\n", "VERSION:2.0\r\n", f"PRODID:{PRODID}\r\n",
+                         "CALSCALE:GREGORIAN\r\n", "METHOD:PUBLISH\r\n", "X-WR-CALNAME:ConfSpotter\r\n",
+                         f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}\r\n",
+                         f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}\r\n"]
+                parts += [event for _, (_, event) in sorted(self._events.items())]
+                parts.append("END:VCALENDAR\r\n")
+                self._body = "".join(parts).encode("utf-8")
+                self._etag = hashlib.sha1(self._body).hexdigest()[:20]
+            return self._body, self._etag
@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+
+# Scopes tracked in the CatalogVersion table (see SQL/shell.sql)
+CATALOG_SCOPES = ("conferences", "papers", "users", "favorites")
+
+
+def bump_catalog_version(cursor, scope):
+    """Record that `scope` changed. Run it in the same transaction as the write."""
+    cursor.execute("""
+        INSERT INTO CatalogVersion (scope, version) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1
+    """, (scope,))
+
+
+def read_catalog_versions(cursor):
+    cursor.execute("SELECT scope, version FROM CatalogVersion")
+    return {scope: int(version) for scope, version in cursor.fetchall()}
+
+
+class CatalogVersions:
+    """In-process view of the CatalogVersion table.
+
+    get() re-reads the table through `load` at most once every `ttl`
+    seconds and answers from memory in between, so checking the version on
+    every request costs nothing. One caller does the re-read, outside the
+    lock; the others keep getting the previous versions until it lands.
+    Writes made by this process call invalidate() so they are seen on the
+    next read.
+    """
+
+    def __init__(self, load, ttl):
+        self._load = load
+        self.ttl = ttl
+        self._versions = {}
+        self._loaded_at = None
+        self._refreshing = False
+        self._generation = 0  # bumped by invalidate()
+        self._lock = threading.Lock()
+
+    def get(self, scope):
+        with self._lock:
+            now = time.monotonic()
+            stale = self._loaded_at is None or now - self._loaded_at >= self.ttl
+            if not stale or self._refreshing:
+                # None means unknown (table missing, unreadable or not read yet);
+                # callers skip version-based caching
+                return self._versions.get(scope)
+            self._refreshing = True
+            generation = self._generation
+        versions = None
+        try:
+            versions = self._load()
+        except Exception as e:
+            # Keep serving the last known versions; caches still expire by TTL
+            logging.error('Catalog version read failed: %s', e)
+        with self._lock:
+            self._refreshing = False
+            if versions is not None:
+                self._versions = versions
+            # An invalidate() during the read may not be in `versions`; read again next time
+            if generation == self._generation:
+                self._loaded_at = now
+            return self._versions.get(scope)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self._generation += 1
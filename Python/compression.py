@@ -0,0 +1,33 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Response types worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/calendar",
+    "text/plain",
+    "text/html",
+}
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding we support from the request's Accept-Encoding, or None"""
+    for encoding in available_encodings():
+        if accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level)
@@ -1,20 +1,222 @@
 import mysql.connector
 from mysql.connector import Error
 import os
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Pool settings. DB_POOL_SIZE=0 turns pooling off and every call to
+# get_connection() opens a brand-new connection like it used to.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# How long (seconds) a caller waits for a free connection before giving up
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Idle connections older than this (seconds) are pinged before being handed out
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "5"))
+# Seconds a client is told to wait (Retry-After) when no connection freed up
+DB_POOL_RETRY_AFTER = int(os.getenv("DB_POOL_RETRY_AFTER", "1"))
+
+
+def _connect():
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        user=os.getenv("DB_USER", "ConfSpotter"),
+        port=os.getenv("DB_PORT", "3306"),
+        password=os.getenv("DB_PASSWORD", "chickenlittle"),
+        database=os.getenv("DB_NAME", "confspotter"),
+        autocommit=True,
+    )
+
+
+class PoolExhausted(Error):
+    """Raised when no pooled connection frees up within DB_POOL_TIMEOUT;
+    the web app answers 503 with Retry-After"""
+
+    def __init__(self, msg):
+        super().__init__(msg)
+        self.retry_after = DB_POOL_RETRY_AFTER
+
+
+class PooledConnection:
+    """Wraps a MySQL connection so that close() hands it back to the pool.
+
+    Everything else is forwarded to the real connection, so route code can
+    keep calling conn.cursor(), conn.commit() and conn.close() as before.
+    """
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        if name in ("_pool", "_conn", "_released"):
+            raise AttributeError(name)
+        return getattr(self._conn, name)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool._release(self._conn)
+
+    def discard(self):
+        """Close the underlying connection instead of reusing it (e.g. after an aborted stream)"""
+        if not self._released:
+            self._released = True
+            self._pool._drop(self._conn)
+
+    # Safety net for handlers that return early or raise before close()
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections.
+
+    At most `size` connections exist at once. Idle connections are reused
+    most-recently-used first and are health-checked on checkout.
+    """
+
+    def __init__(self, size, timeout, ping_after, connect=_connect):
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._connect = connect
+        self._idle = deque()  # (connection, released_at)
+        self._in_use = 0
+        self._cond = threading.Condition()
+        # Counters for get_pool_stats()
+        self._created = 0
+        self._discarded = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self):
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while not self._idle and self._in_use >= self.size:
+                waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhausted(
+                        f"No database connection available after {self.timeout}s "
+                        f"(pool size {self.size})"
+                    )
+                self._cond.wait(remaining)
+            conn, released_at = self._idle.pop() if self._idle else (None, None)
+            self._in_use += 1
+            self._checkouts += 1
+            if waited:
+                wait = time.monotonic() - started
+                self._waits += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+
+        # Connect / health-check outside the lock so slow sockets don't block other callers
+        try:
+            if conn is not None and not self._healthy(conn, released_at):
+                self._discard(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+                with self._cond:
+                    self._created += 1
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def _healthy(self, conn, released_at):
+        if time.monotonic() - released_at < self.ping_after:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        with self._cond:
+            self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _drop(self, conn):
+        self._discard(conn)
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def _release(self, conn):
+        keep = True
+        try:
+            # Don't hand the next caller a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            keep = False
+        if not keep:
+            self._discard(conn)
+        with self._cond:
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_max * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / self._waits, 3) if self._waits else 0.0,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_AFTER)
+    return _pool
+
+
 def get_connection():
-    try:
-        conn = mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "ConfSpotter"),
-            port=os.getenv("DB_PORT", "3306"),
-            password=os.getenv("DB_PASSWORD", "chickenlittle"),
-            database=os.getenv("DB_NAME", "confspotter"),
-            autocommit=True,
-        )
-        return conn
-    except Error:
-        raise
+    if DB_POOL_SIZE <= 0:
+        return _connect()
+    return _get_pool().acquire()
+
+
+def get_pool_stats():
+    """Live pool counters (in use, idle, wait times) for sizing against worker count"""
+    if DB_POOL_SIZE <= 0:
+        return {"size": 0, "pooling": False}
+    stats = _get_pool().stats()
+    stats["pooling"] = True
+    return stats
@@ -6,6 +6,8 @@ import random
 import string
 import csv
 import mysql.connector
+from catalog import bump_catalog_version
+from recommendation_store import sync_changed_conferences
 
 #connects to database.
 connection = mysql.connector.connect(       # Replace values with those that match your database.
@@ -45,6 +47,17 @@ with open('papers_cleaned.csv', newline='') as data2:
             cursor.execute("INSERT INTO Papers (TypeOfPaper, Topic, DueDate, CID) VALUES (%s, %s, %s, %s)",
                            (y['type'][:50], y['conference_title'][:100], y['deadline'], cid))
             
+# Tell the running API that its cached conference/paper data is out of date
+bump_catalog_version(cursor, 'conferences')
+bump_catalog_version(cursor, 'papers')
 
 connection.commit()
+
+# Add the imported conferences to users' materialized recommendations
+try:
+    sync_changed_conferences(cursor)
+    connection.commit()
+except mysql.connector.Error as e:
+    print(f"Could not update materialized recommendations: {e}")
+
 connection.close()
\ No newline at end of file
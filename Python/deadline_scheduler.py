@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+# How long before a paper's DueDate each reminder goes out
+REMINDER_OFFSETS = (timedelta(days=30), timedelta(days=7), timedelta(days=1))
+
+# seq identifies the upsert/reload that built the entry, so moving a DueDate
+# away and back doesn't revive the first move's entries next to the new ones
+Reminder = namedtuple("Reminder", "fire_at pid due_date offset seq")
+
+
+class DeadlineScheduler:
+    """Fires paper deadline reminders at DueDate - offset, for every offset.
+
+    Upcoming reminders sit in a min-heap keyed by fire time. The worker
+    thread sleeps until the earliest one is due (or until something earlier
+    is scheduled), so reminders go out on time and nothing is polled.
+
+    Papers are loaded once with `load_window()` -> iterable of (PID, DueDate)
+    for papers not yet due. After that, writes made by this process call
+    upsert()/remove() and then adopt() with the version their bump produced.
+    Changes made elsewhere (CSV import, other workers) are noticed through
+    `version()` -- the 'papers' catalog version -- which is compared every
+    `resync_interval` seconds; the window is reloaded only if it moved past
+    what this process adopted.
+
+    Moving or deleting a paper doesn't touch the heap: its old entries are
+    recognised as stale when they reach the top (their seq is no longer the
+    paper's current one) and dropped. `on_due(reminders)` receives every reminder due
+    at the same moment in one call.
+    """
+
+    def __init__(self, load_window, on_due, version=None, offsets=REMINDER_OFFSETS,
+                 resync_interval=300, clock=datetime.now):
+        self._load_window = load_window
+        self._on_due = on_due
+        self._version = version
+        self.offsets = tuple(offsets)
+        self.resync_interval = resync_interval
+        self._clock = clock
+        self._heap = []
+        self._due = {}  # PID -> (DueDate, seq) of its live heap entries
+        self._seq = itertools.count()
+        self._loaded_version = None
+        self._loaded = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.stats = {"papers": 0, "pending": 0, "fired": 0, "stale_dropped": 0, "reloads": 0}
+
+    def start(self):
+        """Start the worker thread; it loads the window itself so startup never waits on MySQL"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="deadline-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+    def reload(self):
+        """Rebuild the heap from `load_window()`"""
+        # Read the version first: a write landing during the load bumps it past this
+        version = self._version() if self._version else None
+        rows = list(self._load_window())
+        with self._cond:
+            self._heap = []
+            self._due = {}
+            now = self._clock()
+            for pid, due_date in rows:
+                seq = next(self._seq)
+                self._due[pid] = (due_date, seq)
+                self._heap.extend(self._reminders(pid, due_date, seq, now))
+            heapq.heapify(self._heap)
+            self._loaded_version = version
+            self._loaded = True
+            self.stats["reloads"] += 1
+            self._cond.notify()
+
+    def upsert(self, pid, due_date):
+        """A paper was added or its DueDate changed"""
+        with self._cond:
+            current = self._due.get(pid)
+            if current is not None and current[0] == due_date:
+                return
+            seq = next(self._seq)
+            self._due[pid] = (due_date, seq)
+            for reminder in self._reminders(pid, due_date, seq, self._clock()):
+                heapq.heappush(self._heap, reminder)
+            self._compact()
+            # Wake the worker in case this is now the earliest reminder
+            self._cond.notify()
+
+    def remove(self, pid):
+        """A paper was deleted; its heap entries go stale"""
+        with self._cond:
+            self._due.pop(pid, None)
+            self._compact()
+
+    def adopt(self, version):
+        """Record the catalog version this process's own write produced, so the
+        next check doesn't reload for it. Only adopted if it is the loaded
+        version + 1; otherwise someone else wrote too and the reload stands."""
+        with self._cond:
+            if (version is not None and self._loaded_version is not None
+                    and version == self._loaded_version + 1):
+                self._loaded_version = version
+
+    def snapshot(self):
+        with self._cond:
+            self.stats.update(papers=len(self._due), pending=len(self._heap))
+            stats = dict(self.stats)
+            stats["next_fire_at"] = self._heap[0].fire_at if self._heap else None
+            return stats
+
+    def _reminders(self, pid, due_date, seq, now):
+        # Reminders whose time already passed are skipped, not sent late
+        return [Reminder(due_date - offset, pid, due_date, offset, seq)
+                for offset in self.offsets if due_date - offset > now]
+
+    def _live(self, reminder):
+        return self._due.get(reminder.pid) == (reminder.due_date, reminder.seq)
+
+    def _compact(self):
+        # Stale entries are normally dropped as they surface; rebuild if they pile up
+        if len(self._heap) > 2 * len(self.offsets) * len(self._due) + 64:
+            self._heap = [r for r in self._heap if self._live(r)]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now):
+        fired = []
+        while self._heap and self._heap[0].fire_at <= now:
+            reminder = heapq.heappop(self._heap)
+            if not self._live(reminder):
+                self.stats["stale_dropped"] += 1
+                continue
+            fired.append(reminder)
+            if reminder.offset == min(self.offsets):
+                # Last reminder for this paper; stop tracking it
+                del self._due[reminder.pid]
+        return fired
+
+    def _run(self):
+        last_check = None
+        while True:
+            if last_check is None or time.monotonic() - last_check >= self.resync_interval:
+                last_check = time.monotonic()
+                try:
+                    if not self._loaded or (self._version and self._version() != self._loaded_version):
+                        self.reload()
+                except Exception as e:
+                    # Retried after resync_interval
+                    logging.exception('Deadline scheduler: reload failed: %s', e)
+
+            with self._cond:
+                if self._stopping:
+                    return
+                fired = self._pop_due(self._clock())
+                if not fired:
+                    timeout = self.resync_interval
+                    if self._heap:
+                        until_next = (self._heap[0].fire_at - self._clock()).total_seconds()
+                        timeout = max(0, min(timeout, until_next))
+                    self._cond.wait(timeout)
+                    continue
+
+            self.stats["fired"] += len(fired)
+            try:
+                self._on_due(fired)
+            except Exception as e:
+                logging.exception('Deadline scheduler: reminder callback failed: %s', e)
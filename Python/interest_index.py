@@ -0,0 +1,153 @@
+import bisect
+import re
+import threading
+import time
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class InterestIndex:
+    """Token-level inverted index (term -> CIDs) over conference Title/Descrip.
+
+    match() returns exactly what the original recommendation loop did -- a
+    conference matches an interest when the lowercased interest is a
+    substring of the lowercased Title or Descrip -- but only conferences
+    the index says *could* contain the interest get that substring test.
+
+    An interest like "machine learning" can only be a substring of a text
+    if the text has a token ending in "machine" and a token starting with
+    "learning"; a token that sits between two separators inside the
+    interest must appear verbatim, and a single bare word must occur inside
+    some token. Those token lookups pick the candidates.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.version = None
+        self.built_at = None
+
+    def _reset(self):
+        self._rows = {}       # cid -> row as loaded (CID, Title, Descrip, ...)
+        self._text = {}       # cid -> (title lowercased, description lowercased)
+        self._postings = {}   # token -> set of cids
+        self._sorted_vocab = None
+        self._lookup_cache = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._rows)
+
+    def rebuild(self, rows, version=None):
+        """Replace the whole index with `rows` (any iterable of conference dicts)"""
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add(row)
+            self.loaded = True
+            self.version = version
+            self.built_at = time.monotonic()
+
+    def is_stale(self, version, max_age):
+        """True if the index needs a rebuild to be current with catalog `version`"""
+        if not self.loaded:
+            return True
+        if version is not None and version != self.version:
+            return True
+        # Unknown versions, and edits that skip CatalogVersion, are caught by age
+        return time.monotonic() - self.built_at >= max_age
+
+    def invalidate(self):
+        """Force a rebuild on next use"""
+        with self._lock:
+            self.loaded = False
+
+    def _add(self, row):
+        cid = row["CID"]
+        title = (row.get("Title") or "").lower()
+        description = (row.get("Descrip") or "").lower()
+        tokens = set(TOKEN_RE.findall(title)) | set(TOKEN_RE.findall(description))
+        self._rows[cid] = row
+        self._text[cid] = (title, description)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {cid}
+                self._sorted_vocab = None
+            else:
+                postings.add(cid)
+        self._lookup_cache.clear()
+
+    def _cids_for_token(self, token, kind):
+        """CIDs having a token that equals / starts with / ends with / contains `token`"""
+        key = (token, kind)
+        cached = self._lookup_cache.get(key)
+        if cached is not None:
+            return cached
+        if kind == "exact":
+            cids = self._postings.get(token, set())
+        else:
+            cids = set()
+            if kind == "prefix":
+                if self._sorted_vocab is None:
+                    self._sorted_vocab = sorted(self._postings)
+                vocab = self._sorted_vocab
+                i = bisect.bisect_left(vocab, token)
+                while i < len(vocab) and vocab[i].startswith(token):
+                    cids |= self._postings[vocab[i]]
+                    i += 1
+            else:
+                test = str.endswith if kind == "suffix" else str.__contains__
+                for term, postings in self._postings.items():
+                    if test(term, token):
+                        cids |= postings
+        self._lookup_cache[key] = cids
+        return cids
+
+    def candidates(self, interest_lower):
+        """CIDs that might contain `interest_lower`; a superset of the real matches"""
+        lookups = []
+        for m in TOKEN_RE.finditer(interest_lower):
+            bounded_left = m.start() > 0
+            bounded_right = m.end() < len(interest_lower)
+            if bounded_left and bounded_right:
+                kind = "exact"
+            elif bounded_left:
+                kind = "prefix"
+            elif bounded_right:
+                kind = "suffix"
+            else:
+                kind = "substring"
+            lookups.append((m.group(), kind))
+        if not lookups:
+            # Nothing but punctuation/whitespace: every conference is a candidate
+            return set(self._rows)
+        sets = sorted((self._cids_for_token(token, kind) for token, kind in lookups), key=len)
+        return set(sets[0]).intersection(*sets[1:])
+
+    def conferences_matching(self, interest):
+        """CIDs whose Title or Descrip contains `interest` (case-insensitive substring)"""
+        interest_lower = interest.lower()
+        with self._lock:
+            return {
+                cid for cid in self.candidates(interest_lower)
+                if interest_lower in self._text[cid][0] or interest_lower in self._text[cid][1]
+            }
+
+    def match(self, interests):
+        """Conferences matching any of `interests`, in CID order.
+
+        Each result is a copy of the stored row with a 'Matched_Interests'
+        list, in the same order as `interests`.
+        """
+        with self._lock:
+            matched = {}
+            for interest in interests:
+                for cid in self.conferences_matching(interest):
+                    matched.setdefault(cid, []).append(interest)
+            results = []
+            for cid in sorted(matched):
+                conf = dict(self._rows[cid])
+                conf['Matched_Interests'] = matched[cid]
+                results.append(conf)
+            return results
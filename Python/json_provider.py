@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # fall back to Flask's stdlib encoder
+    orjson = None
+
+
+def _default(obj):
+    """Types MySQL hands back that orjson doesn't encode on its own"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, timedelta):  # TIME columns
+        return str(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", errors="replace")
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _std_default(obj):
+    """_default, plus dates in OrjsonProvider's format; the stdlib encoder has none"""
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return _default(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    datetime and date values (what MySQL returns for DATETIME/DATE columns)
+    are encoded natively as ISO-8601 strings. MySQL's datetimes are naive UTC,
+    so they get an explicit +00:00; without it browsers would read them as
+    local time. Responses are built straight from orjson's bytes, skipping the
+    str round trip jsonify normally makes.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class StdJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib provider, encoding dates the way OrjsonProvider does
+    instead of Flask's RFC 822 strings, so the format doesn't depend on
+    whether orjson is installed"""
+
+    default = staticmethod(_std_default)
+
+
+def make_json_provider(app, encoder):
+    """Pick the JSON provider for `app`: 'orjson' (when installed) or 'std'"""
+    if encoder == "orjson" and orjson is not None:
+        return OrjsonProvider(app)
+    return StdJSONProvider(app)
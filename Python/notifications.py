@@ -0,0 +1,326 @@
+import hashlib
+import json
+import logging
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from email.message import EmailMessage
+
+# Notification outbox: the NotificationOutbox table in SQL/shell.sql.
+# Producers (deadline reminders, recommendation digests) insert rows keyed by
+# an idempotency key, so enqueueing the same notification twice is a no-op.
+# OutboxWorker claims due rows, sends one email per user covering all of
+# their claimed rows over pooled SMTP connections, and retries failures with
+# exponential backoff. Delivery is at-least-once: a worker that dies between
+# sending and marking rows sent leaves them to be re-sent after the claim
+# lease runs out, with the same Message-ID so mail systems can drop the copy.
+
+OUTBOX_INSERT = """
+    INSERT IGNORE INTO NotificationOutbox (user_id, kind, idempotency_key, payload)
+    VALUES (%s, %s, %s, %s)
+"""
+
+
+def enqueue_notifications(cursor, notifications):
+    """Queue (user_id, kind, idempotency_key, payload) tuples; keys already queued are
+    skipped. Returns the number of new rows."""
+    rows = [(user_id, kind, key, json.dumps(payload, default=str))
+            for user_id, kind, key, payload in notifications]
+    if not rows:
+        return 0
+    cursor.executemany(OUTBOX_INSERT, rows)
+    return cursor.rowcount
+
+
+def message_id(keys):
+    """Stable Message-ID for one email built from these outbox rows"""
+    digest = hashlib.sha1("|".join(sorted(keys)).encode("utf-8")).hexdigest()
+    return f"<{digest}@confspotter>"
+
+
+def render_digest(mail_from, to_address, username, notifications):
+    """One email covering all of a user's notifications: (kind, key, payload) tuples"""
+    deadlines = [p for kind, _, p in notifications if kind == "deadline"]
+    recommendations = [p for kind, _, p in notifications if kind == "recommendation"]
+
+    lines = [f"Hi {username or 'there'},", ""]
+    if deadlines:
+        lines.append("Upcoming paper deadlines for conferences matching your interests:")
+        for d in sorted(deadlines, key=lambda d: str(d.get("DueDate"))):
+            when = f" ({d['Reminder_Days']} days left)" if d.get("Reminder_Days") is not None else ""
+            lines.append(f"  - {d.get('Title')}: {d.get('TypeOfPaper')} due {d.get('DueDate')}{when}")
+            lines.append(f"    matched: {', '.join(d.get('Matched_Interests') or [])}")
+        lines.append("")
+    if recommendations:
+        lines.append("Conferences you might like:")
+        for r in recommendations:
+            for conf in r.get("conferences", []):
+                lines.append(f"  - {conf.get('Title')} (starts {conf.get('Start_Date')})")
+                lines.append(f"    matched: {', '.join(conf.get('Matched_Interests') or [])}")
+        lines.append("")
+    lines.append("- ConfSpotter")
+
+    parts = []
+    if deadlines:
+        parts.append(f"{len(deadlines)} upcoming deadline{'s' if len(deadlines) != 1 else ''}")
+    if recommendations:
+        parts.append("new conference recommendations")
+
+    msg = EmailMessage()
+    msg["From"] = mail_from
+    msg["To"] = to_address
+    msg["Subject"] = "ConfSpotter: " + " and ".join(parts)
+    msg["Message-ID"] = message_id([key for _, key, _ in notifications])
+    msg.set_content("\n".join(lines))
+    return msg
+
+
+class SMTPPool:
+    """Up to `size` open SMTP connections, reused across messages.
+
+    Opening an SMTP session (TCP + EHLO + optional STARTTLS/AUTH) costs far
+    more than sending one message on it, so connections are kept open and
+    handed out one per sender. A connection that errors is dropped rather
+    than returned.
+    """
+
+    def __init__(self, connect, size=2):
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.stats = {"opened": 0, "dropped": 0, "sent": 0}
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                smtp = self._connect()
+                self.stats["opened"] += 1
+            try:
+                yield smtp
+            except smtplib.SMTPRecipientsRefused:
+                # Bad address, healthy connection
+                self._idle.put(smtp)
+                raise
+            except Exception:
+                self.stats["dropped"] += 1
+                try:
+                    smtp.close()
+                except Exception:
+                    pass
+                raise
+            else:
+                self._idle.put(smtp)
+        finally:
+            self._slots.release()
+
+    def send(self, msg):
+        """Send on a pooled connection, retrying once on a fresh one if the
+        server had closed the idle connection"""
+        try:
+            with self.connection() as smtp:
+                smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            with self.connection() as smtp:
+                smtp.send_message(msg)
+        self.stats["sent"] += 1
+
+    def close(self):
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+def smtp_connector(host, port, username=None, password=None, starttls=False, timeout=30):
+    """connect() callable for SMTPPool"""
+    def connect():
+        smtp = smtplib.SMTP(host, port, timeout=timeout)
+        if starttls:
+            smtp.starttls()
+        if username:
+            smtp.login(username, password)
+        return smtp
+    return connect
+
+
+class OutboxWorker:
+    """Claims due NotificationOutbox rows and emails them, batched per user.
+
+    A claim marks rows 'sending' with a lease (next_attempt_at = now + lease)
+    and counts the attempt, using SELECT ... FOR UPDATE SKIP LOCKED so several
+    workers or threads never pick the same rows. Sent rows become 'sent';
+    failures go back to 'pending' after backoff * 2^(attempts - 1) seconds
+    (capped at max_backoff), and 'failed' after max_attempts. A row whose
+    lease ran out (its worker died mid-send) is claimed again, and marked
+    'failed' once it has used up max_attempts that way.
+
+    `key_prefix` limits the worker to rows whose idempotency key starts with
+    it (the benchmark uses this to leave real notifications alone).
+    """
+
+    def __init__(self, get_connection, smtp_pool, mail_from, batch_size=200, max_attempts=5,
+                 backoff=30, max_backoff=3600, lease=300, poll_interval=5, key_prefix=None):
+        self._get_connection = get_connection
+        self.smtp = smtp_pool
+        self.mail_from = mail_from
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.key_prefix = key_prefix
+        self._wake = threading.Event()
+        self._stopping = False
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self.stats = {"claimed": 0, "emails": 0, "sent": 0, "retried": 0, "failed": 0}
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for name, n in deltas.items():
+                self.stats[name] += n
+
+    def claim(self):
+        """Lease up to batch_size due rows; returns them with the user's email and
+        `attempts` already counting this one"""
+        conn = self._get_connection()
+        try:
+            conn.start_transaction()
+            cursor = conn.cursor(dictionary=True)
+            key_filter, params = "", [self.batch_size]
+            if self.key_prefix:
+                key_filter, params = "AND o.idempotency_key LIKE %s", [self.key_prefix + "%", self.batch_size]
+            cursor.execute(f"""
+                SELECT o.ID, o.user_id, o.kind, o.idempotency_key, o.payload, o.attempts,
+                       u.email, u.username
+                FROM NotificationOutbox o
+                JOIN `user` u ON u.ID = o.user_id
+                WHERE o.status IN ('pending', 'sending') AND o.next_attempt_at <= NOW() {key_filter}
+                ORDER BY o.next_attempt_at, o.ID
+                LIMIT %s
+                FOR UPDATE OF o SKIP LOCKED
+            """, params)
+            rows = cursor.fetchall()
+            # Rows that already used every attempt got here by their lease expiring
+            exhausted = [row["ID"] for row in rows if row["attempts"] >= self.max_attempts]
+            rows = [row for row in rows if row["attempts"] < self.max_attempts]
+            if exhausted:
+                placeholders = ", ".join(["%s"] * len(exhausted))
+                cursor.execute(f"""
+                    UPDATE NotificationOutbox
+                    SET status = 'failed', last_error = 'lease expired on the last attempt'
+                    WHERE ID IN ({placeholders})
+                """, exhausted)
+                self._count(failed=len(exhausted))
+            if rows:
+                placeholders = ", ".join(["%s"] * len(rows))
+                cursor.execute(f"""
+                    UPDATE NotificationOutbox
+                    SET status = 'sending', attempts = attempts + 1,
+                        next_attempt_at = NOW() + INTERVAL %s SECOND
+                    WHERE ID IN ({placeholders})
+                """, [self.lease] + [row["ID"] for row in rows])
+                for row in rows:
+                    row["attempts"] += 1
+            conn.commit()
+            cursor.close()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _finish(self, sent_ids, failures):
+        """Record results: sent row IDs, and (row IDs, attempts, error) per failed email"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            if sent_ids:
+                placeholders = ", ".join(["%s"] * len(sent_ids))
+                cursor.execute(f"""
+                    UPDATE NotificationOutbox
+                    SET status = 'sent', sent_at = NOW(), last_error = NULL
+                    WHERE ID IN ({placeholders})
+                """, sent_ids)
+            for ids, attempts, error in failures:
+                placeholders = ", ".join(["%s"] * len(ids))
+                give_up = attempts >= self.max_attempts
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+                cursor.execute(f"""
+                    UPDATE NotificationOutbox
+                    SET status = %s, attempts = %s, last_error = %s,
+                        next_attempt_at = NOW() + INTERVAL %s SECOND
+                    WHERE ID IN ({placeholders})
+                """, ["failed" if give_up else "pending", attempts, error[:500], delay] + ids)
+                self._count(**{"failed" if give_up else "retried": len(ids)})
+            cursor.close()
+        finally:
+            conn.close()
+
+    def run_once(self):
+        """Claim one batch and send it. Returns the number of rows claimed."""
+        rows = self.claim()
+        if not rows:
+            return 0
+        by_user = {}
+        for row in rows:
+            by_user.setdefault(row["user_id"], []).append(row)
+
+        sent_ids, failures = [], []
+        for user_rows in by_user.values():
+            ids = [row["ID"] for row in user_rows]
+            attempts = max(row["attempts"] for row in user_rows)
+            user = user_rows[0]
+            if not user["email"]:
+                failures.append((ids, self.max_attempts, "user has no email address"))
+                continue
+            notifications = [(row["kind"], row["idempotency_key"], json.loads(row["payload"]))
+                             for row in user_rows]
+            try:
+                self.smtp.send(render_digest(self.mail_from, user["email"], user["username"], notifications))
+                sent_ids += ids
+                self._count(emails=1)
+            except smtplib.SMTPRecipientsRefused as e:
+                failures.append((ids, self.max_attempts, f"recipient refused: {e}"))
+            except (smtplib.SMTPException, OSError) as e:
+                failures.append((ids, attempts, str(e) or type(e).__name__))
+
+        self._finish(sent_ids, failures)
+        self._count(claimed=len(rows), sent=len(sent_ids))
+        return len(rows)
+
+    def wake(self):
+        """New rows were queued; skip the rest of the idle wait"""
+        self._wake.set()
+
+    def start(self, threads=1):
+        for i in range(threads):
+            thread = threading.Thread(target=self._run, name=f"outbox-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                if self.run_once():
+                    continue  # more may be waiting
+            except Exception as e:
+                logging.exception('Outbox worker: batch failed: %s', e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
@@ -0,0 +1,177 @@
+import logging
+import os
+import re
+import sys
+from datetime import date, datetime
+
+# Monthly partition upkeep for the tables in SQL/SecurityFeatures.sql:
+# split upcoming months out of p_future before rows arrive, and past the
+# retention period roll a month up into SecurityEventRollup then drop its
+# partition (a metadata change, however many rows it holds).
+#
+# Run it from one place: cron, or the app.py process started with
+# PARTITION_MAINTENANCE=1. A named lock makes a second concurrent run skip.
+# From the base ConfSpotter folder:
+#   python3 Python/partition_maintenance.py
+
+FUTURE_PARTITION = "p_future"
+# GET_LOCK name held for the whole run
+LOCK_NAME = "confspotter:partition-maintenance"
+
+# table -> rollup INSERT ... SELECT for one of its partitions
+PARTITIONED_TABLES = {
+    "AuditLog": """
+        INSERT INTO SecurityEventRollup (period, source, event, events, distinct_users)
+        SELECT DATE(operation_time), 'AuditLog', COALESCE(operation_type, ''), COUNT(*), COUNT(DISTINCT username)
+        FROM AuditLog PARTITION ({partition})
+        GROUP BY DATE(operation_time), operation_type
+        ON DUPLICATE KEY UPDATE events = VALUES(events), distinct_users = VALUES(distinct_users)
+    """,
+    "LoginAttempts": """
+        INSERT INTO SecurityEventRollup (period, source, event, events, distinct_users)
+        SELECT DATE(attempt_time), 'LoginAttempts', IF(success, 'success', 'failure'), COUNT(*), COUNT(DISTINCT username)
+        FROM LoginAttempts PARTITION ({partition})
+        GROUP BY DATE(attempt_time), success
+        ON DUPLICATE KEY UPDATE events = VALUES(events), distinct_users = VALUES(distinct_users)
+    """,
+}
+
+BOUND_RE = re.compile(r"'?(\d{4})-(\d{2})-(\d{2})")
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def list_partitions(cursor, table):
+    """[{name, upper_bound (date, None for MAXVALUE), rows, data_mb, index_mb}] in
+    bound order, or [] if the table isn't partitioned"""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (table,))
+    partitions = []
+    for name, description, rows, data_length, index_length in cursor.fetchall():
+        if name is None:
+            return []
+        match = BOUND_RE.match(description or "")
+        partitions.append({
+            "name": name,
+            "upper_bound": date(*map(int, match.groups())) if match else None,
+            # TABLE_ROWS is InnoDB's estimate
+            "rows": int(rows or 0),
+            "data_mb": round((data_length or 0) / 1048576, 2),
+            "index_mb": round((index_length or 0) / 1048576, 2),
+        })
+    return partitions
+
+
+def ensure_future_partitions(cursor, table, months_ahead, today):
+    """Split monthly partitions out of p_future up to `months_ahead` months past
+    this one. Returns the names added."""
+    partitions = list_partitions(cursor, table)
+    bounds = [p["upper_bound"] for p in partitions if p["upper_bound"]]
+    if not partitions or partitions[-1]["name"] != FUTURE_PARTITION or not bounds:
+        return []
+    target = add_months(today.replace(day=1), months_ahead + 1)
+    added = []
+    start = max(bounds)
+    while start < target:
+        # add_months() lands on a month start, so a mid-month bound is squared up here
+        end = add_months(start, 1)
+        added.append((f"p{start:%Y%m}", end))
+        start = end
+    if not added:
+        return []
+    definitions = ", ".join(f"PARTITION {name} VALUES LESS THAN ('{end.isoformat()}')" for name, end in added)
+    cursor.execute(f"""
+        ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (
+            {definitions}, PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)
+        )
+    """)
+    return [name for name, _ in added]
+
+
+def drop_expired_partitions(cursor, table, rollup_sql, retention_months, today):
+    """Roll up and drop partitions whose rows are all older than `retention_months`
+    months before the start of this month. Returns the names dropped."""
+    cutoff = add_months(today.replace(day=1), -retention_months)
+    dropped = []
+    for partition in list_partitions(cursor, table):
+        bound = partition["upper_bound"]
+        if bound is None or bound > cutoff:
+            continue
+        cursor.execute(rollup_sql.format(partition=partition["name"]))
+        cursor.execute(f"ALTER TABLE {table} DROP PARTITION {partition['name']}")
+        dropped.append(partition["name"])
+    return dropped
+
+
+def partition_report(cursor, tables=PARTITIONED_TABLES):
+    return {table: list_partitions(cursor, table) for table in tables}
+
+
+def run_partition_maintenance(get_connection, retention_months, months_ahead=2, today=None):
+    """Add upcoming and drop expired partitions for every table in
+    PARTITIONED_TABLES. `retention_months` maps table -> months kept.
+    Returns {table: {added, dropped, partitions}}; tables that fail (or aren't
+    partitioned yet) report an error and the rest still run. If another
+    process is already running it, returns {"skipped": reason} instead."""
+    today = today or datetime.now().date()
+    report = {}
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+        if cursor.fetchone()[0] != 1:
+            cursor.close()
+            logging.info('Partition maintenance: already running in another process, skipped')
+            return {"skipped": "partition maintenance is already running in another process"}
+        try:
+            for table, rollup_sql in PARTITIONED_TABLES.items():
+                try:
+                    if not list_partitions(cursor, table):
+                        report[table] = {"error": "table is not partitioned; see SQL/SecurityFeatures.sql"}
+                        continue
+                    added = ensure_future_partitions(cursor, table, months_ahead, today)
+                    dropped = drop_expired_partitions(cursor, table, rollup_sql, retention_months[table], today)
+                    report[table] = {"added": added, "dropped": dropped,
+                                     "partitions": list_partitions(cursor, table)}
+                    if added or dropped:
+                        logging.info('Partition maintenance on %s: added %s, dropped %s', table, added, dropped)
+                except Exception as e:
+                    logging.exception('Partition maintenance on %s failed: %s', table, e)
+                    report[table] = {"error": str(e)}
+        finally:
+            # A pooled connection outlives this call, so the lock must be released explicitly
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return report
+
+
+def retention_from_env():
+    """(retention months per table, months ahead) from the same settings app.py reads"""
+    retention = {
+        "AuditLog": int(os.getenv("AUDIT_RETENTION_MONTHS", "12")),
+        "LoginAttempts": int(os.getenv("LOGIN_ATTEMPTS_RETENTION_MONTHS", "3")),
+    }
+    return retention, int(os.getenv("PARTITION_MONTHS_AHEAD", "2"))
+
+
+if __name__ == "__main__":
+    import json
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from connection import get_connection
+
+    logging.basicConfig(level=logging.INFO)
+    retention, months_ahead = retention_from_env()
+    result = run_partition_maintenance(get_connection, retention, months_ahead)
+    print(json.dumps(result, indent=2, default=str))
+    sys.exit(1 if any("error" in r for r in result.values() if isinstance(r, dict)) else 0)
@@ -0,0 +1,100 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+# bcrypt releases the GIL while it works, so a thread pool runs hashes in
+# parallel; capping the pool below the core count leaves CPU for the
+# requests that don't hash anything.
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+
+class PasswordHasherBusy(Exception):
+    """Too much bcrypt work queued; the caller should answer 503 with Retry-After"""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing is busy, try again shortly")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """bcrypt hash/verify on a bounded thread pool.
+
+    At most `max_pending` jobs (running + queued) are accepted; past that, or
+    when a job has waited `max_wait` seconds, PasswordHasherBusy is raised so
+    a login storm is shed instead of queueing without limit. `rounds` is the
+    bcrypt cost for new hashes; existing hashes verify at the cost they were
+    made with.
+    """
+
+    def __init__(self, rounds=12, workers=DEFAULT_WORKERS, max_pending=None, max_wait=5.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending or workers * 8
+        self.max_wait = max_wait
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._avg_seconds = None  # moving average of one bcrypt call
+        self.stats = {"completed": 0, "rejected": 0, "timed_out": 0, "peak_pending": 0}
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password, password_hash):
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def retry_after(self):
+        """Seconds until the current backlog should have drained"""
+        with self._lock:
+            per_job = self._avg_seconds or 0.25
+            return max(1, math.ceil(per_job * self._pending / self.workers))
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats, pending=self._pending, workers=self.workers,
+                         max_pending=self.max_pending, rounds=self.rounds)
+            stats["avg_ms"] = round(self._avg_seconds * 1000, 1) if self._avg_seconds else None
+            return stats
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._avg_seconds = elapsed if self._avg_seconds is None else 0.8 * self._avg_seconds + 0.2 * elapsed
+            self.stats["completed"] += 1
+        return result
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats["rejected"] += 1
+            raise PasswordHasherBusy(self.retry_after())
+        with self._lock:
+            self._pending += 1
+            self.stats["peak_pending"] = max(self.stats["peak_pending"], self._pending)
+        try:
+            future = self._executor.submit(self._timed, fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.max_wait)
+        except FutureTimeout:
+            # Drop it if it hasn't started; a running hash just finishes unobserved
+            future.cancel()
+            with self._lock:
+                self.stats["timed_out"] += 1
+            raise PasswordHasherBusy(self.retry_after())
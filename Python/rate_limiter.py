@@ -0,0 +1,141 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Failed-login rate limiting: a username with `limit` failures in the last
+# `window` seconds is locked out until the oldest of them ages out. Successful
+# logins don't reset the count (same as the old LoginAttempts COUNT(*) check).
+
+
+class SlidingWindowLimiter:
+    """Failure timestamps per key, held in process memory.
+
+    Each worker process keeps its own counts, so behind N workers a key gets
+    up to limit * N failures per window (requests land on different workers);
+    use RedisSlidingWindowLimiter to share them between workers.
+    """
+
+    def __init__(self, limit=5, window=900, max_keys=100000, clock=time.time):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._clock = clock
+        # key -> deque of failure times, oldest first; keys ordered by latest failure
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune(self, times, now):
+        cutoff = now - self.window
+        while times and times[0] <= cutoff:
+            times.popleft()
+
+    def _sweep(self, now):
+        # Keys whose failures have all aged out sit at the front; drop them so
+        # memory tracks recent attackers only
+        cutoff = now - self.window
+        while self._failures:
+            key, times = next(iter(self._failures.items()))
+            if times and times[-1] > cutoff:
+                break
+            del self._failures[key]
+        # Past max_keys, forget the keys whose last failure is oldest
+        while len(self._failures) > self.max_keys:
+            self._failures.popitem(last=False)
+
+    def is_limited(self, key):
+        now = self._clock()
+        with self._lock:
+            times = self._failures.get(key)
+            if not times:
+                return False
+            self._prune(times, now)
+            return len(times) >= self.limit
+
+    def record_failure(self, key, at=None):
+        now = self._clock()
+        with self._lock:
+            times = self._failures.setdefault(key, deque(maxlen=self.limit))
+            times.append(now if at is None else at)
+            self._failures.move_to_end(key)
+            self._prune(times, now)
+            self._sweep(now)
+
+    def seed(self, failures):
+        """Load (key, unix time) failures, e.g. from LoginAttempts at startup, oldest first"""
+        for key, at in failures:
+            self.record_failure(key, at)
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "memory", "keys": len(self._failures), "limit": self.limit, "window": self.window}
+
+
+class RedisSlidingWindowLimiter:
+    """The same limiter on a shared Redis, one sorted set of failure times per key.
+
+    Redis errors fail open (nobody is locked out), as the old database check did.
+    """
+
+    def __init__(self, client, limit=5, window=900, prefix="confspotter:login-failures:", clock=time.time):
+        self.client = client
+        self.limit = limit
+        self.window = window
+        self.prefix = prefix
+        self._clock = clock
+        # Members must be unique even for failures in the same microsecond
+        self._member = f"{os.getpid()}:{id(self)}:"
+        self._counter = itertools.count()
+
+    def is_limited(self, key):
+        now = self._clock()
+        try:
+            pipe = self.client.pipeline()
+            pipe.zremrangebyscore(self.prefix + key, "-inf", now - self.window)
+            pipe.zcard(self.prefix + key)
+            return pipe.execute()[1] >= self.limit
+        except Exception as e:
+            print(f"Rate limit check error: {str(e)}")
+            return False
+
+    def record_failure(self, key, at=None):
+        at = self._clock() if at is None else at
+        try:
+            pipe = self.client.pipeline()
+            pipe.zadd(self.prefix + key, {f"{self._member}{next(self._counter)}": at})
+            pipe.zremrangebyscore(self.prefix + key, "-inf", self._clock() - self.window)
+            pipe.expire(self.prefix + key, int(self.window) + 1)
+            pipe.execute()
+        except Exception as e:
+            print(f"Rate limit record error: {str(e)}")
+
+    def seed(self, failures):
+        """Load failures only if no worker has since Redis last started empty;
+        otherwise every worker's restart would count them again. The marker
+        never expires: it has to outlive every failure it stands for, and it
+        goes away with them when Redis is flushed or restarted without data."""
+        try:
+            if not self.client.set(self.prefix + "seeded", 1, nx=True):
+                return
+        except Exception as e:
+            print(f"Rate limit seed error: {str(e)}")
+            return
+        for key, at in failures:
+            self.record_failure(key, at)
+
+    def stats(self):
+        return {"backend": "redis", "limit": self.limit, "window": self.window}
+
+
+def make_rate_limiter(redis_url=None, limit=5, window=900):
+    """Redis-backed limiter when `redis_url` is set and the redis package is
+    installed, the in-process one otherwise"""
+    if redis_url:
+        try:
+            import redis
+            return RedisSlidingWindowLimiter(redis.Redis.from_url(redis_url), limit, window)
+        except ImportError:
+            print("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; "
+                  "using the in-process rate limiter")
+    return SlidingWindowLimiter(limit, window)
@@ -0,0 +1,178 @@
+import json
+from datetime import datetime, timedelta
+
+try:
+    from aho_corasick import AhoCorasick
+except ImportError:  # imported from app.py as Python.recommendation_store
+    from Python.aho_corasick import AhoCorasick
+
+# Materialized recommendations: the UserRecommendations, UserRecommendationStatus
+# and UserRecommendationWatermark tables in SQL/shell.sql. Rows hold the
+# substring-mode matches (interest contained in Title or Descrip). All
+# functions take a cursor so they run inside the caller's transaction.
+#
+# Changed conferences are found by Conferences.updated_at, not by CID, so
+# updates and rows committed out of order are picked up too. updated_at is
+# stamped when a statement runs, not when its transaction commits, so the
+# watermark stays COMMIT_LAG behind NOW() and rows stamped within that window
+# are matched again on the next sync. Re-matching a conference is idempotent.
+
+# Conference columns returned with each recommendation, like the live modes
+RECOMMENDATION_COLUMNS = "c.CID, c.Title, c.Descrip, c.Start_Date, c.End_Date"
+COMMIT_LAG = timedelta(seconds=60)
+EPOCH = datetime(1970, 1, 1)
+
+
+def read_user_recommendations(cursor, user_id):
+    """Stored recommendations for `user_id` in CID order, or None if the user
+    has not been materialized yet. Needs a dictionary cursor."""
+    cursor.execute(f"""
+        SELECT s.user_id, {RECOMMENDATION_COLUMNS}, r.matched_interests
+        FROM UserRecommendationStatus s
+        LEFT JOIN UserRecommendations r ON r.user_id = s.user_id
+        LEFT JOIN Conferences c ON c.CID = r.CID
+        WHERE s.user_id = %s
+        ORDER BY c.CID
+    """, (user_id,))
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    recommendations = []
+    for row in rows:
+        if row["CID"] is None:  # materialized with no matches
+            continue
+        matched = row.pop("matched_interests")
+        row.pop("user_id")
+        row["Matched_Interests"] = json.loads(matched) if isinstance(matched, (str, bytes, bytearray)) else matched
+        recommendations.append(row)
+    return recommendations
+
+
+def store_user_recommendations(cursor, user_id, recommendations):
+    """Replace the stored recommendations of `user_id` with `recommendations`
+    (conference dicts carrying CID and Matched_Interests)"""
+    cursor.execute("DELETE FROM UserRecommendations WHERE user_id = %s", (user_id,))
+    if recommendations:
+        cursor.executemany(
+            "INSERT INTO UserRecommendations (user_id, CID, matched_interests) VALUES (%s, %s, %s)",
+            [(user_id, conf["CID"], json.dumps(conf["Matched_Interests"])) for conf in recommendations]
+        )
+    cursor.execute("""
+        INSERT INTO UserRecommendationStatus (user_id) VALUES (%s)
+        ON DUPLICATE KEY UPDATE refreshed_at = CURRENT_TIMESTAMP
+    """, (user_id,))
+
+
+def _materialized_users(cursor):
+    """(user_id, [interests]) for every user with stored recommendations"""
+    cursor.execute("""
+        SELECT u.ID, u.Interest_1, u.Interest_2, u.Interest_3
+        FROM UserRecommendationStatus s
+        JOIN `user` u ON u.ID = s.user_id
+    """)
+    users = []
+    for user_id, *interests in cursor.fetchall():
+        interests = [i.strip() for i in interests if i and i.strip()]
+        if interests:
+            users.append((user_id, interests))
+    return users
+
+
+def _match_conferences(cursor, conferences):
+    """Rows to insert for `conferences` ((CID, Title, Descrip) tuples), matched
+    against all materialized users' interests in one Aho-Corasick pass each"""
+    users = _materialized_users(cursor)
+    patterns = {}
+    for _, interests in users:
+        for interest in interests:
+            patterns.setdefault(interest.lower(), len(patterns))
+    if not patterns:
+        return []
+    automaton = AhoCorasick(patterns)
+
+    rows = []
+    for cid, title, description in conferences:
+        # NUL keeps a match from spanning the end of the title into the description
+        found = automaton.find((title or "").lower() + "\0" + (description or "").lower())
+        if not found:
+            continue
+        for user_id, interests in users:
+            matched = [i for i in interests if patterns[i.lower()] in found]
+            if matched:
+                rows.append((user_id, cid, json.dumps(matched)))
+    return rows
+
+
+def _rematch(cursor, conferences):
+    """Replace the stored rows of `conferences` ((CID, Title, Descrip) tuples)
+    with fresh matches against every materialized user. Returns rows added."""
+    for start in range(0, len(conferences), 500):
+        cids = [conf[0] for conf in conferences[start:start + 500]]
+        cursor.execute(
+            f"DELETE FROM UserRecommendations WHERE CID IN ({', '.join(['%s'] * len(cids))})", cids
+        )
+    rows = _match_conferences(cursor, conferences)
+    if rows:
+        cursor.executemany(
+            "INSERT INTO UserRecommendations (user_id, CID, matched_interests) VALUES (%s, %s, %s)",
+            rows
+        )
+    return len(rows)
+
+
+def sync_changed_conferences(cursor):
+    """Re-match conferences inserted or updated since the last call against every
+    materialized user and advance the watermark. Returns the number of rows added.
+
+    The watermark row is locked for the duration, so concurrent callers (other
+    workers, the CSV import, materialize_user) take turns; run it inside a
+    transaction.
+    """
+    cursor.execute("SELECT last_modified, NOW(6) FROM UserRecommendationWatermark WHERE id = 1 FOR UPDATE")
+    rows = cursor.fetchall()
+    if rows:
+        last_modified, now = rows[0]
+    else:
+        cursor.execute("SELECT NOW(6)")
+        last_modified, (now,) = EPOCH, cursor.fetchone()
+    cursor.execute(
+        "SELECT CID, Title, Descrip FROM Conferences WHERE updated_at > %s ORDER BY CID",
+        (last_modified,)
+    )
+    conferences = cursor.fetchall()
+    added = _rematch(cursor, conferences) if conferences else 0
+    cursor.execute("""
+        INSERT INTO UserRecommendationWatermark (id, last_modified) VALUES (1, %s)
+        ON DUPLICATE KEY UPDATE last_modified = GREATEST(last_modified, VALUES(last_modified))
+    """, (max(last_modified, now - COMMIT_LAG),))
+    return added
+
+
+def materialize_user(cursor, user_id, interests, only_if_stored=False):
+    """Compute and store the recommendations of `user_id` from Conferences as
+    MySQL has them now, and return them in CID order.
+
+    Holds a shared lock on the watermark row, so a running sync finishes
+    first and the next one sees this user: anything changed after this read
+    is matched by that sync. With only_if_stored, users that were never
+    materialized are left alone (returns None).
+    """
+    cursor.execute("SELECT last_modified FROM UserRecommendationWatermark WHERE id = 1 FOR SHARE")
+    cursor.fetchall()
+    if only_if_stored:
+        cursor.execute("SELECT 1 FROM UserRecommendationStatus WHERE user_id = %s FOR UPDATE", (user_id,))
+        if not cursor.fetchall():
+            return None
+    lowered = [(interest, interest.lower()) for interest in interests]
+    cursor.execute("SELECT CID, Title, Descrip, Start_Date, End_Date FROM Conferences ORDER BY CID")
+    recommendations = []
+    for cid, title, description, start_date, end_date in cursor.fetchall():
+        title_lower, description_lower = (title or "").lower(), (description or "").lower()
+        matched = [interest for interest, lower in lowered
+                   if lower in title_lower or lower in description_lower]
+        if matched:
+            recommendations.append({"CID": cid, "Title": title, "Descrip": description,
+                                    "Start_Date": start_date, "End_Date": end_date,
+                                    "Matched_Interests": matched})
+    store_user_recommendations(cursor, user_id, recommendations)
+    return recommendations
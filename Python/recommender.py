@@ -0,0 +1,189 @@
+import math
+import re
+import time
+from collections import Counter
+
+import numpy as np
+
+# Same tokenization as the interest index
+TOKEN_RE = re.compile(r"\w+")
+# A word in the title counts this many times as much as one in the description
+TITLE_WEIGHT = 2
+
+
+def _term_counts(title, description):
+    counts = Counter()
+    for token in TOKEN_RE.findall((title or "").lower()):
+        counts[token] += TITLE_WEIGHT
+    counts.update(TOKEN_RE.findall((description or "").lower()))
+    return counts
+
+
+class TfidfRecommender:
+    """Ranks conferences against a user's interests by TF-IDF cosine score.
+
+    Each conference is an L2-normalised TF-IDF vector over the words of its
+    Title and Descrip, stored column-wise: for every term, the positions of
+    the conferences containing it and the term's weight in each. Scoring an
+    request touches only the postings of the interests' terms (np.bincount
+    adds them into one score per conference) and np.argpartition picks the
+    top k without sorting the whole catalog.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.version = None
+        self.built_at = None
+        # (rows, vocab, idf, indptr, docs, weights), swapped in whole by rebuild()
+        self._model = ([], {}, np.zeros(0), np.zeros(1, dtype=np.int64),
+                       np.zeros(0, dtype=np.int32), np.zeros(0))
+
+    def __len__(self):
+        return len(self._model[0])
+
+    def is_stale(self, version, max_age):
+        """True if the model needs a rebuild to be current with catalog `version`"""
+        if not self.loaded:
+            return True
+        if version is not None and version != self.version:
+            return True
+        return time.monotonic() - self.built_at >= max_age
+
+    def invalidate(self):
+        self.loaded = False
+
+    def rebuild(self, rows, version=None):
+        """Fit the model to `rows` (conference dicts with CID, Title, Descrip)"""
+        rows = list(rows)
+        vocab = {}
+        doc_ids, term_ids, tfs = [], [], []
+        for position, row in enumerate(rows):
+            for term, tf in _term_counts(row.get("Title"), row.get("Descrip")).items():
+                doc_ids.append(position)
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                tfs.append(tf)
+
+        n_docs, n_terms = len(rows), len(vocab)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        tfs = np.asarray(tfs, dtype=np.float64)
+
+        df = np.bincount(term_ids, minlength=n_terms)
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        weights = (1 + np.log(tfs)) * idf[term_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=n_docs))
+        weights /= np.where(norms > 0, norms, 1)[doc_ids]
+
+        # Group by term (CSC layout): postings of term t are [indptr[t], indptr[t+1])
+        order = np.argsort(term_ids, kind="stable")
+        indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=indptr[1:])
+
+        self._model = (rows, vocab, idf, indptr, doc_ids[order], weights[order])
+        self.loaded = True
+        self.version = version
+        self.built_at = time.monotonic()
+
+    @staticmethod
+    def _interest_postings(model, interest):
+        """(postings, weights) per known term of one interest, weights scaled by the
+        interest's normalised query weight so the sum over them is a cosine score"""
+        rows, vocab, idf, indptr, docs, weights = model
+        query = []
+        for term, tf in Counter(TOKEN_RE.findall(interest.lower())).items():
+            t = vocab.get(term)
+            if t is not None:
+                query.append((t, (1 + math.log(tf)) * idf[t]))
+        norm = math.sqrt(sum(w * w for _, w in query))
+        return [(docs[indptr[t]:indptr[t + 1]], weights[indptr[t]:indptr[t + 1]] * (w / norm))
+                for t, w in query]
+
+    def recommend(self, interests, limit=20):
+        """Top `limit` conferences for `interests`, best first.
+
+        Each result is a copy of the conference row plus 'Score' (sum of the
+        per-interest cosine scores) and 'Matched_Interests' (the interests
+        sharing at least one word with the conference).
+        """
+        model = self._model  # one consistent snapshot even if a rebuild swaps it
+        rows = model[0]
+        per_interest = [(interest, self._interest_postings(model, interest)) for interest in interests]
+        per_interest = [(interest, postings) for interest, postings in per_interest if postings]
+        if not per_interest or limit <= 0:
+            return []
+
+        all_postings = [p for _, postings in per_interest for p in postings]
+        scores = np.bincount(np.concatenate([docs for docs, _ in all_postings]),
+                             weights=np.concatenate([w for _, w in all_postings]),
+                             minlength=len(rows))
+
+        k = min(limit, len(scores))
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        # Conferences sharing no word with any interest score 0 and never rank
+        top = top[scores[top] > 0]
+        # Best first; ties (up to float noise) in catalog (CID) order
+        top = top[np.lexsort((top, -np.round(scores[top], 9)))]
+
+        # Postings are sorted by position, so membership of the top k is a binary search
+        matched = [[] for _ in top]
+        for interest, postings in per_interest:
+            hit = np.zeros(len(top), dtype=bool)
+            for docs, _ in postings:
+                found = np.searchsorted(docs, top)
+                hit |= docs[np.minimum(found, len(docs) - 1)] == top
+            for i in np.flatnonzero(hit):
+                matched[i].append(interest)
+
+        results = []
+        for position, matched_interests in zip(top, matched):
+            conf = dict(rows[position])
+            conf['Score'] = round(float(scores[position]), 6)
+            conf['Matched_Interests'] = matched_interests
+            results.append(conf)
+        return results
+
+
+def fulltext_recommendation_query(interests, limit, min_token_size=3):
+    """SQL + params ranking upcoming conferences against `interests` inside MySQL.
+
+    One boolean-mode MATCH ... AGAINST over the fullText_conference_title_desc
+    index: a multi-word interest becomes a quoted phrase and a single word
+    also matches as a prefix ("network" finds "networks"). Interests with no
+    word of at least `min_token_size` characters aren't in the index at all,
+    so they fall back to LIKE (which does scan). Each row gets a Score and one
+    flag per interest, from which the caller builds Matched_Interests.
+    """
+    terms, flags, where, flag_params, where_params = [], [], [], [], []
+    for interest in interests:
+        words = TOKEN_RE.findall(interest.lower())
+        if any(len(word) >= min_token_size for word in words):
+            term = f'"{" ".join(words)}"' if len(words) > 1 else f"{words[0]}*"
+            terms.append(term)
+            flags.append("MATCH(Title, Descrip) AGAINST(%s IN BOOLEAN MODE) > 0")
+            flag_params.append(term)
+        else:
+            pattern = "%" + interest.replace("%", r"\%").replace("_", r"\_") + "%"
+            flags.append("(Title LIKE %s OR Descrip LIKE %s)")
+            flag_params += [pattern, pattern]
+            where.append("Title LIKE %s OR Descrip LIKE %s")
+            where_params += [pattern, pattern]
+
+    against = " ".join(terms)
+    if terms:
+        score, score_params = "MATCH(Title, Descrip) AGAINST(%s IN BOOLEAN MODE)", [against]
+        where.insert(0, score)
+        where_params.insert(0, against)
+    else:
+        score, score_params = "0", []
+    flag_columns = "".join(f",\n            {flag} AS matched_{i}" for i, flag in enumerate(flags))
+
+    sql = f"""
+        SELECT CID, Title, Descrip, Start_Date, End_Date,
+            {score} AS Score{flag_columns}
+        FROM Conferences
+        WHERE ({' OR '.join(where)})
+            AND Start_Date >= NOW()
+        ORDER BY Score DESC, CID
+        LIMIT %s
+    """
+    return sql, score_params + flag_params + where_params + [limit]
@@ -0,0 +1,86 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+# Stateless session tokens: v1.<kid>.<claims>.<signature>, where claims is
+# base64url JSON {"sub": user id, "iat", "exp"} and the
+# signature is HMAC-SHA256 over "v1.<kid>.<claims>" with the key named kid.
+# Checking one costs an HMAC and a JSON parse; no database lookup.
+
+VERSION = "v1"
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def parse_signing_keys(spec):
+    """"kid:secret,kid:secret" -> [(kid, key bytes)], newest first. The first
+    key signs new tokens; the rest still verify, so a rotated-out key keeps
+    working until the tokens it signed have expired."""
+    keys = []
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        kid, sep, secret = part.strip().partition(":")
+        if not sep or not kid or not secret or "." in kid:
+            raise ValueError("signing keys must look like 'kid:secret' (kid without dots)")
+        keys.append((kid, secret.encode("utf-8")))
+    return keys
+
+
+class TokenSigner:
+    def __init__(self, keys, ttl=3600, clock=time.time):
+        if not keys:
+            # A per-process random key would make every other worker (and the
+            # next restart) reject the tokens this one signs
+            raise ValueError("TokenSigner needs at least one signing key")
+        self.current_kid = keys[0][0]
+        self._keys = dict(keys)
+        self.ttl = ttl
+        self._clock = clock
+
+    def _sign(self, kid, message):
+        return hmac.new(self._keys[kid], message, hashlib.sha256).digest()
+
+    def issue(self, user_id):
+        """(token, expires_at unix time) for `user_id`"""
+        now = int(self._clock())
+        claims = {"sub": user_id, "iat": now, "exp": now + self.ttl}
+        body = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        message = f"{VERSION}.{self.current_kid}.{body}".encode("ascii")
+        return f"{message.decode('ascii')}.{_b64encode(self._sign(self.current_kid, message))}", claims["exp"]
+
+    def verify(self, token):
+        """Claims of a valid, unexpired token; raises InvalidToken otherwise"""
+        if not isinstance(token, str) or not token.isascii():
+            raise InvalidToken("malformed token")
+        try:
+            version, kid, body, signature = token.split(".")
+        except ValueError:
+            raise InvalidToken("malformed token")
+        if version != VERSION:
+            raise InvalidToken("unsupported token version")
+        if kid not in self._keys:
+            raise InvalidToken("unknown signing key")
+        expected = self._sign(kid, f"{version}.{kid}.{body}".encode("ascii"))
+        try:
+            valid = hmac.compare_digest(expected, _b64decode(signature))
+        except ValueError:
+            valid = False
+        if not valid:
+            raise InvalidToken("bad signature")
+        claims = json.loads(_b64decode(body))
+        if claims.get("exp", 0) <= self._clock():
+            raise InvalidToken("token expired")
+        return claims
@@ -4,23 +4,74 @@
 
 USE confspotter;
 
+-- Both tables are range-partitioned by month on their time column so old
+-- months are removed with DROP PARTITION instead of DELETE. MySQL requires the
+-- partitioning column in every unique key, hence the two-column primary keys.
+-- p_future catches everything past the last month; Python/partition_maintenance.py
+-- (run daily from cron, or by app.py with PARTITION_MAINTENANCE=1) splits new months out of it ahead of time, rolls
+-- expired months up into SecurityEventRollup and drops them.
+
 -- Audit Log Table
 CREATE TABLE IF NOT EXISTS AuditLog(
-    log_id INT AUTO_INCREMENT PRIMARY KEY,
+    log_id BIGINT AUTO_INCREMENT,
     user_id INT NULL,
     username VARCHAR(255) NULL,
     operation_type VARCHAR(50),
-    operation_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+    operation_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     old_values JSON NULL,
-    new_values JSON NULL
+    new_values JSON NULL,
+    PRIMARY KEY (log_id, operation_time),
+    KEY idx_audit_user_time (user_id, operation_time)
+)
+PARTITION BY RANGE COLUMNS (operation_time) (
+    PARTITION p_start VALUES LESS THAN ('2026-11-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
 -- Login Attempts Table for Rate Limiting
 CREATE TABLE IF NOT EXISTS LoginAttempts(
-    attempt_id INT AUTO_INCREMENT PRIMARY KEY,
+    attempt_id BIGINT AUTO_INCREMENT,
     username VARCHAR(255) NOT NULL,
-    attempt_time DATETIME DEFAULT CURRENT_TIMESTAMP,
-    success BOOLEAN DEFAULT FALSE
+    attempt_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    success BOOLEAN DEFAULT FALSE,
+    PRIMARY KEY (attempt_id, attempt_time),
+    -- AKA: "How many times did this username fail recently?"
+    KEY idx_login_attempts_user_success_time (username, success, attempt_time),
+    -- AKA: "Every recent failure" (app.py's rate limiter loads these at startup)
+    KEY idx_login_attempts_success_time (success, attempt_time)
+)
+PARTITION BY RANGE COLUMNS (attempt_time) (
+    PARTITION p_start VALUES LESS THAN ('2026-11-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
 );
 
+-- Daily counts kept after a month's partition is dropped
+CREATE TABLE IF NOT EXISTS SecurityEventRollup(
+    period DATE NOT NULL,
+    source VARCHAR(20) NOT NULL,          -- 'AuditLog' or 'LoginAttempts'
+    event VARCHAR(50) NOT NULL,           -- operation_type, or 'success' / 'failure'
+    events INT NOT NULL,
+    distinct_users INT NOT NULL,
+    PRIMARY KEY (period, source, event)
+);
 
+-- Existing databases: convert the tables in place (each rewrites its table once)
+-- ALTER TABLE AuditLog
+--     MODIFY log_id BIGINT NOT NULL AUTO_INCREMENT,
+--     MODIFY operation_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+--     DROP PRIMARY KEY, ADD PRIMARY KEY (log_id, operation_time),
+--     ADD KEY idx_audit_user_time (user_id, operation_time)
+--     PARTITION BY RANGE COLUMNS (operation_time) (
+--         PARTITION p_start VALUES LESS THAN ('2026-11-01'),
+--         PARTITION p_future VALUES LESS THAN (MAXVALUE));
+-- ALTER TABLE LoginAttempts
+--     MODIFY attempt_id BIGINT NOT NULL AUTO_INCREMENT,
+--     MODIFY attempt_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+--     DROP PRIMARY KEY, ADD PRIMARY KEY (attempt_id, attempt_time),
+--     ADD KEY idx_login_attempts_user_success_time (username, success, attempt_time),
+--     ADD KEY idx_login_attempts_success_time (success, attempt_time)
+--     PARTITION BY RANGE COLUMNS (attempt_time) (
+--         PARTITION p_start VALUES LESS THAN ('2026-11-01'),
+--         PARTITION p_future VALUES LESS THAN (MAXVALUE));
+-- Already partitioned: just add the index for the rate limiter's startup load
+-- ALTER TABLE LoginAttempts ADD KEY idx_login_attempts_success_time (success, attempt_time);
@@ -55,7 +55,8 @@ DELIMITER ;
 -- Trigger to automatically delete conferences after their end date has passed
 -- Runs daily via an event scheduler
 DELIMITER //
-CREATE EVENT IF NOT EXISTS DeleteExpiredConferences
+DROP EVENT IF EXISTS DeleteExpiredConferences //
+CREATE EVENT DeleteExpiredConferences
 ON SCHEDULE EVERY 1 DAY
 STARTS CURRENT_TIMESTAMP
 DO
@@ -63,6 +64,10 @@ BEGIN
     -- Delete conferences where end date is in the past
     DELETE FROM Conferences
     WHERE End_Date < NOW();
+    -- Let the API caches know the catalog changed
+    IF ROW_COUNT() > 0 THEN
+        UPDATE CatalogVersion SET version = version + 1 WHERE scope = 'conferences';
+    END IF;
 END //
 DELIMITER ;
 
@@ -74,7 +79,11 @@ BEGIN
     DECLARE deleted_count INT DEFAULT 0;
     DELETE FROM Conferences
     WHERE End_Date < NOW();
-    SELECT ROW_COUNT() AS conferences_deleted;
+    SET deleted_count = ROW_COUNT();
+    IF deleted_count > 0 THEN
+        UPDATE CatalogVersion SET version = version + 1 WHERE scope = 'conferences';
+    END IF;
+    SELECT deleted_count AS conferences_deleted;
 END //
 DELIMITER ;
 DELIMITER ;
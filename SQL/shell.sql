@@ -22,7 +22,11 @@ CREATE TABLE Conferences(
     Descrip TEXT,
     LID INT NULL,
     link VARCHAR(255) NULL,
+    -- Set on every insert/update; materialized recommendations re-match rows changed since their watermark
+    updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
     PRIMARY KEY (CID),
+    -- AKA: "Which conferences changed since the last sync?"
+    KEY idx_conferences_updated_at (updated_at),
     -- AKA: "Does this conference already exist?"
     UNIQUE KEY uq_conference_title (Title),
     -- AKA: "What is the location of this conference?"
@@ -62,12 +66,119 @@ CREATE TABLE `user` (
     Interest_2 VARCHAR(255),
     Interest_3 VARCHAR(255),
     PRIMARY KEY (ID),
+    -- AKA: "Is this username/email/phone already taken?" Signup is a single
+    -- INSERT; the API answers duplicate-key errors with 409. NULLs don't clash.
+    UNIQUE KEY uq_user_username (username),
+    UNIQUE KEY uq_user_email (email),
+    UNIQUE KEY uq_user_phone (Phone),
     -- AKA: "Are phone numbers valid?"
     CONSTRAINT chk_phone CHECK (Phone NOT REGEXP '[^0-9]'),
     -- AKA: "Is this a valid email address?"
     CONSTRAINT email_check CHECK (email IS NULL OR INSTR(email,'@')>0)
 ) ENGINE=InnoDB;
 
+-- Existing databases (fails while duplicates remain; find them first with
+-- SELECT username, COUNT(*) FROM user GROUP BY username HAVING COUNT(*) > 1, and likewise for email, Phone):
+-- ALTER TABLE user
+--     ADD UNIQUE KEY uq_user_username (username),
+--     ADD UNIQUE KEY uq_user_email (email),
+--     ADD UNIQUE KEY uq_user_phone (Phone);
+
+-- AKA: "Has the catalog changed since I last looked?"
+-- One counter per scope, bumped by the API write routes, the CSV import and
+-- the expired-conference cleanup. The API caches key off these versions.
+CREATE TABLE CatalogVersion (
+    scope VARCHAR(50) NOT NULL,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope)
+) ENGINE=InnoDB;
+
+INSERT INTO CatalogVersion (scope, version) VALUES
+    ('conferences', 0),
+    ('papers', 0),
+    ('users', 0),
+    ('favorites', 0);
+
+-- AKA: "Whose favorites changed since this feed was cached?"
+-- One row per star/unstar (app.py favorites_changed()), so a worker drops
+-- only that user's cached calendar feed. app.py prunes rows older than
+-- FAVORITE_CHANGES_KEEP (a day by default).
+CREATE TABLE FavoriteChanges (
+    ID BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    user_ID INT NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_favorite_changes_user (user_ID),
+    KEY idx_favorite_changes_changed_at (changed_at)
+) ENGINE=InnoDB;
+
+-- AKA: "Which conferences match this user's interests?"
+-- Materialized recommendations (Python/recommendation_store.py). A user's
+-- rows are rewritten when their interests change; deleting a conference or
+-- user (including the DeleteExpiredConferences event) cascades here, and
+-- new conferences are matched against stored users past the watermark.
+CREATE TABLE UserRecommendations (
+    user_id INT NOT NULL,
+    CID INT NOT NULL,
+    matched_interests JSON NOT NULL,
+    PRIMARY KEY (user_id, CID),
+    KEY idx_user_recommendations_cid (CID),
+    CONSTRAINT fk_recommendation_user
+        FOREIGN KEY (user_id) REFERENCES `user`(ID)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_recommendation_conference
+        FOREIGN KEY (CID) REFERENCES Conferences(CID)
+        ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Users whose rows above are up to date (a user can have zero matches)
+CREATE TABLE UserRecommendationStatus (
+    user_id INT NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id),
+    CONSTRAINT fk_recommendation_status_user
+        FOREIGN KEY (user_id) REFERENCES `user`(ID)
+        ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- Conferences with updated_at up to last_modified are matched against the stored users
+CREATE TABLE UserRecommendationWatermark (
+    id TINYINT NOT NULL DEFAULT 1,
+    last_modified DATETIME(6) NOT NULL DEFAULT '1970-01-01 00:00:00',
+    PRIMARY KEY (id)
+) ENGINE=InnoDB;
+
+INSERT INTO UserRecommendationWatermark (id, last_modified) VALUES (1, NOW(6));
+
+-- Existing databases: Conferences needs the change stamp
+-- ALTER TABLE Conferences
+--     ADD COLUMN updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+--     ADD KEY idx_conferences_updated_at (updated_at);
+
+-- AKA: "Which emails still need to go out?"
+-- Notification outbox (Python/notifications.py). Deadline reminders and
+-- recommendation digests are queued here; idempotency_key makes queueing the
+-- same notification twice a no-op. The worker claims due rows (status +
+-- next_attempt_at), sends one email per user and retries with backoff.
+CREATE TABLE NotificationOutbox (
+    ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    kind VARCHAR(20) NOT NULL,
+    idempotency_key VARCHAR(191) NOT NULL,
+    payload JSON NOT NULL,
+    status ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_error VARCHAR(500) NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME NULL,
+    UNIQUE KEY uq_outbox_idempotency_key (idempotency_key),
+    KEY idx_outbox_due (status, next_attempt_at),
+    CONSTRAINT fk_outbox_user
+        FOREIGN KEY (user_id) REFERENCES `user`(ID)
+        ON DELETE CASCADE
+) ENGINE=InnoDB;
+
 -- LOCATION-BASED DISCOVERY
 
 -- AKA: "What conferences are in my city/state?"
@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_request_context, make_response
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from datetime import datetime, date, timedelta
@@ -6,17 +6,44 @@ import sys
 import os
 import re
 import json
+import logging
+import hashlib
+import threading
+import time
+import unicodedata
+import atexit
+from functools import wraps
 from dotenv import load_dotenv
-from Python.connection import get_connection
+from Python.connection import PoolExhausted, get_connection as checkout_connection, get_pool_stats
+from Python.cache import TTLCache
+from Python.catalog import CatalogVersions, bump_catalog_version, read_catalog_versions
+from Python.json_provider import make_json_provider
+from Python.compression import COMPRESSIBLE_MIMETYPES, available_encodings, choose_encoding, compress
+from Python.interest_index import InterestIndex
+from Python.recommender import TfidfRecommender, fulltext_recommendation_query
+from Python.KeyFeatures import get_batch_conference_recommendations, paper_reminder_digests
+from Python.deadline_scheduler import DeadlineScheduler
+from Python.calendar_feed import CalendarFeed
+from Python.audit_writer import BufferedWriter
+from Python.bloom import BloomFilter
+from Python.tokens import InvalidToken, TokenSigner, parse_signing_keys
+from Python.partition_maintenance import partition_report, retention_from_env, run_partition_maintenance
+from Python.rate_limiter import make_rate_limiter
+from Python.password_hasher import DEFAULT_WORKERS as DEFAULT_BCRYPT_WORKERS, PasswordHasher, PasswordHasherBusy
+from Python.notifications import OutboxWorker, SMTPPool, enqueue_notifications, smtp_connector
+from Python.recommendation_store import (materialize_user, read_user_recommendations,
+                                         sync_changed_conferences)
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
 import subprocess
+from contextlib import contextmanager
 from apscheduler.schedulers.background import BackgroundScheduler
-import bcrypt
 
 load_dotenv()
 
 app = Flask(__name__)
+# JSON_ENCODER=orjson (default, falls back to std if orjson isn't installed) or std
+app.json = make_json_provider(app, os.getenv("JSON_ENCODER", "orjson"))
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///conferences.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
@@ -70,78 +97,439 @@ def parse_date(val):
                 raise ValueError(f"Invalid date format: {val}")
     raise ValueError(f"Unsupported date value: {val}")
 
+# Conference caching
+# Conference rows only change when the scraper/import scripts run, so detail
+# and list results are cached in process. Entries expire after
+# CONFERENCE_CACHE_TTL seconds, and the whole cache resets when the
+# 'conferences' row of the CatalogVersion table moves (imports and the
+# expiry event bump it).
+CONFERENCE_CACHE_SIZE = int(os.getenv("CONFERENCE_CACHE_SIZE", "2048"))
+CONFERENCE_CACHE_TTL = float(os.getenv("CONFERENCE_CACHE_TTL", "300"))
+# How often (seconds) the CatalogVersion table is re-read
+CATALOG_VERSION_CHECK = float(os.getenv("CATALOG_VERSION_CHECK", "2"))
+
+conference_cache = TTLCache(CONFERENCE_CACHE_SIZE, CONFERENCE_CACHE_TTL)
+
+def load_catalog_versions():
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        versions = read_catalog_versions(cursor)
+        cursor.close()
+        return versions
+    finally:
+        conn.close()
+
+catalog_versions = CatalogVersions(load_catalog_versions, CATALOG_VERSION_CHECK)
+
+def sync_conference_cache():
+    """Reset the conference cache if another process changed the catalog"""
+    conference_cache.sync(catalog_versions.get('conferences'))
+
+def bump_catalog(scope):
+    """Bump the CatalogVersion row for `scope`. Call it inside the write's transaction()."""
+    try:
+        with db_cursor() as cursor:
+            bump_catalog_version(cursor, scope)
+    except Exception as e:
+        print(f"Catalog version bump error: {str(e)}")
+    catalog_versions.invalidate()
+    if has_request_context():
+        # Re-read again once the surrounding transaction commits
+        g.catalog_bumped = True
+
+def matching_etag(etag):
+    """The variant of `etag` the request's If-None-Match names, or None.
+    compress_response() tags compressed bodies as <etag>-<encoding>."""
+    variants = [etag] + [f"{etag}-{encoding}" for encoding in available_encodings()]
+    return next((tag for tag in variants if request.if_none_match.contains(tag)), None)
+
+def etag_from_catalog(*scopes):
+    """Decorator: strong ETag built from the catalog versions of `scopes` and the request URL.
+
+    A matching If-None-Match is answered with 304 before the view (and its
+    SELECT) runs. If a version is unknown (e.g. the CatalogVersion table is
+    missing) the view runs normally without an ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = [catalog_versions.get(scope) for scope in scopes]
+            if None in versions:
+                return view(*args, **kwargs)
+            # JSON and NDJSON (chosen by Accept) are different bodies, so different tags
+            representation = 'ndjson' if wants_ndjson() else 'json'
+            tag_source = f"{'.'.join(map(str, versions))}|{representation}|{request.full_path}"
+            etag = hashlib.sha1(tag_source.encode('utf-8')).hexdigest()[:20]
+
+            return etag_response(etag, lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def etag_response(etag, build):
+    """304 if the request's If-None-Match names `etag`, otherwise build()'s
+    response tagged with it (only if it is a 200)"""
+    matched = matching_etag(etag)
+    if matched:
+        response = app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+        response.set_etag(etag)
+    # Let clients store the body but revalidate on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# Columns GET /api/conferences can return, in output order. ?fields= picks from these.
+CONFERENCE_LIST_FIELDS = ["CID", "Title", "Start_Date", "End_Date", "Descrip", "link", "LID"]
+# Largest page a client can ask for with ?limit=
+MAX_CONFERENCE_PAGE = 1000
+
+def parse_conference_list_args(args):
+    """Validate the query string of GET /api/conferences.
+
+    Returns (fields, limit, after_cid, since); raises ValueError with a
+    message suitable for a 400 response.
+    """
+    fields = CONFERENCE_LIST_FIELDS
+    if args.get('fields'):
+        by_name = {f.lower(): f for f in CONFERENCE_LIST_FIELDS}
+        requested = [f.strip().lower() for f in args['fields'].split(',') if f.strip()]
+        unknown = [f for f in requested if f not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(CONFERENCE_LIST_FIELDS)}")
+        # CID is always returned so clients can page with after_cid
+        wanted = {'cid'} | set(requested)
+        fields = [f for f in CONFERENCE_LIST_FIELDS if f.lower() in wanted]
+
+    limit = None
+    if args.get('limit'):
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError("'limit' must be an integer")
+        if not 1 <= limit <= MAX_CONFERENCE_PAGE:
+            raise ValueError(f"'limit' must be between 1 and {MAX_CONFERENCE_PAGE}")
+
+    after_cid = None
+    if args.get('after_cid'):
+        try:
+            after_cid = int(args['after_cid'])
+        except ValueError:
+            raise ValueError("'after_cid' must be an integer")
+
+    since = parse_date(args.get('since'))
+    return fields, limit, after_cid, since
+
 # Routes
 @app.route('/api/conferences', methods=['GET'])
+@etag_from_catalog('conferences')
 def get_conferences():
+    """List conferences, optionally paged and projected.
+
+    Query parameters:
+      fields     comma-separated subset of CONFERENCE_LIST_FIELDS (CID is always included)
+      limit      page size; the next page's cursor comes back in X-Next-After-CID
+      after_cid  keyset cursor: only conferences with CID greater than this
+      since      only conferences starting on or after this date (YYYY-MM-DD)
+      format     'ndjson' streams one JSON object per line (see stream_ndjson)
+    Without any parameters the whole catalog is returned, as before.
+    ?ids=1,2,3 switches to a batch detail lookup (see get_conferences_batch).
+    """
+    if 'ids' in request.args:
+        return get_conferences_batch(request.args['ids'])
+
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        fields, limit, after_cid, since = parse_conference_list_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        cursor.execute("""
-            SELECT
-                CID,
-                Title,
-                Start_Date,
-                End_Date
-                DESCRIP,
-                link,
-                LID
-            FROM Conferences
-        """)
+    where, params = [], []
+    if after_cid is not None:
+        where.append("CID > %s")
+        params.append(after_cid)
+    if since is not None:
+        where.append("Start_Date >= %s")
+        params.append(since)
+
+    # Column names come from the whitelist above, never from the request
+    sql = f"SELECT {', '.join(fields)} FROM Conferences"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY CID"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    if wants_ndjson():
+        return stream_ndjson(sql, params)
+
+    sync_conference_cache()
+    cache_key = ('list', tuple(fields), limit, after_cid, since)
+    conferences = conference_cache.get(cache_key)
+    if conferences is not None:
+        return conference_list_response(conferences, limit)
 
-        conferences = cursor.fetchall()
+    try:
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(sql, params)
+            conferences = cursor.fetchall()
 
-        cursor.close()
-        conn.close()
+        conference_cache.set(cache_key, conferences)
+        return conference_list_response(conferences, limit)
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+def conference_list_response(conferences, limit):
+    response = jsonify(conferences)
+    if limit is not None and len(conferences) == limit:
+        response.headers['X-Next-After-CID'] = str(conferences[-1]['CID'])
+    return response, 200
+
+# Streaming listings
+# Bulk consumers (e.g. the analytics sync) can ask for ?format=ndjson or
+# Accept: application/x-ndjson and get rows streamed straight off an
+# unbuffered cursor, so worker memory stays flat however big the table is.
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "500"))
+
+def wants_ndjson():
+    # The answer depends on Accept; vary_on_accept() tells caches so
+    g.negotiated_ndjson = True
+    return (request.args.get('format') == 'ndjson'
+            or request.accept_mimetypes.best == NDJSON_MIMETYPE)
+
+@app.after_request
+def vary_on_accept(response):
+    if g.get('negotiated_ndjson'):
+        response.vary.add('Accept')
+    return response
+
+def ndjson_error(e):
+    """Last line of a stream that failed after the 200 headers went out"""
+    return app.json.dumps({"error": str(e)}) + '\n'
+
+def stream_ndjson(sql, params=()):
+    """Stream the rows of `sql` as newline-delimited JSON.
+
+    The generator checks out its own connection because it outlives the
+    view function. Rows are read STREAM_BATCH_ROWS at a time. A database
+    error mid-stream ends it with an {"error": ...} line, so clients can
+    tell a cut-short listing from a complete one.
+    """
+    def generate():
+        conn = get_connection()
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        finished = False
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(STREAM_BATCH_ROWS)
+                if not rows:
+                    break
+                yield ''.join(app.json.dumps(row) + '\n' for row in rows)
+            finished = True
+        except Error as e:
+            logging.error("NDJSON stream failed: %s", e)
+            yield ndjson_error(e)
+        finally:
+            if finished:
+                cursor.close()
+                conn.close()
+            else:
+                # Client went away mid-stream: unread rows are still on the
+                # socket, so drop this connection instead of reusing it
+                getattr(conn, 'discard', conn.close)()
+
+    return app.response_class(generate(), mimetype=NDJSON_MIMETYPE)
+
+
+# Conference detail shape used by the detail modal, for one or many CIDs
+CONFERENCE_DETAIL_SQL = """
+    SELECT
+        c.CID as id,
+        c.Title as name,
+        c.Start_Date as start_date,
+        c.End_Date as end_date,
+        c.Descrip as description,
+        c.link as url,
+        CONCAT_WS(', ', l.City, l.State, l.Country) as location
+    FROM Conferences c
+    LEFT JOIN Location l ON c.LID = l.LID
+"""
+# Most CIDs one ?ids= request may ask for
+MAX_CONFERENCE_BATCH = 500
+
+def parse_conference_ids(raw):
+    """Parse '1,2,3' into a de-duplicated list of ints (order kept)"""
+    ids = []
+    for part in raw.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            cid = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid conference id: {part}")
+        if cid not in ids:
+            ids.append(cid)
+    if not ids:
+        raise ValueError("'ids' must list at least one conference id")
+    if len(ids) > MAX_CONFERENCE_BATCH:
+        raise ValueError(f"At most {MAX_CONFERENCE_BATCH} ids per request")
+    return ids
+
+def get_conferences_batch(raw_ids):
+    """GET /api/conferences?ids=1,2,3 - many conference details in one query, keyed by id"""
+    try:
+        ids = parse_conference_ids(raw_ids)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    sync_conference_cache()
+    found = {}
+    for cid in ids:
+        conference = conference_cache.get(('detail', cid))
+        if conference is not None:
+            found[cid] = conference
+    misses = [cid for cid in ids if cid not in found]
 
-        return jsonify(conferences), 200
+    try:
+        if misses:
+            placeholders = ', '.join(['%s'] * len(misses))
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute(CONFERENCE_DETAIL_SQL + f" WHERE c.CID IN ({placeholders})", misses)
+                for row in cursor.fetchall():
+                    found[row['id']] = row
+                    conference_cache.set(('detail', row['id']), row)
+
+        return jsonify({
+            "conferences": {str(cid): found[cid] for cid in ids if cid in found},
+            "missing": [cid for cid in ids if cid not in found]
+        }), 200
 
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
+# Words shorter than this are not in the FULLTEXT index (innodb_ft_min_token_size)
+FT_MIN_TOKEN_SIZE = int(os.getenv("FT_MIN_TOKEN_SIZE", "3"))
+MAX_SEARCH_PAGE = 100
+
+@app.route('/api/conferences/search', methods=['GET'])
+def search_conferences():
+    """Full-text conference search ranked by relevance.
+
+    Uses the fullText_conference_title_desc index on (Title, Descrip).
+    Query parameters:
+      q                      search text (required)
+      limit, offset          paging (limit defaults to 20, max 100)
+      from, to               only conferences starting in this date range (YYYY-MM-DD)
+      city, state, country   exact location filters
+    Queries made only of words too short for the index fall back to a
+    title prefix match.
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"error": "'q' is required"}), 400
 
-@app.route('/api/conferences/<int:conf_id>', methods=['GET'])
-def get_conference(conf_id):
     try:
-        print(f"[DEBUG] Fetching conference with CID={conf_id}")
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        limit = int(request.args.get('limit', 20))
+        offset = int(request.args.get('offset', 0))
+        start_from = parse_date(request.args.get('from'))
+        start_to = parse_date(request.args.get('to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= limit <= MAX_SEARCH_PAGE:
+        return jsonify({"error": f"'limit' must be between 1 and {MAX_SEARCH_PAGE}"}), 400
+    if offset < 0:
+        return jsonify({"error": "'offset' must not be negative"}), 400
+
+    use_fulltext = any(len(word) >= FT_MIN_TOKEN_SIZE for word in re.findall(r'\w+', q))
+    if use_fulltext:
+        relevance = "MATCH(c.Title, c.Descrip) AGAINST(%s IN NATURAL LANGUAGE MODE)"
+        where, params = [relevance], [q]
+        select_params = [q]
+    else:
+        relevance = "0"
+        where, params = ["c.Title LIKE %s"], [q.replace('%', r'\%').replace('_', r'\_') + '%']
+        select_params = []
+
+    if start_from:
+        where.append("c.Start_Date >= %s")
+        params.append(start_from)
+    if start_to:
+        where.append("c.Start_Date < %s")
+        params.append(start_to + timedelta(days=1))
+    for arg, column in (('city', 'l.City'), ('state', 'l.State'), ('country', 'l.Country')):
+        if request.args.get(arg):
+            where.append(f"{column} = %s")
+            params.append(request.args[arg])
+
+    sql = f"""
+        SELECT
+            c.CID,
+            c.Title,
+            c.Start_Date,
+            c.End_Date,
+            c.link,
+            LEFT(c.Descrip, 200) AS snippet,
+            CONCAT_WS(', ', l.City, l.State, l.Country) AS location,
+            {relevance} AS relevance
+        FROM Conferences c
+        LEFT JOIN Location l ON c.LID = l.LID
+        WHERE {' AND '.join(where)}
+        ORDER BY relevance DESC, c.CID
+        LIMIT %s OFFSET %s
+    """
 
-        query = """
-            SELECT
-                c.CID as id,
-                c.Title as name,
-                c.Start_Date as start_date,
-                c.End_Date as end_date,
-                c.Descrip as description,
-                c.link as url,
-                CONCAT_WS(', ', l.City, l.State, l.Country) as location
-            FROM Conferences c
-            LEFT JOIN Location l ON c.LID = l.LID
-            WHERE c.CID = %s
-        """
-        
-        cursor.execute(query, (conf_id,))
-        conference = cursor.fetchone()
+    try:
+        with db_cursor(dictionary=True) as cursor:
+            # Ask for one extra row to know whether there is a next page
+            cursor.execute(sql, select_params + params + [limit + 1, offset])
+            results = cursor.fetchall()
 
-        print(f"[DEBUG] Query executed for CID={conf_id}, Result: {conference}")
+        has_more = len(results) > limit
+        return jsonify({
+            "results": results[:limit],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if has_more else None
+        }), 200
 
-        cursor.close()
-        conn.close()
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/conferences/<int:conf_id>', methods=['GET'])
+def get_conference(conf_id):
+    try:
+        sync_conference_cache()
+        conference = conference_cache.get(('detail', conf_id))
+        if conference is None:
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute(CONFERENCE_DETAIL_SQL + " WHERE c.CID = %s", (conf_id,))
+                conference = cursor.fetchone()
+            if conference:
+                conference_cache.set(('detail', conf_id), conference)
 
         if not conference:
-            print(f"[DEBUG] Conference not found for CID={conf_id}")
+            logging.debug("Conference not found for CID=%s", conf_id)
             return jsonify({"error": "Conference not found"}), 404
 
         return jsonify(conference), 200
 
     except Error as e:
-        print(f"[ERROR] Database error: {str(e)}")
+        logging.error("Database error fetching conference %s: %s", conf_id, e)
         return jsonify({"error": str(e)}), 500
     except Exception as e:
-        print(f"[ERROR] Unexpected error: {str(e)}")
+        logging.exception("Unexpected error fetching conference %s: %s", conf_id, e)
         return jsonify({"error": str(e)}), 500
 
+# The conference write routes below go to the local SQLite `conferences` table,
+# not MySQL's Conferences that the GET routes, caches and recommendations read,
+# so their ids are not CIDs and nothing cached from MySQL depends on them.
 @app.route('/api/conferences', methods=['POST'])
 def create_conference():
     data = request.json or {}
@@ -276,7 +664,43 @@ def run_tests():
     print("All tests passed!")
 
 
-CORS(app, resources={r"/api/*": {"origins": ["http://localhost:5173"]}}, supports_credentials=True)
+CORS(app, resources={r"/api/*": {"origins": ["http://localhost:5173"]}}, supports_credentials=True,
+     expose_headers=["X-Next-After-CID"])
+
+# Response compression
+# /api responses at least COMPRESS_MIN_BYTES long are gzip- or brotli-encoded,
+# whichever the client accepts (brotli preferred when installed).
+# COMPRESS_MIN_BYTES=0 turns compression off.
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+
+@app.after_request
+def compress_response(response):
+    if (COMPRESS_MIN_BYTES <= 0
+            or not request.path.startswith('/api/')
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    response.set_data(compress(data, encoding, COMPRESS_GZIP_LEVEL, COMPRESS_BROTLI_QUALITY))
+    response.headers['Content-Encoding'] = encoding
+    # A strong ETag names one exact representation, so the compressed body gets its own
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
 
 def validate_password_strength(password):
     """Validate password meets security requirements"""
@@ -290,72 +714,352 @@ def validate_password_strength(password):
         return False, "Password must contain at least one number"
     return True, "Password is valid"
 
+# bcrypt runs on a bounded pool rather than in the request thread, so a burst
+# of logins can't take every core from the cheap endpoints. When more than
+# BCRYPT_MAX_PENDING hashes are waiting, auth routes answer 503 + Retry-After.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(DEFAULT_BCRYPT_WORKERS)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(BCRYPT_WORKERS * 8)))
+BCRYPT_MAX_WAIT = float(os.getenv("BCRYPT_MAX_WAIT", "5"))
+
+password_hasher = PasswordHasher(BCRYPT_ROUNDS, BCRYPT_WORKERS, BCRYPT_MAX_PENDING, BCRYPT_MAX_WAIT)
+
 def hash_password(password):
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    release_request_db()
+    return password_hasher.hash(password)
 
 def verify_password(password, password_hash):
     """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    release_request_db()
+    return password_hasher.verify(password, password_hash)
+
+def busy_response(e):
+    """503 with the Retry-After of an overload error (bcrypt queue or DB pool)"""
+    response = jsonify({"error": "Server is busy, please try again shortly"})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+@app.route('/api/admin/password-hasher', methods=['GET'])
+def password_hasher_stats():
+    return jsonify(password_hasher.snapshot()), 200
+
+# Request-scoped database access
+# Every helper a route calls during one request shares a single pooled
+# connection, and transaction() groups their writes into one commit.
+# Set REQUEST_SCOPED_DB=0 to fall back to one connection per helper call
+# (used by Python/benchmark_request_scope.py for the before/after numbers).
+REQUEST_SCOPED_DB = os.getenv("REQUEST_SCOPED_DB", "1") != "0"
+
+def get_connection():
+    """Check out a pooled connection. Pool exhaustion is noted on the request,
+    so shed_pool_exhaustion() turns the route's 500 into a 503."""
+    try:
+        return checkout_connection()
+    except PoolExhausted as e:
+        if has_request_context():
+            g.pool_exhausted = e
+        raise
+
+@app.errorhandler(PoolExhausted)
+def pool_exhausted(e):
+    return busy_response(e)
+
+@app.after_request
+def shed_pool_exhaustion(response):
+    # Routes catch mysql Error (PoolExhausted's base) and answer 500
+    e = g.get('pool_exhausted')
+    if e is not None and response.status_code == 500:
+        return busy_response(e)
+    return response
+
+def get_db():
+    """Return the connection bound to the current request, checking one out on first use"""
+    if 'db_conn' not in g:
+        g.db_conn = get_connection()
+    return g.db_conn
+
+def release_request_db():
+    """Hand the request's connection back to the pool before a slow step that
+    doesn't need it (waiting up to BCRYPT_MAX_WAIT on bcrypt); the next
+    db_cursor() checks out another. Kept while a transaction is open."""
+    if not has_request_context():
+        return
+    conn = g.get('db_conn')
+    if conn is not None and not conn.in_transaction:
+        g.pop('db_conn')
+        conn.close()
+
+@app.teardown_appcontext
+def release_db(exc):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        # The pool rolls back anything left uncommitted before reusing it
+        conn.close()
+
+@contextmanager
+def db_cursor(dictionary=False):
+    """Cursor on the request's connection, or on a throwaway one outside a request"""
+    scoped = REQUEST_SCOPED_DB and has_request_context()
+    conn = get_db() if scoped else get_connection()
+    cursor = conn.cursor(dictionary=dictionary)
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+        if not scoped:
+            conn.close()
+
+@contextmanager
+def transaction():
+    """Run the block as a single transaction on the request's connection.
+
+    Commits once when the block exits and rolls back if it raises. Nested
+    calls join the outer transaction.
+    """
+    if not (REQUEST_SCOPED_DB and has_request_context()):
+        yield
+        return
+    conn = get_db()
+    if conn.in_transaction:
+        yield
+        return
+    conn.start_transaction()
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    if g.pop('catalog_bumped', False):
+        catalog_versions.invalidate()
+
+# Audit and login-attempt rows are append-only, so they are queued and written
+# by background threads in multi-row batches (AUDIT_BATCH_SIZE rows, or every
+# AUDIT_FLUSH_INTERVAL seconds). Callers only pay for a queue put; when the
+# queue is full rows are dropped and counted. Queues are drained at exit.
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+
+audit_writer = BufferedWriter(get_connection, """
+    INSERT INTO AuditLog (user_id, username, operation_type, operation_time, old_values, new_values)
+    VALUES (%s, %s, %s, %s, %s, %s)
+""", "audit-writer", AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL)
+login_attempt_writer = BufferedWriter(get_connection, """
+    INSERT INTO LoginAttempts (username, attempt_time, success)
+    VALUES (%s, %s, %s)
+""", "login-attempt-writer", AUDIT_QUEUE_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL)
+
+@atexit.register
+def drain_audit_writers():
+    audit_writer.close()
+    login_attempt_writer.close()
 
 def log_audit(user_id, username, operation_type, old_values=None, new_values=None):
     """Log operations to AuditLog table"""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO AuditLog (user_id, username, operation_type, old_values, new_values)
-            VALUES (%s, %s, %s, %s, %s)
-        """, (
+        audit_writer.put((
             user_id,
             username,
             operation_type,
+            datetime.now(),
             json.dumps(old_values) if old_values else None,
             json.dumps(new_values) if new_values else None
         ))
-        conn.commit()
-        cursor.close()
-        conn.close()
     except Exception as e:
         print(f"Audit logging error: {str(e)}")
 
+@app.route('/api/admin/audit-writer', methods=['GET'])
+def audit_writer_stats():
+    return jsonify({"audit": audit_writer.stats(), "login_attempts": login_attempt_writer.stats()}), 200
+
+# Login rate limiting
+# LOGIN_RATE_LIMIT failed logins for a username within LOGIN_RATE_WINDOW
+# seconds lock it out. The failures are counted in memory (or in Redis when
+# RATE_LIMIT_REDIS_URL is set, so all workers share them), seeded once from
+# LoginAttempts. LoginAttempts itself is written in the background and only
+# kept for forensics; logins don't wait on it.
+LOGIN_RATE_LIMIT = int(os.getenv("LOGIN_RATE_LIMIT", "5"))
+LOGIN_RATE_WINDOW = int(os.getenv("LOGIN_RATE_WINDOW", "900"))
+
+login_rate_limiter = make_rate_limiter(os.getenv("RATE_LIMIT_REDIS_URL"), LOGIN_RATE_LIMIT, LOGIN_RATE_WINDOW)
+# A failed seed (database down) is retried at most this often (seconds)
+LOGIN_RATE_SEED_RETRY = float(os.getenv("LOGIN_RATE_SEED_RETRY", "30"))
+login_rate_limiter_seeded = False
+login_rate_limiter_seed_failed_at = None
+login_rate_limiter_lock = threading.Lock()
+
+def seed_login_rate_limiter():
+    """Load recent failures from LoginAttempts, once per process, so a restart doesn't lift lockouts"""
+    global login_rate_limiter_seeded, login_rate_limiter_seed_failed_at
+    with login_rate_limiter_lock:
+        if login_rate_limiter_seeded:
+            return
+        failed_at = login_rate_limiter_seed_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < LOGIN_RATE_SEED_RETRY:
+            return
+        try:
+            with db_cursor() as cursor:
+                cursor.execute("""
+                    SELECT username, attempt_time FROM LoginAttempts
+                    WHERE success = FALSE AND attempt_time > %s
+                    ORDER BY attempt_time
+                """, (datetime.now() - timedelta(seconds=LOGIN_RATE_WINDOW),))
+                rows = cursor.fetchall()
+        except Exception as e:
+            print(f"Rate limit seed error: {str(e)}")
+            login_rate_limiter_seed_failed_at = time.monotonic()
+            return
+        login_rate_limiter.seed((username, attempt_time.timestamp()) for username, attempt_time in rows)
+        login_rate_limiter_seeded = True
+
 def check_rate_limit(username):
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-  
-        fifteen_mins_ago = datetime.now() - timedelta(minutes=15)
-        cursor.execute("""
-            SELECT COUNT(*) FROM LoginAttempts 
-            WHERE username = %s 
-            AND attempt_time > %s 
-            AND success = FALSE
-        """, (username, fifteen_mins_ago))
-        
-        failed_attempts = cursor.fetchone()[0]
-        cursor.close()
-        conn.close()
-        
-        return failed_attempts >= 5
-    except Exception as e:
-        print(f"Rate limit check error: {str(e)}")
+    if not username:
         return False
+    if not login_rate_limiter_seeded:
+        seed_login_rate_limiter()
+    return login_rate_limiter.is_limited(str(username))
 
 def log_login_attempt(username, success):
-    """Log login attempt to LoginAttempts table"""
+    """Count a failure towards the rate limit; LoginAttempts is written in the background"""
+    if not success and username:
+        login_rate_limiter.record_failure(str(username))
+    login_attempt_writer.put((username, datetime.now(), success))
+
+@app.route('/api/admin/login-rate-limiter', methods=['GET'])
+def login_rate_limiter_stats():
+    return jsonify(login_rate_limiter.stats()), 200
+
+# Session tokens
+# login/verify-login return a signed, expiring token carrying the user's ID
+# (Python/tokens.py). Routes under /api/users/<user_id> check it
+# with an HMAC instead of a user lookup. SESSION_SIGNING_KEYS is
+# "kid:secret,kid:secret", newest first; add a new key in front to rotate and
+# drop the old one after SESSION_TOKEN_TTL. Until REQUIRE_AUTH_TOKENS=1,
+# requests without a valid token (missing, expired, or signed with a key
+# that was dropped) are served as before. Without SESSION_SIGNING_KEYS no
+# tokens are issued, and REQUIRE_AUTH_TOKENS=1 refuses to start.
+SESSION_TOKEN_TTL = int(os.getenv("SESSION_TOKEN_TTL", "3600"))
+REQUIRE_AUTH_TOKENS = os.getenv("REQUIRE_AUTH_TOKENS", "0") == "1"
+
+session_signing_keys = parse_signing_keys(os.getenv("SESSION_SIGNING_KEYS"))
+if REQUIRE_AUTH_TOKENS and not session_signing_keys:
+    raise ValueError("REQUIRE_AUTH_TOKENS=1 needs SESSION_SIGNING_KEYS shared by every worker")
+token_signer = TokenSigner(session_signing_keys, SESSION_TOKEN_TTL) if session_signing_keys else None
+
+def issue_session_token(user_id):
+    if token_signer is None:
+        return {}
+    token, expires_at = token_signer.issue(user_id)
+    return {"token": token, "expires_at": expires_at}
+
+def user_token_required(view):
+    """Decorator for routes taking user_id: a Bearer token must belong to that user"""
+    @wraps(view)
+    def wrapper(user_id, *args, **kwargs):
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer ') or token_signer is None:
+            if REQUIRE_AUTH_TOKENS:
+                return jsonify({"error": "Authentication required"}), 401, {'WWW-Authenticate': 'Bearer'}
+            return view(user_id, *args, **kwargs)
+        try:
+            claims = token_signer.verify(header[len('Bearer '):].strip())
+        except InvalidToken as e:
+            if not REQUIRE_AUTH_TOKENS:
+                # Not enforced yet: treat it like no token rather than breaking the session
+                return view(user_id, *args, **kwargs)
+            return jsonify({"error": f"Invalid token: {e}"}), 401, {'WWW-Authenticate': 'Bearer error="invalid_token"'}
+        if claims.get("sub") != user_id:
+            return jsonify({"error": "Token does not belong to this user"}), 403
+        return view(user_id, *args, **kwargs)
+    return wrapper
+
+# Username availability
+# The signup form asks GET /api/users/available while the user types. Usernames
+# in use are held in a Bloom filter (Python/bloom.py): "not in the filter" is
+# answered without a query, "maybe" is confirmed on the unique index. Emails
+# aren't offered: an anonymous "is this email registered?" would let anyone
+# find out who has an account. When another process changes the 'users'
+# catalog the filter is rebuilt on a background thread, and checks query
+# MySQL until it is ready; this process's own writes are added in place. The
+# answer is only a hint: the unique keys on user decide, and a duplicate
+# INSERT is answered with 409.
+USER_FILTER_CAPACITY = int(os.getenv("USER_FILTER_CAPACITY", "100000"))
+USER_FILTER_ERROR_RATE = float(os.getenv("USER_FILTER_ERROR_RATE", "0.01"))
+# Unique keys in SQL/shell.sql -> request field
+DUPLICATE_USER_KEYS = {"uq_user_username": "username", "uq_user_email": "email", "uq_user_phone": "Phone"}
+
+# "added" collects this process's writes while a rebuild is reading the table
+user_filters = {"filter": None, "version": None, "rebuilding": False, "added": []}
+user_filter_lock = threading.Lock()
+user_filter_counts = {"checks": 0, "answered_from_filter": 0, "taken": 0, "false_positives": 0, "rebuilds": 0}
+
+def availability_key(value):
+    """The unique keys compare case- and accent-insensitively; fold the same way so
+    the filter can only err towards "maybe" (a query)"""
+    decomposed = unicodedata.normalize("NFKD", value.strip())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+def duplicate_user_field(e):
+    """For a duplicate-key error on user, the field that clashed ("user" if the key
+    isn't recognised); None for any other error"""
+    if getattr(e, 'errno', None) != errorcode.ER_DUP_ENTRY:
+        return None
+    match = re.search(r"for key '(?:user\.)?(\w+)'", getattr(e, 'msg', '') or '')
+    return DUPLICATE_USER_KEYS.get(match.group(1), "user") if match else "user"
+
+def rebuild_user_filter():
+    """Build a fresh filter from MySQL and swap it in; runs on its own thread"""
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO LoginAttempts (username, success)
-            VALUES (%s, %s)
-        """, (username, success))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        # Read the version first: a write landing during the load moves it past this
+        version = catalog_versions.get('users')
+        with db_cursor() as cursor:
+            cursor.execute("SELECT username FROM user")
+            rows = cursor.fetchall()
+        bloom = BloomFilter(max(USER_FILTER_CAPACITY, len(rows) * 2), USER_FILTER_ERROR_RATE)
+        bloom.update(availability_key(username) for username, in rows if username)
+        with user_filter_lock:
+            bloom.update(user_filters["added"])
+            user_filters.update(filter=bloom, version=version)
+            user_filter_counts["rebuilds"] += 1
     except Exception as e:
-        print(f"Login attempt logging error: {str(e)}")
+        print(f"User filter rebuild error: {str(e)}")
+    finally:
+        with user_filter_lock:
+            user_filters.update(rebuilding=False, added=[])
+
+def current_user_filter():
+    """The username BloomFilter, or None while it is missing or stale (callers
+    query instead); a stale or full one is rebuilt in the background"""
+    version = catalog_versions.get('users')
+    if version is None:
+        return None
+    with user_filter_lock:
+        bloom = user_filters["filter"]
+        if bloom is not None and user_filters["version"] == version and not bloom.full:
+            return bloom
+        if not user_filters["rebuilding"]:
+            user_filters.update(rebuilding=True, added=[])
+            threading.Thread(target=rebuild_user_filter, name="user-filter-rebuild", daemon=True).start()
+        return None
+
+def refresh_user_filters(username=None):
+    """Add a user this process just wrote (after its transaction committed).
+    Renamed or deleted names stay in the filter, which only costs a query."""
+    with user_filter_lock:
+        if username and user_filters["rebuilding"]:
+            user_filters["added"].append(availability_key(username))
+        bloom = user_filters["filter"]
+        if bloom is None:
+            return
+        if username:
+            bloom.add(availability_key(username))
+        # Adopt the new version only if this write was the only change since the build
+        version = catalog_versions.get('users')
+        if version is not None and user_filters["version"] is not None and version == user_filters["version"] + 1:
+            user_filters["version"] = version
 
 @app.route('/', methods=['GET'])
 def home():
@@ -387,58 +1091,42 @@ def signup():
         return jsonify({"error": message}), 400
     
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Check if user already exists
-        cursor.execute("""
-            CALL CheckUserExists(%s, %s, %s, @exists_flag, @existing_user_id);
-        """, (data.get("email"), data.get("Phone"), data.get("username")))
-
-        cursor.execute("SELECT @exists_flag, @existing_user_id")
-        exists_flag, existing_user_id = cursor.fetchone()
-        
-        if exists_flag == 1:
-            cursor.close()
-            conn.close()
-            return jsonify({"error": "User with this email, username, or phone number already exists"}), 409
-
-        # Hash the password
+        # Hash the password (before opening the transaction so it stays short)
         password_hash = hash_password(data.get("password"))
 
-        # Insert new user
+        # Insert new user; the unique keys on username, email and Phone reject
+        # duplicates. Its audit row is queued for the background audit writer
         sql = """
             INSERT INTO user (username, password_hash, email, Phone, Interest_1, Interest_2, Interest_3)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
 
-        cursor.execute(sql, (
-            data["username"],
-            password_hash,
-            data.get("email"),
-            data.get("Phone"),
-            data.get("Interest_1"),
-            data.get("Interest_2"),
-            data.get("Interest_3")
-        ))
-
-        user_id = cursor.lastrowid
-        conn.commit()
-        
-        # Log the registration
-        log_audit(
-            user_id=user_id,
-            username=data["username"],
-            operation_type="USER_REGISTERED",
-            new_values={
-                "username": data["username"],
-                "email": data.get("email"),
-                "phone": data.get("Phone")
-            }
-        )
-        
-        cursor.close()
-        conn.close()
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute(sql, (
+                    data["username"],
+                    password_hash,
+                    data.get("email"),
+                    data.get("Phone"),
+                    data.get("Interest_1"),
+                    data.get("Interest_2"),
+                    data.get("Interest_3")
+                ))
+                user_id = cursor.lastrowid
+
+            # Log the registration
+            log_audit(
+                user_id=user_id,
+                username=data["username"],
+                operation_type="USER_REGISTERED",
+                new_values={
+                    "username": data["username"],
+                    "email": data.get("email"),
+                    "phone": data.get("Phone")
+                }
+            )
+            bump_catalog('users')
+        refresh_user_filters(data["username"])
 
         return jsonify({
             "message": "User registered successfully",
@@ -449,7 +1137,13 @@ def signup():
             }
         }), 201
         
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Error as e:
+        field = duplicate_user_field(e)
+        if field:
+            return jsonify({"error": "User with this email, username, or phone number already exists",
+                            "field": field}), 409
         print(f"Database error: {str(e)}")
         return jsonify({"error": f"Database error: {str(e)}"}), 500
     except Exception as e:
@@ -477,18 +1171,13 @@ def login():
         if check_rate_limit(login_input):
             return jsonify({"error": "Too many failed login attempts. Please try again in 15 minutes."}), 429
         
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
         # Find user by username or email
-        cursor.execute(
-            "SELECT * FROM user WHERE username = %s OR email = %s",
-            (login_input, login_input)
-        )
-        user = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                "SELECT * FROM user WHERE username = %s OR email = %s",
+                (login_input, login_input)
+            )
+            user = cursor.fetchone()
 
         # Verify user exists and password matches
         if user and verify_password(password, user["password_hash"]):
@@ -510,7 +1199,8 @@ def login():
             
             return jsonify({
                 "message": "Login successful",
-                "user": user_response
+                "user": user_response,
+                **issue_session_token(user["ID"])
             }), 200
         else:
             log_login_attempt(login_input, False)
@@ -522,6 +1212,8 @@ def login():
             
             return jsonify({"error": "Invalid username/email or password"}), 401
 
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Error as e:
         print(f"Database error: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -549,12 +1241,32 @@ def test_database():
             "message": f"Database connection failed: {str(e)}"
         }), 500
 
+# Live connection pool counters, used to size DB_POOL_SIZE against the worker count
+@app.route('/api/db/pool-stats', methods=['GET'])
+def pool_stats():
+    return jsonify(get_pool_stats()), 200
+
+# Conference cache counters (hits, misses, evictions), used to tune CONFERENCE_CACHE_SIZE
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "conferences": conference_cache.stats(),
+        "catalog_version": catalog_versions.get('conferences')
+    }), 200
+
 
 # PAPERS API:
 
 # Get all papers (optionally filter by conference ID)
 @app.get("/api/papers")
+@etag_from_catalog('papers')
 def get_papers():
+    if wants_ndjson():
+        conference_id = request.args.get('conferenceId')
+        if conference_id:
+            return stream_ndjson("SELECT * FROM Papers WHERE CID = %s;", (conference_id,))
+        return stream_ndjson("SELECT * FROM Papers;")
+
     try:
         conn = get_connection()
         cursor = conn.cursor(dictionary=True)
@@ -575,16 +1287,28 @@ def get_papers():
         return jsonify({"error": str(e)}), 500
 
 
+def parse_paper(data):
+    """Validate a paper body; returns (TypeOfPaper, Topic, DueDate, CID) or raises ValueError"""
+    if not data:
+        raise ValueError("No data provided")
+    for field in ("TypeOfPaper", "Topic", "DueDate"):
+        if not data.get(field):
+            raise ValueError(f"'{field}' is required")
+    try:
+        due_date = datetime.fromisoformat(str(data["DueDate"]))
+    except ValueError:
+        raise ValueError("'DueDate' must be an ISO date/time, e.g. 2026-03-01T23:59")
+    return data["TypeOfPaper"], data["Topic"], due_date, data.get("CID")
+
 # Get single paper by ID
 @app.get("/api/papers/<int:paper_id>")
 def get_paper(paper_id):
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM Paper WHERE paper_id = %s;", (paper_id,))
-        paper = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT * FROM Papers WHERE PID = %s;", (paper_id,))
+            paper = cursor.fetchone()
+        if not paper:
+            return jsonify({"error": "Paper not found"}), 404
         return jsonify(paper), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -593,28 +1317,24 @@ def get_paper(paper_id):
 # Create a new paper
 @app.post("/api/papers")
 def create_paper():
-    data = request.json
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+        values = parse_paper(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
         sql = """
-            INSERT INTO Paper (title, abstract, person_id, conference_id)
+            INSERT INTO Papers (TypeOfPaper, Topic, DueDate, CID)
             VALUES (%s, %s, %s, %s)
         """
 
-        cursor.execute(sql, (
-            data["title"],
-            data["abstract"],
-            data["person_id"],
-            data["conference_id"]
-        ))
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute(sql, values)
+                paper_id = cursor.lastrowid
+            bump_catalog('papers')
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return jsonify({"message": "Paper created successfully."}), 201
+        refresh_paper_deadline(paper_id)
+        return jsonify({"message": "Paper created successfully.", "PID": paper_id}), 201
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
@@ -622,32 +1342,29 @@ def create_paper():
 # Update paper
 @app.put("/api/papers/<int:paper_id>")
 def update_paper(paper_id):
-    data = request.json
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+        values = parse_paper(request.json)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
         sql = """
-            UPDATE Paper
-            SET title = %s,
-                abstract = %s,
-                person_id = %s,
-                conference_id = %s
-            WHERE paper_id = %s
+            UPDATE Papers
+            SET TypeOfPaper = %s,
+                Topic = %s,
+                DueDate = %s,
+                CID = %s
+            WHERE PID = %s
         """
 
-        cursor.execute(sql, (
-            data["title"],
-            data["abstract"],
-            data["person_id"],
-            data["conference_id"],
-            paper_id
-        ))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute("SELECT 1 FROM Papers WHERE PID = %s FOR UPDATE", (paper_id,))
+                if cursor.fetchone() is None:
+                    return jsonify({"error": "Paper not found"}), 404
+                cursor.execute(sql, (*values, paper_id))
+            bump_catalog('papers')
 
+        refresh_paper_deadline(paper_id)
         return jsonify({"message": "Paper updated successfully."}), 200
 
     except Error as e:
@@ -658,12 +1375,13 @@ def update_paper(paper_id):
 @app.delete("/api/papers/<int:paper_id>")
 def delete_paper(paper_id):
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM Paper WHERE paper_id = %s;", (paper_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute("DELETE FROM Papers WHERE PID = %s;", (paper_id,))
+                if cursor.rowcount == 0:
+                    return jsonify({"error": "Paper not found"}), 404
+            bump_catalog('papers')
+        refresh_paper_deadline(paper_id)
         return jsonify({"message": "Paper deleted successfully."}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -678,6 +1396,9 @@ def delete_paper(paper_id):
 #get all users
 @app.get("/api/users")
 def get_all_users():    
+    if wants_ndjson():
+        return stream_ndjson("SELECT * FROM user;")
+
     try:
         conn = get_connection()
         cursor = conn.cursor(dictionary=True)
@@ -691,6 +1412,7 @@ def get_all_users():
 
 #get user by ID
 @app.get("/api/users/<int:user_id>")
+@user_token_required
 def get_user(user_id):
     try:
         conn = get_connection()
@@ -703,6 +1425,36 @@ def get_user(user_id):
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
+#check username availability
+@app.get("/api/users/available")
+def user_available():
+    """?username= -> {"username": true}: whether the name is free"""
+    username = request.args.get('username', '').strip()
+    if not username:
+        return jsonify({"error": "Pass username"}), 400
+    try:
+        bloom = current_user_filter()
+        user_filter_counts["checks"] += 1
+        if bloom is not None and availability_key(username) not in bloom:
+            user_filter_counts["answered_from_filter"] += 1
+            return jsonify({"username": True}), 200
+        with db_cursor() as cursor:
+            cursor.execute("SELECT 1 FROM user WHERE username = %s LIMIT 1", (username,))
+            taken = cursor.fetchone() is not None
+        if taken:
+            user_filter_counts["taken"] += 1
+        elif bloom is not None:
+            user_filter_counts["false_positives"] += 1
+        return jsonify({"username": not taken}), 200
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/user-filter', methods=['GET'])
+def user_filter_stats():
+    bloom = user_filters["filter"]
+    return jsonify({"version": user_filters["version"], "rebuilding": user_filters["rebuilding"],
+                    **user_filter_counts, "filter": bloom.stats() if bloom else None}), 200
+
 #insert user
 @app.post("/api/users")
 def create_user():
@@ -723,58 +1475,48 @@ def create_user():
         if not is_valid:
             return jsonify({"message": message}), 400
         
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CALL CheckUserExists(%s, %s, %s, @exists_flag, @existing_user_id);
-        """, (data.get("email"), data.get("Phone"), data.get("username")))
-
-        cursor.execute("SELECT @exists_flag, @existing_user_id")
-        exists_flag, existing_user_id = cursor.fetchone()
-        
-        if exists_flag == 1:
-            cursor.close()
-            conn.close()
-            return jsonify({"message": "User with this email, username, or phone number already exists"}), 409
-
         # Hash password if plain password provided
-        password_field = data.get("password") or data.get("password_hash")
         password_hash = hash_password(password_field)
         
+        # Duplicates are rejected by the unique keys on username, email and Phone
         sql = """
             INSERT INTO user (username, password_hash, email, Phone, Interest_1, Interest_2, Interest_3)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
 
-        cursor.execute(sql, (
-            data["username"],
-            password_hash,
-            data.get("email"),
-            data.get("Phone"),
-            data.get("Interest_1"),
-            data.get("Interest_2"),
-            data.get("Interest_3")
-        ))
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute(sql, (
+                    data["username"],
+                    password_hash,
+                    data.get("email"),
+                    data.get("Phone"),
+                    data.get("Interest_1"),
+                    data.get("Interest_2"),
+                    data.get("Interest_3")
+                ))
 
-        conn.commit()
-        
-        log_audit(
-            user_id=None,
-            username=data["username"],
-            operation_type="CREATE_USER",
-            new_values={
-                "username": data["username"],
-                "email": data.get("email"),
-                "phone": data.get("Phone")
-            }
-        )
-        
-        cursor.close()
-        conn.close()
+            log_audit(
+                user_id=None,
+                username=data["username"],
+                operation_type="CREATE_USER",
+                new_values={
+                    "username": data["username"],
+                    "email": data.get("email"),
+                    "phone": data.get("Phone")
+                }
+            )
+            bump_catalog('users')
+        refresh_user_filters(data["username"])
 
         return jsonify({"message": "User created successfully."}), 201
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Error as e:
+        field = duplicate_user_field(e)
+        if field:
+            return jsonify({"message": "User with this email, username, or phone number already exists",
+                            "field": field}), 409
         print(f"Database error: {str(e)}")
         return jsonify({"message": f"Database error: {str(e)}"}), 500
     except Exception as e:
@@ -783,18 +1525,15 @@ def create_user():
 
 #update user
 @app.put("/api/users/<int:user_id>")
+@user_token_required
 def update_user(user_id):
     data = request.json
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("SELECT * FROM user WHERE ID = %s", (user_id,))
-        old_user = cursor.fetchone()
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT * FROM user WHERE ID = %s", (user_id,))
+            old_user = cursor.fetchone()
         
         if not old_user:
-            cursor.close()
-            conn.close()
             return jsonify({"error": "User not found"}), 404
         
         # Handle password update with validation and hashing
@@ -803,8 +1542,6 @@ def update_user(user_id):
             password_field = data.get("password") or data.get("password_hash")
             is_valid, message = validate_password_strength(password_field)
             if not is_valid:
-                cursor.close()
-                conn.close()
                 return jsonify({"message": message}), 400
             password_to_update = hash_password(password_field)
 
@@ -820,74 +1557,85 @@ def update_user(user_id):
             WHERE ID = %s
         """
 
-        cursor.execute(sql, (
-            data["username"],
-            password_to_update,
-            data.get("email"),
-            data.get("Phone"),
-            data.get("Interest_1"),
-            data.get("Interest_2"),
-            data.get("Interest_3"),
-            user_id
-        ))
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute(sql, (
+                    data["username"],
+                    password_to_update,
+                    data.get("email"),
+                    data.get("Phone"),
+                    data.get("Interest_1"),
+                    data.get("Interest_2"),
+                    data.get("Interest_3"),
+                    user_id
+                ))
 
-        conn.commit()
-        
-        log_audit(
-            user_id=user_id,
-            username=old_user["username"],
-            operation_type="UPDATE_USER",
-            old_values={
-                "username": old_user["username"],
-                "email": old_user["email"],
-                "phone": old_user["Phone"]
-            },
-            new_values={
-                "username": data["username"],
-                "email": data.get("email"),
-                "phone": data.get("Phone")
-            }
-        )
-        
-        cursor.close()
-        conn.close()
+            log_audit(
+                user_id=user_id,
+                username=old_user["username"],
+                operation_type="UPDATE_USER",
+                old_values={
+                    "username": old_user["username"],
+                    "email": old_user["email"],
+                    "phone": old_user["Phone"]
+                },
+                new_values={
+                    "username": data["username"],
+                    "email": data.get("email"),
+                    "phone": data.get("Phone")
+                }
+            )
+            bump_catalog('users')
+        refresh_user_filters(data["username"])
+
+        new_interests = [data.get(f"Interest_{i}") for i in (1, 2, 3)]
+        if new_interests != [old_user[f"Interest_{i}"] for i in (1, 2, 3)]:
+            refresh_materialized_user(user_id, new_interests)
 
         return jsonify({"message": "User updated successfully."}), 200
 
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Error as e:
+        field = duplicate_user_field(e)
+        if field:
+            return jsonify({"error": "Another user already has this email, username, or phone number",
+                            "field": field}), 409
         return jsonify({"error": str(e)}), 500
 
 #delete user
 @app.delete("/api/users/<int:user_id>")
+@user_token_required
 def delete_user(user_id):
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("SELECT * FROM user WHERE ID = %s;", (user_id,))
-        user_data = cursor.fetchone()
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT * FROM user WHERE ID = %s;", (user_id,))
+            user_data = cursor.fetchone()
         
         if not user_data:
-            cursor.close()
-            conn.close()
             return jsonify({"error": "User not found"}), 404
         
-        cursor.execute("DELETE FROM user WHERE ID = %s;", (user_id,))
-        conn.commit()
-        
-        log_audit(
-            user_id=user_id,
-            username=user_data["username"],
-            operation_type="DELETE_USER",
-            old_values={
-                "username": user_data["username"],
-                "email": user_data["email"],
-                "phone": user_data["Phone"]
-            }
-        )
-        
-        cursor.close()
-        conn.close()
+        with transaction():
+            with db_cursor() as cursor:
+                cursor.execute("DELETE FROM user WHERE ID = %s;", (user_id,))
+
+            log_audit(
+                user_id=user_id,
+                username=user_data["username"],
+                operation_type="DELETE_USER",
+                old_values={
+                    "username": user_data["username"],
+                    "email": user_data["email"],
+                    "phone": user_data["Phone"]
+                }
+            )
+            bump_catalog('users')
+        # The cascade took the user's favorites with it; other workers drop their feed
+        calendar_feeds.pop(user_id)
+        favorites_changed(user_id)
+        # The deleted name stays in the filters (a query confirms it is free)
+        refresh_user_filters()
+
         return jsonify({"message": "User deleted successfully."}), 200
     except Error as e:
         return jsonify({"error": str(e)}), 500
@@ -904,12 +1652,9 @@ def verify_login():
         if check_rate_limit(login_input):
             return jsonify({"message": "Too many failed login attempts. Please try again in 15 minutes."}), 429
         
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM user WHERE username = %s OR email = %s", (login_input, login_input))
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT * FROM user WHERE username = %s OR email = %s", (login_input, login_input))
+            user = cursor.fetchone()
 
         if user and verify_password(password, user["password_hash"]):
             log_login_attempt(login_input, True)
@@ -919,7 +1664,7 @@ def verify_login():
                 operation_type="LOGIN_SUCCESS"
             )
             
-            return jsonify({"message": "Login successful.", "user": user}), 200
+            return jsonify({"message": "Login successful.", "user": user, **issue_session_token(user["ID"])}), 200
         else:
             log_login_attempt(login_input, False)
             log_audit(
@@ -930,6 +1675,8 @@ def verify_login():
             
             return jsonify({"message": "Invalid username/email or password."}), 401
 
+    except PasswordHasherBusy as e:
+        return busy_response(e)
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
@@ -937,68 +1684,264 @@ def verify_login():
 # PERSONALIZED RECOMMENDATIONS
 #-------------------
 
+# Interest index
+# Recommendations used to fetch every conference and substring-test each
+# interest against every Title/Descrip. The inverted index keeps the same
+# matching rules but only tests conferences sharing tokens with the
+# interest. It is built on first use, rebuilt when the 'conferences'
+# catalog version moves (or after INTEREST_INDEX_MAX_AGE seconds), and
+# patched in place when this process writes a conference.
+INTEREST_INDEX_MAX_AGE = float(os.getenv("INTEREST_INDEX_MAX_AGE", "300"))
+INTEREST_INDEX_SQL = "SELECT CID, Title, Descrip, Start_Date, End_Date FROM Conferences"
+
+# Ranked mode refits wait TFIDF_REFIT_DELAY seconds after a change
+TFIDF_REFIT_DELAY = float(os.getenv("TFIDF_REFIT_DELAY", "5"))
+
+interest_index = InterestIndex()
+# Ranked mode: TF-IDF vectors over the same rows, scored with NumPy
+tfidf_recommender = TfidfRecommender()
+interest_index_build_lock = threading.Lock()
+tfidf_refit = {"timer": None}
+tfidf_refit_lock = threading.Lock()
+
+def load_interest_index_rows():
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(INTEREST_INDEX_SQL + " ORDER BY CID")
+        return cursor.fetchall()
+
+def current_model(model):
+    """`model` (interest_index or tfidf_recommender), rebuilt from MySQL first if it is stale.
+    A loaded TF-IDF model is refit in the background instead and keeps serving meanwhile."""
+    version = catalog_versions.get('conferences')
+    if model.is_stale(version, INTEREST_INDEX_MAX_AGE):
+        if model is tfidf_recommender and model.loaded:
+            schedule_tfidf_refit()
+            return model
+        # One thread rebuilds; the others wait and then use its result
+        with interest_index_build_lock:
+            if model.is_stale(version, INTEREST_INDEX_MAX_AGE):
+                model.rebuild(load_interest_index_rows(), version)
+    return model
+
+def schedule_tfidf_refit():
+    """Refit the ranked model on a background thread TFIDF_REFIT_DELAY seconds from
+    now. Changes within the delay share one refit; requests keep ranking with the
+    current weights until the new model is swapped in."""
+    if not tfidf_recommender.loaded:
+        return  # first use fits it anyway
+    with tfidf_refit_lock:
+        if tfidf_refit["timer"] is not None:
+            return
+        timer = threading.Timer(TFIDF_REFIT_DELAY, refit_tfidf)
+        timer.daemon = True
+        tfidf_refit["timer"] = timer
+        timer.start()
+
+def refit_tfidf():
+    with tfidf_refit_lock:
+        tfidf_refit["timer"] = None
+    try:
+        # Version first: a change landing during the read only makes the next refit come sooner
+        version = catalog_versions.get('conferences')
+        tfidf_recommender.rebuild(load_interest_index_rows(), version)
+    except Exception as e:
+        logging.error('TF-IDF refit failed: %s', e)
+
+def current_interest_index():
+    return current_model(interest_index)
+
+# Materialized recommendations
+# Substring matches stored per user in UserRecommendations, so a dashboard
+# load is one indexed read. A user is computed from MySQL on first read and
+# again when update_user() changes their interests; conferences inserted or
+# updated since the last sync (by Conferences.updated_at) are re-matched
+# against stored users once per catalog version; deletes cascade in MySQL.
+materialized_synced_version = None
+
+def sync_materialized_recommendations():
+    """Re-match conferences changed since the last sync against stored users"""
+    global materialized_synced_version
+    version = catalog_versions.get('conferences')
+    if version is not None and version == materialized_synced_version:
+        return
+    with transaction():
+        with db_cursor() as cursor:
+            added = sync_changed_conferences(cursor)
+    if added:
+        logging.info('Materialized recommendations: %s rows for changed conferences', added)
+    materialized_synced_version = version
+
+def materialize_user_recommendations(user_id):
+    """Compute and store a user's recommendations on first read; None if no such user.
+    Reads Conferences in the same transaction that orders it against the sync
+    watermark, not the in-memory index, which may be behind it."""
+    with transaction():
+        with db_cursor() as cursor:
+            cursor.execute("SELECT Interest_1, Interest_2, Interest_3 FROM user WHERE ID = %s", (user_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return materialize_user(cursor, user_id, [i.strip() for i in row if i and i.strip()])
+
+def refresh_materialized_user(user_id, interests):
+    """Recompute a stored user's recommendations after their interests changed.
+    Users never read in materialized mode are left for their first read."""
+    interests = [i.strip() for i in interests if i and i.strip()]
+    try:
+        with transaction():
+            with db_cursor() as cursor:
+                materialize_user(cursor, user_id, interests, only_if_stored=True)
+    except Error as e:
+        print(f"Materialized recommendations refresh error: {str(e)}")
+
+# ranked: best `limit` conferences by TF-IDF score of the user's interests
+# substring: every conference containing an interest (the original behavior)
+# materialized: the substring results, read from UserRecommendations
+# fulltext: upcoming conferences ranked by MySQL's FULLTEXT index, nothing loaded in Python
+RECOMMENDATION_MODES = ("ranked", "substring", "materialized", "fulltext")
+RECOMMENDATION_MODE = os.getenv("RECOMMENDATION_MODE", "ranked")
+RECOMMENDATION_LIMIT = int(os.getenv("RECOMMENDATION_LIMIT", "20"))
+MAX_RECOMMENDATIONS = 100
+
+def parse_recommendation_args(args):
+    """Returns (mode, limit); raises ValueError with a message suitable for a 400 response.
+    limit is None in the unranked modes unless the client asked for one."""
+    mode = args.get('mode', RECOMMENDATION_MODE).lower()
+    if mode not in RECOMMENDATION_MODES:
+        raise ValueError(f"'mode' must be one of: {', '.join(RECOMMENDATION_MODES)}")
+
+    limit = RECOMMENDATION_LIMIT if mode in ("ranked", "fulltext") else None
+    if args.get('limit'):
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError("'limit' must be an integer")
+        if not 1 <= limit <= MAX_RECOMMENDATIONS:
+            raise ValueError(f"'limit' must be between 1 and {MAX_RECOMMENDATIONS}")
+    return mode, limit
+
+def fulltext_recommendations(interests, limit):
+    """Top `limit` upcoming conferences for `interests`, matched and ranked in MySQL"""
+    sql, params = fulltext_recommendation_query(interests, limit, FT_MIN_TOKEN_SIZE)
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    for row in rows:
+        row['Score'] = float(row['Score'])
+        row['Matched_Interests'] = [interest for i, interest in enumerate(interests)
+                                    if row.pop(f"matched_{i}")]
+    return rows
+
+def recommendation_etag(mode, limit, interests):
+    """Strong ETag for one user's recommendations: the conferences catalog version
+    and that user's interests, so other users' edits leave it alone. None when
+    the version is unknown, and for fulltext, whose Start_Date >= NOW() filter
+    changes the result as time passes."""
+    version = catalog_versions.get('conferences')
+    if version is None or mode == "fulltext":
+        return None
+    tag_source = f"{version}|{mode}|{limit}|{json.dumps(interests)}"
+    return hashlib.sha1(tag_source.encode('utf-8')).hexdigest()[:20]
+
 @app.route('/api/users/<int:user_id>/recommendations', methods=['GET'])
+@user_token_required
 def get_user_recommendations(user_id):
-    """Get personalized conference recommendations based on user interests"""
+    """Get personalized conference recommendations based on user interests.
+    ?mode=ranked|substring|materialized|fulltext, ?limit=N"""
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        mode, limit = parse_recommendation_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    try:
         # Get user interests
-        cursor.execute(
-            "SELECT Interest_1, Interest_2, Interest_3 FROM user WHERE ID = %s",
-            (user_id,)
-        )
-        row = cursor.fetchone()
-        
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                "SELECT Interest_1, Interest_2, Interest_3 FROM user WHERE ID = %s",
+                (user_id,)
+            )
+            row = cursor.fetchone()
+
         if not row:
-            cursor.close()
-            conn.close()
             return jsonify({"error": "User not found"}), 404
-        
+
         # Extract and filter interests
         interests = [row.get("Interest_1"), row.get("Interest_2"), row.get("Interest_3")]
         interests = [i.strip() for i in interests if i and i.strip()]
-        
-        if not interests:
-            cursor.close()
-            conn.close()
-            return jsonify({"recommendations": []}), 200
 
-        # Fetch all conferences
-        cursor.execute("SELECT CID, Title, Descrip, Start_Date, End_Date FROM Conferences")
-        conferences = cursor.fetchall()
-        
-        # Match conferences with user interests
-        matched_conferences = []
-        for conf in conferences:
-            title = conf.get("Title", "").lower()
-            description = conf.get("Descrip", "").lower()
-            matched_interests = []
-            
-            for interest in interests:
-                interest_lower = interest.lower()
-                if interest_lower in title or interest_lower in description:
-                    matched_interests.append(interest)
-            
-            # If any interests matched, add this conference to results
-            if matched_interests:
-                conf['Matched_Interests'] = matched_interests
-                matched_conferences.append(conf)
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({"recommendations": matched_conferences}), 200
-        
+        etag = recommendation_etag(mode, limit, interests)
+        if etag is None:
+            return recommendations_for(user_id, mode, limit, interests)
+        # A matching If-None-Match skips the matching (and its queries) entirely
+        return etag_response(etag, lambda: recommendations_for(user_id, mode, limit, interests))
+
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+def recommendations_for(user_id, mode, limit, interests):
+    if not interests:
+        return jsonify({"recommendations": []}), 200
+
+    if mode == "materialized":
+        sync_materialized_recommendations()
+        with db_cursor(dictionary=True) as cursor:
+            stored = read_user_recommendations(cursor, user_id)
+        if stored is None:
+            stored = materialize_user_recommendations(user_id)
+            if stored is None:
+                return jsonify({"error": "User not found"}), 404
+        return jsonify({"recommendations": stored[:limit]}), 200
+
+    if mode == "ranked":
+        matched_conferences = current_model(tfidf_recommender).recommend(interests, limit)
+    elif mode == "fulltext":
+        matched_conferences = fulltext_recommendations(interests, limit)
+    else:
+        # Match conferences with user interests through the inverted index
+        matched_conferences = current_interest_index().match(interests)[:limit]
+
+    return jsonify({"recommendations": matched_conferences}), 200
+
+@app.route('/api/admin/recommendations/batch', methods=['GET'])
+def batch_recommendations():
+    """Substring-mode recommendations for every user (or ?user_ids=1,2,3), streamed as
+    NDJSON: one {"user_id", "recommendations"} line per user, then a {"summary"} line
+    with users/second."""
+    user_ids = None
+    if request.args.get('user_ids'):
+        try:
+            user_ids = sorted({int(part) for part in request.args['user_ids'].split(',') if part.strip()})
+        except ValueError:
+            return jsonify({"error": "'user_ids' must be a comma-separated list of integers"}), 400
+
+    stats = {}
+    results = get_batch_conference_recommendations(user_ids, stats)
+    try:
+        # Run the loading step now so database errors still get a proper 500
+        first = next(results, None)
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
+    def generate():
+        if first is not None:
+            yield app.json.dumps(first) + '\n'
+        try:
+            for result in results:
+                yield app.json.dumps(result) + '\n'
+        except Error as e:
+            logging.error("Batch recommendations stream failed: %s", e)
+            yield ndjson_error(e)
+            return
+        yield app.json.dumps({"summary": stats}) + '\n'
+
+    return app.response_class(generate(), mimetype=NDJSON_MIMETYPE)
+
 #-------------------
 # FAVORITES/STARRED CONFERENCES
 #-------------------
 
 @app.route('/api/users/<int:user_id>/favorites', methods=['GET'])
+@user_token_required
 def get_user_favorites(user_id):
     """Get all starred conferences for a user"""
     try:
@@ -1036,6 +1979,7 @@ def get_user_favorites(user_id):
 
 
 @app.route('/api/users/<int:user_id>/favorites/<int:conference_id>', methods=['POST'])
+@user_token_required
 def add_favorite(user_id, conference_id):
     """Add a conference to user's favorites"""
     try:
@@ -1059,11 +2003,15 @@ def add_favorite(user_id, conference_id):
             INSERT IGNORE INTO UserFavorites (user_ID, conference_ID) 
             VALUES (%s, %s)
         """, (user_id, conference_id))
+        added = cursor.rowcount > 0
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        if added:
+            refresh_calendar_favorite(user_id, conference_id, favorites_changed(user_id))
+        
         return jsonify({"message": "Conference added to favorites"}), 201
         
     except Error as e:
@@ -1071,6 +2019,7 @@ def add_favorite(user_id, conference_id):
 
 
 @app.route('/api/users/<int:user_id>/favorites/<int:conference_id>', methods=['DELETE'])
+@user_token_required
 def remove_favorite(user_id, conference_id):
     """Remove a conference from user's favorites"""
     try:
@@ -1081,16 +2030,407 @@ def remove_favorite(user_id, conference_id):
             DELETE FROM UserFavorites 
             WHERE user_ID = %s AND conference_ID = %s
         """, (user_id, conference_id))
+        removed = cursor.rowcount > 0
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        if removed:
+            refresh_calendar_favorite(user_id, conference_id, favorites_changed(user_id))
+        
         return jsonify({"message": "Conference removed from favorites"}), 200
         
     except Error as e:
         return jsonify({"error": str(e)}), 500
 
+#-------------------
+# CALENDAR FEEDS
+#-------------------
+
+# GET /api/users/<id>/calendar.ics: the user's favorited conferences and their
+# paper deadlines. Feeds are cached per user and patched in place when this
+# process changes a favorite or paper. A conference change, or a paper change
+# made elsewhere (another worker, an import), moves the catalog versions and the
+# cache starts over; a favorite changed elsewhere only drops that user's feed,
+# found through the FavoriteChanges log. A poll with a matching If-None-Match
+# gets a 304 without touching MySQL.
+CALENDAR_CACHE_SIZE = int(os.getenv("CALENDAR_CACHE_SIZE", "10000"))
+CALENDAR_CACHE_TTL = float(os.getenv("CALENDAR_CACHE_TTL", "3600"))
+# FavoriteChanges rows are pruned once every feed cached before them has expired
+FAVORITE_CHANGES_KEEP = max(86400, 2 * CALENDAR_CACHE_TTL)
+
+calendar_feeds = TTLCache(CALENDAR_CACHE_SIZE, CALENDAR_CACHE_TTL)
+# Last 'favorites' catalog version and FavoriteChanges ID this process has applied
+calendar_favorites = {"version": None, "change_id": None}
+calendar_favorites_lock = threading.Lock()
+
+CALENDAR_CONFERENCE_SQL = """
+    SELECT c.CID, c.Title, c.Descrip, c.Start_Date, c.End_Date, c.link,
+           l.City, l.State, l.Country
+    FROM Conferences c
+    LEFT JOIN Location l ON l.LID = c.LID
+"""
+CALENDAR_PAPER_SQL = "SELECT PID, TypeOfPaper, Topic, DueDate, CID FROM Papers"
+
+def calendar_tag():
+    """Catalog versions a cached feed was built against; None if any is unknown"""
+    versions = tuple(catalog_versions.get(scope) for scope in ('conferences', 'papers'))
+    return None if None in versions else versions
+
+def favorites_changed(user_id):
+    """Log a committed change to `user_id`'s favorites and bump the catalog so
+    other workers drop that user's cached feed. Returns the log row's ID (None
+    if it couldn't be written; other workers then clear their whole cache)."""
+    change_id = None
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("INSERT INTO FavoriteChanges (user_ID) VALUES (%s)", (user_id,))
+            change_id = cursor.lastrowid
+            cursor.execute("DELETE FROM FavoriteChanges WHERE changed_at < NOW() - INTERVAL %s SECOND LIMIT 1000",
+                           (int(FAVORITE_CHANGES_KEEP),))
+    except Error as e:
+        print(f"Favorite change log error: {str(e)}")
+    # After the log row commits, so a worker that sees the new version also sees the row
+    bump_catalog('favorites')
+    return change_id
+
+def sync_calendar_favorites():
+    """Drop cached feeds whose favorites another process changed. Returns False
+    when the changes can't be tracked and the cache shouldn't be used."""
+    version = catalog_versions.get('favorites')
+    if version is None:
+        return False
+    with calendar_favorites_lock:
+        if version == calendar_favorites["version"]:
+            return True
+        try:
+            with db_cursor() as cursor:
+                if calendar_favorites["change_id"] is None:
+                    changes = None
+                    cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM FavoriteChanges")
+                    change_id = cursor.fetchone()[0]
+                else:
+                    cursor.execute("""
+                        SELECT user_ID, MAX(ID) FROM FavoriteChanges
+                        WHERE ID > %s GROUP BY user_ID
+                    """, (calendar_favorites["change_id"],))
+                    changes = cursor.fetchall()
+                    change_id = max([calendar_favorites["change_id"]] + [last for _, last in changes])
+        except Error as e:
+            print(f"Calendar favorites sync error: {str(e)}")
+            calendar_feeds.clear()
+            calendar_favorites.update(version=None, change_id=None)
+            return False
+        if changes is None:
+            # Nothing applied yet, so nothing cached can be trusted
+            calendar_feeds.clear()
+        else:
+            for user_id, last in changes:
+                feed = calendar_feeds.get(user_id)
+                if feed is not None and feed.favorites_change < last:
+                    calendar_feeds.pop(user_id)
+        calendar_favorites.update(version=version, change_id=change_id)
+    return True
+
+def load_calendar_feed(user_id):
+    """The user's feed, or None if there is no such user"""
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT 1 FROM user WHERE ID = %s", (user_id,))
+        if cursor.fetchone() is None:
+            return None
+        # Read first: any later change to these favorites has a higher ID
+        cursor.execute("SELECT COALESCE(MAX(ID), 0) AS last FROM FavoriteChanges")
+        favorites_change = cursor.fetchone()["last"]
+        cursor.execute(CALENDAR_CONFERENCE_SQL + """
+            JOIN UserFavorites f ON f.conference_ID = c.CID
+            WHERE f.user_ID = %s
+        """, (user_id,))
+        conferences = cursor.fetchall()
+        papers = []
+        if conferences:
+            placeholders = ", ".join(["%s"] * len(conferences))
+            cursor.execute(CALENDAR_PAPER_SQL + f" WHERE CID IN ({placeholders})",
+                           [conf["CID"] for conf in conferences])
+            papers = cursor.fetchall()
+    return CalendarFeed(conferences, papers, favorites_change)
+
+def load_calendar_conference(conf_id):
+    """(conference row or None, its papers)"""
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(CALENDAR_CONFERENCE_SQL + " WHERE c.CID = %s", (conf_id,))
+        conf = cursor.fetchone()
+        cursor.execute(CALENDAR_PAPER_SQL + " WHERE CID = %s", (conf_id,))
+        return conf, cursor.fetchall()
+
+def refresh_calendar_favorite(user_id, conf_id, change_id):
+    """Patch a cached feed after the user starred or unstarred `conf_id`;
+    `change_id` is the FavoriteChanges row for it"""
+    feed = calendar_feeds.get(user_id)
+    if feed is None:
+        return
+    if change_id is None:
+        calendar_feeds.pop(user_id)
+        return
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT 1 FROM UserFavorites WHERE user_ID = %s AND conference_ID = %s",
+                           (user_id, conf_id))
+            starred = cursor.fetchone() is not None
+            # A change from another worker since the feed was built isn't in this patch
+            cursor.execute("SELECT 1 FROM FavoriteChanges WHERE user_ID = %s AND ID > %s AND ID < %s LIMIT 1",
+                           (user_id, feed.favorites_change, change_id))
+            missed = cursor.fetchone() is not None
+        if missed:
+            calendar_feeds.pop(user_id)
+            return
+        conf, papers = load_calendar_conference(conf_id) if starred else (None, [])
+    except Error as e:
+        print(f"Calendar refresh error: {str(e)}")
+        calendar_feeds.pop(user_id)
+        return
+    if conf:
+        feed.set_conference(conf, papers)
+    else:
+        feed.remove_conference(conf_id)
+    # The feed now includes this change; sync_calendar_favorites won't drop it for it
+    feed.favorites_change = max(feed.favorites_change, change_id)
+
+def refresh_calendar_paper(paper_id, paper):
+    """Patch cached feeds after a paper write; `paper` is its row, None if deleted"""
+    for feed in calendar_feeds.values():
+        feed.set_paper(paper_id, paper)
+    calendar_feeds.adopt(calendar_tag(), lambda tag: (tag[0], tag[1] + 1))
+
+@app.route('/api/users/<int:user_id>/calendar.ics', methods=['GET'])
+def get_user_calendar(user_id):
+    """iCalendar feed of the user's favorited conferences and paper deadlines"""
+    tag = calendar_tag()
+    cacheable = tag is not None and sync_calendar_favorites()
+    feed = None
+    if cacheable:
+        calendar_feeds.sync(tag)
+        feed = calendar_feeds.get(user_id)
+    if feed is None:
+        try:
+            feed = load_calendar_feed(user_id)
+        except Error as e:
+            return jsonify({"error": str(e)}), 500
+        if feed is None:
+            return jsonify({"error": "User not found"}), 404
+        if cacheable:
+            calendar_feeds.set(user_id, feed)
+
+    body, etag = feed.render()
+    matched = matching_etag(etag)
+    if matched:
+        response = app.response_class(status=304)
+        response.set_etag(matched)
+    else:
+        response = app.response_class(body, mimetype='text/calendar')
+        response.set_etag(etag)
+        response.headers['Content-Disposition'] = f'inline; filename="confspotter-{user_id}.ics"'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/admin/calendar-cache', methods=['GET'])
+def calendar_cache_stats():
+    return jsonify(calendar_feeds.stats()), 200
+
+#-------------------
+# NOTIFICATIONS
+#-------------------
+
+# Emails go through the NotificationOutbox table: producers queue rows with an
+# idempotency key, and the outbox worker sends one email per user over pooled
+# SMTP connections, retrying failures with exponential backoff. For local runs,
+# point SMTP_HOST/SMTP_PORT at a sink: python3 -m aiosmtpd -n -l localhost:1025
+OUTBOX_WORKER = os.getenv("OUTBOX_WORKER", "0") == "1"
+OUTBOX_WORKER_THREADS = int(os.getenv("OUTBOX_WORKER_THREADS", "2"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF = int(os.getenv("OUTBOX_BACKOFF", "30"))
+MAIL_FROM = os.getenv("MAIL_FROM", "ConfSpotter <noreply@confspotter.local>")
+OUTBOX_ENQUEUE_CHUNK = 1000
+
+smtp_pool = SMTPPool(
+    smtp_connector(
+        os.getenv("SMTP_HOST", "localhost"),
+        int(os.getenv("SMTP_PORT", "1025")),
+        username=os.getenv("SMTP_USER") or None,
+        password=os.getenv("SMTP_PASSWORD") or None,
+        starttls=os.getenv("SMTP_STARTTLS", "0") == "1",
+    ),
+    size=OUTBOX_WORKER_THREADS,
+)
+outbox_worker = OutboxWorker(get_connection, smtp_pool, MAIL_FROM, batch_size=OUTBOX_BATCH_SIZE,
+                             max_attempts=OUTBOX_MAX_ATTEMPTS, backoff=OUTBOX_BACKOFF)
+
+def queue_notifications(notifications):
+    """Add (user_id, kind, idempotency_key, payload) tuples to the outbox.
+    Returns how many were new."""
+    queued = 0
+    batch = []
+    with db_cursor() as cursor:
+        for notification in notifications:
+            batch.append(notification)
+            if len(batch) >= OUTBOX_ENQUEUE_CHUNK:
+                queued += enqueue_notifications(cursor, batch)
+                batch = []
+        queued += enqueue_notifications(cursor, batch)
+    if queued:
+        outbox_worker.wake()
+    return queued
+
+@app.route('/api/admin/notifications/recommendations', methods=['POST'])
+def queue_recommendation_digests():
+    """Queue today's recommendation email for every user with matches (?limit=10
+    conferences each). Calling it again the same day queues nothing new."""
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), MAX_RECOMMENDATIONS))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+    today = datetime.now().date().isoformat()
+    stats = {}
+
+    def digests():
+        for result in get_batch_conference_recommendations(stats=stats):
+            if not result["recommendations"]:
+                continue
+            conferences = [{key: conf.get(key) for key in ("CID", "Title", "Start_Date", "Matched_Interests")}
+                           for conf in result["recommendations"][:limit]]
+            yield (result["user_id"], "recommendation", f"recommendations:{result['user_id']}:{today}",
+                   {"conferences": conferences})
+
+    try:
+        queued = queue_notifications(digests())
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify({"queued": queued, "users": stats.get("users", 0)}), 200
+
+@app.route('/api/admin/notifications/stats', methods=['GET'])
+def notification_stats():
+    """Outbox row counts by status, plus this process's worker and SMTP pool counters"""
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT status, COUNT(*) FROM NotificationOutbox GROUP BY status")
+            outbox = {status: count for status, count in cursor.fetchall()}
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+    return jsonify({"outbox": outbox, "worker": dict(outbox_worker.stats),
+                    "smtp": dict(smtp_pool.stats), "worker_running": OUTBOX_WORKER}), 200
+
+if OUTBOX_WORKER:
+    outbox_worker.start(OUTBOX_WORKER_THREADS)
+
+#-------------------
+# DEADLINE REMINDERS
+#-------------------
+
+# Reminders go out DEADLINE_REMINDER_DAYS before each paper's DueDate. The
+# scheduler keeps them in a heap and sleeps until the next one is due; it
+# only re-reads Papers when another process moves the 'papers' catalog
+# version. It is off unless DEADLINE_SCHEDULER=1: turn it on in one process
+# (extra ones only duplicate work; the outbox's idempotency keys drop the
+# repeated reminders), and scripts importing app never start it.
+DEADLINE_SCHEDULER = os.getenv("DEADLINE_SCHEDULER", "0") == "1"
+DEADLINE_REMINDER_DAYS = [int(d) for d in os.getenv("DEADLINE_REMINDER_DAYS", "30,7,1").split(",") if d.strip()]
+DEADLINE_RESYNC_INTERVAL = float(os.getenv("DEADLINE_RESYNC_INTERVAL", "300"))
+
+def load_upcoming_deadlines():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT PID, DueDate FROM Papers WHERE DueDate > NOW()")
+        return cursor.fetchall()
+
+def deadline_reminders_due(reminders):
+    """Scheduler callback: queue a reminder per user, paper and offset that just came
+    due. The outbox worker folds each user's reminders into one email."""
+    # A paper can have several offsets due at once (e.g. after the process was down)
+    days_before = {}
+    for r in reminders:
+        days_before.setdefault(r.pid, []).append(r.offset.days)
+
+    def notifications():
+        for digest in paper_reminder_digests(list(days_before)):
+            for deadline in digest["deadlines"]:
+                payload = {k: v for k, v in deadline.items() if k != "Descrip"}
+                for days in days_before[deadline["PID"]]:
+                    key = f"deadline:{digest['user_id']}:{deadline['PID']}:{deadline['DueDate']:%Y%m%d%H%M}:{days}d"
+                    yield digest["user_id"], "deadline", key, dict(payload, Reminder_Days=days)
+
+    queued = queue_notifications(notifications())
+    logging.info('Deadline reminders: %s reminder(s) due, %s notification(s) queued', len(reminders), queued)
+
+deadline_scheduler = DeadlineScheduler(
+    load_upcoming_deadlines,
+    deadline_reminders_due,
+    version=lambda: catalog_versions.get('papers'),
+    offsets=[timedelta(days=d) for d in DEADLINE_REMINDER_DAYS],
+    resync_interval=DEADLINE_RESYNC_INTERVAL,
+)
+
+def refresh_paper_deadline(paper_id):
+    """Re-read one paper (a Papers PID) into the scheduler and the cached calendar
+    feeds after this process's write has committed"""
+    try:
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(CALENDAR_PAPER_SQL + " WHERE PID = %s", (paper_id,))
+            row = cursor.fetchone()
+    except Error as e:
+        print(f"Deadline scheduler refresh error: {str(e)}")
+        calendar_feeds.clear()
+        return
+    if row:
+        deadline_scheduler.upsert(paper_id, row["DueDate"])
+    else:
+        deadline_scheduler.remove(paper_id)
+    # The scheduler already has this write; don't reload the window for its bump
+    deadline_scheduler.adopt(catalog_versions.get('papers'))
+    refresh_calendar_paper(paper_id, row)
+
+@app.route('/api/admin/deadline-scheduler', methods=['GET'])
+def deadline_scheduler_stats():
+    return jsonify(deadline_scheduler.snapshot()), 200
+
+if DEADLINE_SCHEDULER:
+    deadline_scheduler.start()
+
+#-------------------
+# AUDIT RETENTION
+#-------------------
+
+# AuditLog and LoginAttempts are partitioned by month (SQL/SecurityFeatures.sql).
+# A daily job adds the coming months' partitions and, past the retention
+# period, rolls old months up into SecurityEventRollup and drops them. It
+# needs ALTER on those tables, so it runs from cron
+# (python3 Python/partition_maintenance.py) or from the one app.py process
+# started with PARTITION_MAINTENANCE=1, never from every web worker.
+PARTITION_MAINTENANCE = os.getenv("PARTITION_MAINTENANCE", "0") == "1"
+PARTITION_RETENTION_MONTHS, PARTITION_MONTHS_AHEAD = retention_from_env()
+
+def scheduled_partition_maintenance():
+    try:
+        run_partition_maintenance(get_connection, PARTITION_RETENTION_MONTHS, PARTITION_MONTHS_AHEAD)
+    except Exception as e:
+        logging.exception('Partition maintenance: cannot connect to DB: %s', str(e))
+
+@app.route('/api/admin/partitions', methods=['GET'])
+def get_partition_report():
+    """Partition names, bounds, estimated rows and sizes for the audit tables"""
+    try:
+        with db_cursor() as cursor:
+            return jsonify(partition_report(cursor)), 200
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/admin/partitions/maintenance', methods=['POST'])
+def run_partition_maintenance_now():
+    try:
+        report = run_partition_maintenance(get_connection, PARTITION_RETENTION_MONTHS, PARTITION_MONTHS_AHEAD)
+        return jsonify(report), 200
+    except Error as e:
+        return jsonify({"error": str(e)}), 500
+
 #-------------------
 #BACKUP AND RECOVERY 
 #-------------------
@@ -1117,8 +2457,6 @@ def create_backup_api():
     except Exception as e:
         pass  # ignore errors in health check during backup
     os.makedirs(BACKUP_DIR, exist_ok=True)
-    conn = get_connection()
-    cursor = conn.cursor()
     # sets name of backup using the time it was created
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{DB_NAME}_backup_{timestamp}.sql"
@@ -1195,10 +2533,12 @@ def scheduled_health_check():
 
     try:
         conn = get_connection()
-        if hasattr(conn, 'is_connected') and not conn.is_connected():
+        connected = not hasattr(conn, 'is_connected') or conn.is_connected()
+        # Only needed as a liveness probe; hand it straight back to the pool
+        conn.close()
+        if not connected:
             logging.error('Health check: DB connection object not connected')
             return
-        cursor = conn.cursor()
     except Exception as e:
         logging.exception('Health check: cannot connect to DB: %s', str(e))
         return
@@ -1272,9 +2612,12 @@ def scheduled_health_check():
     logging.debug('Health check: lightweight checks passed')
 
 # scheduler for backups and health checks.  Performs backups every twelve hours.  Performs simple health check every ten minutes.
+# Audit partitions are maintained daily when PARTITION_MAINTENANCE=1.
 with app.app_context():
     scheduler.add_job(scheduled_backup, "interval", hours=12)
     scheduler.add_job(scheduled_health_check, "interval", minutes=10)
+    if PARTITION_MAINTENANCE:
+        scheduler.add_job(scheduled_partition_maintenance, "interval", days=1)
     scheduler.start()
 
 # Entrypoint
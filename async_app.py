@@ -0,0 +1,494 @@
+"""Async (ASGI) serving mode for the ConfSpotter API.
+
+Runs the conference, user, paper, favorites, recommendation and login
+routes on Quart + aiomysql so many concurrent dashboard clients can share a
+few event-loop workers instead of pinning one thread each. The Flask app in
+app.py keeps running side by side for comparison.
+
+Only a subset of app.py's API is served here, and app.py is the reference:
+dates are encoded the same way (ISO-8601 with a UTC offset, via
+Python/json_provider.py), but recommendations only support the default
+substring mode (other ?mode= values get a 400), login returns no session
+token, and there is no conference cache, ETags, compression or background
+audit/rate-limit writers.
+
+Run with:
+    hypercorn async_app:app --bind 0.0.0.0:5002 --workers 2
+"""
+import asyncio
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import aiomysql
+import bcrypt
+from dotenv import load_dotenv
+from quart import Quart, request, jsonify
+
+from Python.json_provider import make_json_provider
+
+load_dotenv()
+
+app = Quart(__name__)
+# Same encoder as app.py so both modes return identical JSON for the shared routes
+app.json = make_json_provider(app, os.getenv("JSON_ENCODER", "orjson"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# bcrypt is CPU bound, so it runs on a small thread pool instead of the event loop
+BCRYPT_THREADS = int(os.getenv("BCRYPT_THREADS", "4"))
+ALLOWED_ORIGIN = "http://localhost:5173"
+ER_DUP_ENTRY = 1062
+# Unique keys in SQL/shell.sql -> request field, as in app.py
+DUPLICATE_USER_KEYS = {"uq_user_username": "username", "uq_user_email": "email", "uq_user_phone": "Phone"}
+
+pool = None
+bcrypt_executor = ThreadPoolExecutor(max_workers=BCRYPT_THREADS, thread_name_prefix="bcrypt")
+
+
+@app.before_serving
+async def open_pool():
+    global pool
+    pool = await aiomysql.create_pool(
+        host=os.getenv("DB_HOST", "localhost"),
+        user=os.getenv("DB_USER", "ConfSpotter"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        password=os.getenv("DB_PASSWORD", "chickenlittle"),
+        db=os.getenv("DB_NAME", "confspotter"),
+        autocommit=True,
+        minsize=1,
+        maxsize=DB_POOL_SIZE,
+        pool_recycle=3600,
+    )
+    # app.py creates this lazily inside the favorites routes; do it once here
+    await execute("""
+        CREATE TABLE IF NOT EXISTS UserFavorites (
+            ID INT AUTO_INCREMENT PRIMARY KEY,
+            user_ID INT NOT NULL,
+            conference_ID INT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_favorite (user_ID, conference_ID),
+            FOREIGN KEY (user_ID) REFERENCES user(ID) ON DELETE CASCADE,
+            FOREIGN KEY (conference_ID) REFERENCES Conferences(CID) ON DELETE CASCADE
+        )
+    """)
+
+
+@app.after_serving
+async def close_pool():
+    pool.close()
+    await pool.wait_closed()
+    bcrypt_executor.shutdown(wait=False)
+
+
+@app.after_request
+async def add_cors_headers(response):
+    # Same policy as flask_cors in app.py: only the Vite dev server may call the API
+    if request.headers.get("Origin") == ALLOWED_ORIGIN and request.path.startswith("/api/"):
+        response.headers["Access-Control-Allow-Origin"] = ALLOWED_ORIGIN
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
+    return response
+
+
+# Helpers
+async def fetch_all(sql, args=None):
+    async with pool.acquire() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, args)
+            return await cursor.fetchall()
+
+
+async def fetch_one(sql, args=None):
+    async with pool.acquire() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, args)
+            return await cursor.fetchone()
+
+
+async def execute(sql, args=None):
+    """Run a single write statement and return the new row id (if any)"""
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, args)
+            return cursor.lastrowid
+
+
+# Same statement as Python/catalog.py bump_catalog_version(), for aiomysql cursors
+BUMP_CATALOG_SQL = """
+    INSERT INTO CatalogVersion (scope, version) VALUES (%s, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+
+async def favorites_changed(user_id):
+    """Log the change and bump the 'favorites' catalog version, in that order, so
+    app.py workers drop this user's cached calendar feed"""
+    await execute("INSERT INTO FavoriteChanges (user_ID) VALUES (%s)", (user_id,))
+    await execute(BUMP_CATALOG_SQL, ("favorites",))
+
+
+def duplicate_user_field(e):
+    """The field a duplicate-key IntegrityError on user clashed on ("user" if the
+    key isn't recognised)"""
+    match = re.search(r"for key '(?:user\.)?(\w+)'", str(e.args[1]) if len(e.args) > 1 else "")
+    return DUPLICATE_USER_KEYS.get(match.group(1), "user") if match else "user"
+
+
+def validate_password_strength(password):
+    """Validate password meets security requirements"""
+    if len(password) < 8:
+        return False, "Password must be at least 8 characters long"
+    if not re.search(r'[A-Z]', password):
+        return False, "Password must contain at least one uppercase letter"
+    if not re.search(r'[a-z]', password):
+        return False, "Password must contain at least one lowercase letter"
+    if not re.search(r'[0-9]', password):
+        return False, "Password must contain at least one number"
+    return True, "Password is valid"
+
+
+async def hash_password(password):
+    """Hash a password using bcrypt without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(
+        bcrypt_executor, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt()
+    )
+    return hashed.decode('utf-8')
+
+
+async def verify_password(password, password_hash):
+    """Verify a password against its hash without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        bcrypt_executor, bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8')
+    )
+
+
+async def write_login_records(cursor, username, success, user_id, audit_username, operation_type):
+    await cursor.execute(
+        "INSERT INTO LoginAttempts (username, success) VALUES (%s, %s)",
+        (username, success),
+    )
+    await cursor.execute(
+        "INSERT INTO AuditLog (user_id, username, operation_type, old_values, new_values) VALUES (%s, %s, %s, %s, %s)",
+        (user_id, audit_username, operation_type, None, None),
+    )
+
+
+async def is_rate_limited(username):
+    fifteen_mins_ago = datetime.now() - timedelta(minutes=15)
+    try:
+        row = await fetch_one("""
+            SELECT COUNT(*) AS failed FROM LoginAttempts
+            WHERE username = %s
+            AND attempt_time > %s
+            AND success = FALSE
+        """, (username, fifteen_mins_ago))
+        return row["failed"] >= 5
+    except Exception as e:
+        print(f"Rate limit check error: {str(e)}")
+        return False
+
+
+def match_interests(conferences, interests):
+    """Same substring matching as get_user_recommendations() in app.py"""
+    matched_conferences = []
+    for conf in conferences:
+        title = (conf.get("Title") or "").lower()
+        description = (conf.get("Descrip") or "").lower()
+        matched_interests = [i for i in interests if i.lower() in title or i.lower() in description]
+        if matched_interests:
+            conf['Matched_Interests'] = matched_interests
+            matched_conferences.append(conf)
+    return matched_conferences
+
+
+# Routes
+@app.route('/', methods=['GET'])
+async def home():
+    return jsonify({"message": "ConfSpotter async API is running!"})
+
+
+@app.route('/api/conferences', methods=['GET'])
+async def get_conferences():
+    try:
+        conferences = await fetch_all("""
+            SELECT CID, Title, Start_Date, End_Date, Descrip, link, LID
+            FROM Conferences
+        """)
+        return jsonify(conferences), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/conferences/<int:conf_id>', methods=['GET'])
+async def get_conference(conf_id):
+    try:
+        conference = await fetch_one("""
+            SELECT
+                c.CID as id,
+                c.Title as name,
+                c.Start_Date as start_date,
+                c.End_Date as end_date,
+                c.Descrip as description,
+                c.link as url,
+                CONCAT_WS(', ', l.City, l.State, l.Country) as location
+            FROM Conferences c
+            LEFT JOIN Location l ON c.LID = l.LID
+            WHERE c.CID = %s
+        """, (conf_id,))
+        if not conference:
+            return jsonify({"error": "Conference not found"}), 404
+        return jsonify(conference), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/login', methods=['POST'])
+async def login():
+    """Login user with password verification"""
+    data = await request.get_json()
+
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
+
+    login_input = data.get("login")  # Can be username or email
+    password = data.get("password")
+
+    if not login_input:
+        return jsonify({"error": "Username or email is required"}), 400
+    if not password:
+        return jsonify({"error": "Password is required"}), 400
+
+    try:
+        if await is_rate_limited(login_input):
+            return jsonify({"error": "Too many failed login attempts. Please try again in 15 minutes."}), 429
+
+        user = await fetch_one(
+            "SELECT * FROM user WHERE username = %s OR email = %s",
+            (login_input, login_input)
+        )
+        success = bool(user) and await verify_password(password, user["password_hash"])
+
+        # Login attempt and audit row go in together, as in app.py
+        async with pool.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor() as cursor:
+                    if success:
+                        await write_login_records(cursor, login_input, True, user["ID"], user["username"], "LOGIN_SUCCESS")
+                    else:
+                        await write_login_records(cursor, login_input, False, None, login_input, "LOGIN_FAILED")
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+        if not success:
+            return jsonify({"error": "Invalid username/email or password"}), 401
+
+        return jsonify({
+            "message": "Login successful",
+            "user": {
+                "id": user["ID"],
+                "username": user["username"],
+                "email": user["email"],
+                "phone": user["Phone"],
+                "interests": [user["Interest_1"], user["Interest_2"], user["Interest_3"]]
+            }
+        }), 200
+
+    except aiomysql.Error as e:
+        print(f"Database error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/signup', methods=['POST'])
+@app.route('/api/register', methods=['POST'])
+async def signup():
+    """Register a new user with password hashing"""
+    data = await request.get_json()
+
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
+    if not data.get("username"):
+        return jsonify({"error": "Username is required"}), 400
+    if not data.get("email"):
+        return jsonify({"error": "Email is required"}), 400
+    if not data.get("password"):
+        return jsonify({"error": "Password is required"}), 400
+    if not data.get("Interest_1"):
+        return jsonify({"error": "At least one Interest is required"}), 400
+
+    is_valid, message = validate_password_strength(data.get("password"))
+    if not is_valid:
+        return jsonify({"error": message}), 400
+
+    try:
+        # Duplicates are rejected by the unique keys on username, email and Phone
+        password_hash = await hash_password(data.get("password"))
+
+        async with pool.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("""
+                        INSERT INTO user (username, password_hash, email, Phone, Interest_1, Interest_2, Interest_3)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, (
+                        data["username"],
+                        password_hash,
+                        data.get("email"),
+                        data.get("Phone"),
+                        data.get("Interest_1"),
+                        data.get("Interest_2"),
+                        data.get("Interest_3")
+                    ))
+                    user_id = cursor.lastrowid
+                    # app.py workers rebuild their username filters on this
+                    await cursor.execute(BUMP_CATALOG_SQL, ("users",))
+                    await cursor.execute("""
+                        INSERT INTO AuditLog (user_id, username, operation_type, old_values, new_values)
+                        VALUES (%s, %s, %s, %s, %s)
+                    """, (
+                        user_id,
+                        data["username"],
+                        "USER_REGISTERED",
+                        None,
+                        json.dumps({"username": data["username"], "email": data.get("email"), "phone": data.get("Phone")})
+                    ))
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+
+        return jsonify({
+            "message": "User registered successfully",
+            "user": {"id": user_id, "username": data["username"], "email": data.get("email")}
+        }), 201
+
+    except aiomysql.IntegrityError as e:
+        if e.args and e.args[0] == ER_DUP_ENTRY:
+            return jsonify({"error": "User with this email, username, or phone number already exists",
+                            "field": duplicate_user_field(e)}), 409
+        print(f"Database error: {str(e)}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+    except aiomysql.Error as e:
+        print(f"Database error: {str(e)}")
+        return jsonify({"error": f"Database error: {str(e)}"}), 500
+
+
+# PAPERS
+@app.get("/api/papers")
+async def get_papers():
+    try:
+        conference_id = request.args.get('conferenceId')
+        if conference_id:
+            papers = await fetch_all("SELECT * FROM Papers WHERE CID = %s;", (conference_id,))
+        else:
+            papers = await fetch_all("SELECT * FROM Papers;")
+        return jsonify(papers), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.get("/api/papers/<int:paper_id>")
+async def get_paper(paper_id):
+    try:
+        paper = await fetch_one("SELECT * FROM Papers WHERE PID = %s;", (paper_id,))
+        return jsonify(paper), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# USERS
+@app.get("/api/users")
+async def get_all_users():
+    try:
+        users = await fetch_all("SELECT * FROM user;")
+        return jsonify(users), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.get("/api/users/<int:user_id>")
+async def get_user(user_id):
+    try:
+        user = await fetch_one("SELECT * FROM user WHERE ID = %s;", (user_id,))
+        return jsonify(user), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# PERSONALIZED RECOMMENDATIONS
+@app.route('/api/users/<int:user_id>/recommendations', methods=['GET'])
+async def get_user_recommendations(user_id):
+    """Get personalized conference recommendations based on user interests"""
+    if request.args.get('mode', 'substring') != 'substring':
+        return jsonify({"error": "Only mode=substring is served by the async app; use app.py"}), 400
+    try:
+        row = await fetch_one(
+            "SELECT Interest_1, Interest_2, Interest_3 FROM user WHERE ID = %s",
+            (user_id,)
+        )
+        if not row:
+            return jsonify({"error": "User not found"}), 404
+
+        interests = [row.get("Interest_1"), row.get("Interest_2"), row.get("Interest_3")]
+        interests = [i.strip() for i in interests if i and i.strip()]
+        if not interests:
+            return jsonify({"recommendations": []}), 200
+
+        conferences = await fetch_all("SELECT CID, Title, Descrip, Start_Date, End_Date FROM Conferences")
+        # The text scan is CPU work; keep it off the event loop
+        matched_conferences = await asyncio.to_thread(match_interests, conferences, interests)
+        return jsonify({"recommendations": matched_conferences}), 200
+
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# FAVORITES/STARRED CONFERENCES
+@app.route('/api/users/<int:user_id>/favorites', methods=['GET'])
+async def get_user_favorites(user_id):
+    """Get all starred conferences for a user"""
+    try:
+        rows = await fetch_all("SELECT conference_ID FROM UserFavorites WHERE user_ID = %s", (user_id,))
+        return jsonify({"favorites": [row['conference_ID'] for row in rows]}), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/users/<int:user_id>/favorites/<int:conference_id>', methods=['POST'])
+async def add_favorite(user_id, conference_id):
+    """Add a conference to user's favorites"""
+    try:
+        await execute(
+            "INSERT IGNORE INTO UserFavorites (user_ID, conference_ID) VALUES (%s, %s)",
+            (user_id, conference_id)
+        )
+        await favorites_changed(user_id)
+        return jsonify({"message": "Conference added to favorites"}), 201
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/users/<int:user_id>/favorites/<int:conference_id>', methods=['DELETE'])
+async def remove_favorite(user_id, conference_id):
+    """Remove a conference from user's favorites"""
+    try:
+        await execute(
+            "DELETE FROM UserFavorites WHERE user_ID = %s AND conference_ID = %s",
+            (user_id, conference_id)
+        )
+        await favorites_changed(user_id)
+        return jsonify({"message": "Conference removed from favorites"}), 200
+    except aiomysql.Error as e:
+        return jsonify({"error": str(e)}), 500
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5002)
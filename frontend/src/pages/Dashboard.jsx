@@ -1,14 +1,18 @@
 import { useEffect, useState } from "react";
+import { useNavigate } from "react-router-dom";
 import ConferenceInfo from "./Fickett_ConferenceInfo";
 import Banner from "../components/Banner";
 
 const Dashboard = () => {
+  const navigate = useNavigate();
   const [conferences, setConferences] = useState([]);
   const [searchTerm, setSearchTerm] = useState("");
   const [favorites, setFavorites] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedConference, setSelectedConference] = useState(null);
   const [recommendedConferences, setRecommendedConferences] = useState([]);
+  const [conferenceDetails, setConferenceDetails] = useState({});
+  const [searchResults, setSearchResults] = useState(null);
 
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
@@ -16,10 +20,24 @@ const Dashboard = () => {
   // Get user ID from localStorage
   const user = JSON.parse(localStorage.getItem("user") || "{}");
   const userId = user.ID;
+  const token = localStorage.getItem("token");
+  const authHeaders = token ? { Authorization: `Bearer ${token}` } : {};
+
+  // Calls on the user's own routes; a 401 means the session token expired or
+  // was rejected, so log out and send the user back to the login page
+  const authFetch = async (url, options = {}) => {
+    const res = await fetch(url, { ...options, headers: { ...authHeaders, ...options.headers } });
+    if (res.status === 401) {
+      localStorage.removeItem("user");
+      localStorage.removeItem("token");
+      navigate("/");
+    }
+    return res;
+  };
 
-  // Load conferences from Flask + MySQL API
+  // Load conferences from Flask + MySQL API (only the columns the cards use)
   useEffect(() => {
-    fetch("http://localhost:5001/api/conferences")
+    fetch("http://localhost:5001/api/conferences?fields=CID,Title,Start_Date")
       .then((res) => {
         if (!res.ok) throw new Error();
         return res.json();
@@ -37,7 +55,7 @@ const Dashboard = () => {
   // Load user's favorites
   useEffect(() => {
     if (userId) {
-      fetch(`http://localhost:5001/api/users/${userId}/favorites`)
+      authFetch(`http://localhost:5001/api/users/${userId}/favorites`)
         .then((res) => {
           if (!res.ok) throw new Error();
           return res.json();
@@ -54,7 +72,7 @@ const Dashboard = () => {
   // Load personalized recommendations
   useEffect(() => {
     if (userId) {
-      fetch(`http://localhost:5001/api/users/${userId}/recommendations`)
+      authFetch(`http://localhost:5001/api/users/${userId}/recommendations`)
         .then((res) => {
           if (!res.ok) throw new Error();
           return res.json();
@@ -68,8 +86,33 @@ const Dashboard = () => {
     }
   }, [userId]);
 
+  // Hydrate starred and recommended cards' details in one batch request
+  useEffect(() => {
+    const ids = [
+      ...new Set([...favorites, ...recommendedConferences.map((c) => c.CID)]),
+    ].filter((id) => !(id in conferenceDetails));
+    if (ids.length === 0) return;
+
+    fetch(`http://localhost:5001/api/conferences?ids=${ids.join(",")}`)
+      .then((res) => {
+        if (!res.ok) throw new Error();
+        return res.json();
+      })
+      .then((data) => {
+        setConferenceDetails((prev) => ({ ...prev, ...data.conferences }));
+      })
+      .catch(() => {
+        console.error("Unable to preload conference details.");
+      });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [favorites, recommendedConferences]);
+
   // Load conference details
   const loadConferenceDetails = async (id) => {
+    if (conferenceDetails[id]) {
+      setSelectedConference(conferenceDetails[id]);
+      return;
+    }
     try {
       const res = await fetch(`http://localhost:5001/api/conferences/${id}`);
       if (!res.ok) throw new Error();
@@ -95,7 +138,7 @@ const Dashboard = () => {
     try {
       if (favorites.includes(CID)) {
         // Remove from favorites
-        const res = await fetch(
+        const res = await authFetch(
           `http://localhost:5001/api/users/${userId}/favorites/${CID}`,
           { method: "DELETE" }
         );
@@ -105,7 +148,7 @@ const Dashboard = () => {
         setSuccess("Removed from starred conferences.");
       } else {
         // Add to favorites
-        const res = await fetch(
+        const res = await authFetch(
           `http://localhost:5001/api/users/${userId}/favorites/${CID}`,
           { method: "POST" }
         );
@@ -121,10 +164,29 @@ const Dashboard = () => {
     }
   };
 
-  // Search filter
-  const filteredConferences = conferences.filter((conf) =>
-    conf.Title.toLowerCase().includes(searchTerm.toLowerCase())
-  );
+  // Server-side full-text search, debounced while typing
+  useEffect(() => {
+    const q = searchTerm.trim();
+    if (!q) {
+      setSearchResults(null);
+      return;
+    }
+    const timer = setTimeout(() => {
+      fetch(
+        `http://localhost:5001/api/conferences/search?q=${encodeURIComponent(q)}&limit=50`
+      )
+        .then((res) => {
+          if (!res.ok) throw new Error();
+          return res.json();
+        })
+        .then((data) => setSearchResults(data.results || []))
+        .catch(() => setSearchResults([]));
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  // Search results when searching, otherwise the full list
+  const filteredConferences = searchResults ?? conferences;
 
   // Starred conferences
   const starredConfs = conferences.filter((conf) =>
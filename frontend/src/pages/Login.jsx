@@ -45,6 +45,13 @@ const Login = () => {
         console.log("Success:", data.message);
         // Store user info in localStorage if needed
         localStorage.setItem("user", JSON.stringify(data.user));
+        // Signed session token, sent on the user's own API calls (none when
+        // the server has no SESSION_SIGNING_KEYS)
+        if (data.token) {
+          localStorage.setItem("token", data.token);
+        } else {
+          localStorage.removeItem("token");
+        }
         setLogin("");
         setPassword("");
         goToDashboard();
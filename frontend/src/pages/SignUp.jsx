@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import axios from "axios";
 
@@ -15,6 +15,25 @@ const Signup = () => {
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
   const [loading, setLoading] = useState(false);
+  // { username: bool } from /api/users/available; missing = not checked.
+  // Emails aren't checked ahead of time; a taken one comes back as a 409.
+  const [available, setAvailable] = useState({});
+
+  // Check username availability once typing pauses
+  useEffect(() => {
+    const name = username.trim();
+    if (!name) {
+      setAvailable({});
+      return;
+    }
+    const timer = setTimeout(() => {
+      axios
+        .get("http://localhost:5001/api/users/available", { params: { username: name } })
+        .then((res) => setAvailable(res.data))
+        .catch(() => setAvailable({}));
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [username]);
 
   function goToLogin() {
     navigate("/");
@@ -61,7 +80,9 @@ const Signup = () => {
       }, 1500);
     } catch (err) {
       console.error("Signup error:", err);
-      if (err.response?.data?.message) {
+      if (err.response?.status === 409 && err.response.data?.field === "email") {
+        setError("An account with this email already exists.");
+      } else if (err.response?.data?.message) {
         setError(err.response.data.message);
       } else if (err.message) {
         setError(`Network error: ${err.message}`);
@@ -90,6 +111,9 @@ const Signup = () => {
             required
             className="border border-gray-300 rounded-lg px-4 py-2 focus:outline-none focus:ring-2 focus:ring-blue-400"
           />
+          {available.username === false && (
+            <p className="text-red-500 text-sm -mt-4">Username is already taken.</p>
+          )}
           <input
             type="email"
             placeholder="Email"
@@ -0,0 +1,5 @@
+# Tests import the backend helpers the way app.py does: from Python.<module>
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,23 @@
+from Python.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(5000, 0.01)
+    names = [f"user{i}" for i in range(5000)]
+    bloom.update(names)
+    assert all(name in bloom for name in names)
+    assert bloom.full
+
+
+def test_false_positive_rate_is_near_the_target():
+    bloom = BloomFilter(5000, 0.01)
+    bloom.update(f"user{i}" for i in range(5000))
+    probes = [f"other{i}" for i in range(20000)]
+    rate = sum(1 for name in probes if name in bloom) / len(probes)
+    assert rate < 0.02
+
+
+def test_empty_filter_says_no():
+    bloom = BloomFilter(10)
+    assert "anyone" not in bloom
+    assert not bloom.full
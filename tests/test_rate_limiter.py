@@ -0,0 +1,157 @@
+import pytest
+
+from Python.rate_limiter import RedisSlidingWindowLimiter, SlidingWindowLimiter
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The few sorted-set and string commands RedisSlidingWindowLimiter uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.results = []
+
+    def zadd(self, key, mapping):
+        self.redis.data.setdefault(key, {}).update(mapping)
+        self.results.append(len(mapping))
+
+    def zremrangebyscore(self, key, low, high):
+        members = self.redis.data.get(key, {})
+        gone = [m for m, score in members.items() if score <= high]
+        for member in gone:
+            del members[member]
+        self.results.append(len(gone))
+
+    def zcard(self, key):
+        self.results.append(len(self.redis.data.get(key, {})))
+
+    def expire(self, key, seconds):
+        self.results.append(True)
+
+    def execute(self):
+        results, self.results = self.results, []
+        return results
+
+
+@pytest.fixture(params=["memory", "redis"])
+def limiter_and_clock(request):
+    clock = Clock()
+    if request.param == "memory":
+        return SlidingWindowLimiter(limit=3, window=60, clock=clock), clock
+    return RedisSlidingWindowLimiter(FakeRedis(), limit=3, window=60, clock=clock), clock
+
+
+def test_locks_out_at_the_limit(limiter_and_clock):
+    limiter, clock = limiter_and_clock
+    for _ in range(2):
+        limiter.record_failure("alice")
+        clock.now += 1
+    assert not limiter.is_limited("alice")
+    limiter.record_failure("alice")
+    assert limiter.is_limited("alice")
+    assert not limiter.is_limited("bob")
+
+
+def test_failure_ages_out_exactly_at_the_window(limiter_and_clock):
+    limiter, clock = limiter_and_clock
+    first = clock.now
+    for offset in (0, 10, 20):
+        clock.now = first + offset
+        limiter.record_failure("alice")
+    clock.now = first + 59.999
+    assert limiter.is_limited("alice")
+    # The oldest failure is now exactly `window` old and no longer counts
+    clock.now = first + 60
+    assert not limiter.is_limited("alice")
+
+
+def test_window_slides_rather_than_resetting(limiter_and_clock):
+    limiter, clock = limiter_and_clock
+    first = clock.now
+    for offset in (0, 50, 55):
+        clock.now = first + offset
+        limiter.record_failure("alice")
+    clock.now = first + 61
+    assert not limiter.is_limited("alice")
+    limiter.record_failure("alice")
+    # 50, 55 and 61 are all inside the window ending at 61
+    assert limiter.is_limited("alice")
+
+
+def test_seed_counts_old_failures_still_in_the_window(limiter_and_clock):
+    limiter, clock = limiter_and_clock
+    limiter.seed([("alice", clock.now - 100), ("alice", clock.now - 30), ("alice", clock.now - 20)])
+    assert not limiter.is_limited("alice")
+    limiter.record_failure("alice")
+    assert limiter.is_limited("alice")
+
+
+def test_memory_sweep_drops_idle_keys():
+    clock = Clock()
+    limiter = SlidingWindowLimiter(limit=3, window=60, max_keys=2, clock=clock)
+    limiter.record_failure("alice")
+    limiter.record_failure("bob")
+    clock.now += 61
+    limiter.record_failure("carol")
+    assert limiter.stats()["keys"] == 1
+
+
+def test_memory_max_keys_evicts_least_recent_failures():
+    clock = Clock()
+    limiter = SlidingWindowLimiter(limit=2, window=60, max_keys=2, clock=clock)
+    limiter.record_failure("alice")
+    limiter.record_failure("bob")
+    limiter.record_failure("alice")
+    limiter.record_failure("carol")
+    assert limiter.stats()["keys"] == 2
+    assert limiter.is_limited("alice")
+    limiter.record_failure("bob")
+    assert not limiter.is_limited("bob")
+
+
+def test_redis_seed_runs_once_per_redis():
+    clock = Clock()
+    redis = FakeRedis()
+    failures = [("alice", clock.now - 10), ("alice", clock.now - 5)]
+    RedisSlidingWindowLimiter(redis, limit=3, window=60, clock=clock).seed(failures)
+    # A second worker (or a restart) seeding later must not count them again
+    clock.now += 120
+    late = RedisSlidingWindowLimiter(redis, limit=3, window=60, clock=clock)
+    late.seed([("alice", clock.now - 10), ("alice", clock.now - 5)])
+    late.record_failure("alice")
+    assert not late.is_limited("alice")
+
+
+def test_redis_errors_fail_open():
+    class Down:
+        def pipeline(self):
+            raise ConnectionError("redis is down")
+
+        def set(self, *args, **kwargs):
+            raise ConnectionError("redis is down")
+
+    limiter = RedisSlidingWindowLimiter(Down(), limit=1, window=60)
+    limiter.record_failure("alice")
+    limiter.seed([("alice", 0)])
+    assert not limiter.is_limited("alice")
@@ -0,0 +1,91 @@
+import base64
+import json
+
+import pytest
+
+from Python.tokens import InvalidToken, TokenSigner, parse_signing_keys
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def signer(spec="k1:secret-one", ttl=3600, clock=None):
+    return TokenSigner(parse_signing_keys(spec), ttl, clock or Clock())
+
+
+def test_issue_and_verify_round_trip():
+    clock = Clock()
+    tokens = signer(clock=clock)
+    token, expires_at = tokens.issue(42)
+    claims = tokens.verify(token)
+    assert claims["sub"] == 42
+    assert expires_at == clock.now + 3600 == claims["exp"]
+
+
+def test_changed_claims_fail_the_signature():
+    tokens = signer()
+    token, _ = tokens.issue(42)
+    version, kid, body, signature = token.split(".")
+    claims = json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))
+    claims["sub"] = 1
+    forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    with pytest.raises(InvalidToken, match="bad signature"):
+        tokens.verify(f"{version}.{kid}.{forged}.{signature}")
+
+
+def test_token_signed_with_another_secret_is_rejected():
+    token, _ = signer("k1:someone-elses-secret").issue(42)
+    with pytest.raises(InvalidToken, match="bad signature"):
+        signer("k1:secret-one").verify(token)
+
+
+@pytest.mark.parametrize("token", ["", "v1.k1.abc", "v2.k1.e30.sig", "v1.k1.e30.%%%", "v1.k1.e30.sigé", None])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(InvalidToken):
+        signer().verify(token)
+
+
+def test_expiry_is_exclusive():
+    clock = Clock()
+    tokens = signer(ttl=60, clock=clock)
+    token, expires_at = tokens.issue(42)
+    clock.now = expires_at - 1
+    assert tokens.verify(token)["sub"] == 42
+    clock.now = expires_at
+    with pytest.raises(InvalidToken, match="expired"):
+        tokens.verify(token)
+
+
+def test_rotation_keeps_old_tokens_valid_until_the_key_is_dropped():
+    clock = Clock()
+    old_token, _ = signer("k1:secret-one", clock=clock).issue(42)
+
+    rotated = signer("k2:secret-two,k1:secret-one", clock=clock)
+    new_token, _ = rotated.issue(42)
+    assert new_token.split(".")[1] == "k2"
+    assert rotated.verify(old_token)["sub"] == 42
+
+    dropped = signer("k2:secret-two", clock=clock)
+    assert dropped.verify(new_token)["sub"] == 42
+    with pytest.raises(InvalidToken, match="unknown signing key"):
+        dropped.verify(old_token)
+
+
+def test_signer_needs_a_key():
+    with pytest.raises(ValueError):
+        TokenSigner([])
+
+
+@pytest.mark.parametrize("spec", ["secret-only", ":secret", "k1:", "k.1:secret"])
+def test_bad_key_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_signing_keys(spec)
+
+
+def test_key_spec_order_is_kept():
+    assert parse_signing_keys(" k2:b , k1:a ,") == [("k2", b"b"), ("k1", b"a")]